@@ -17,37 +17,24 @@ def get_messages(token: str, channel_id: str, output_file: str, format_type: str
         token (str): Your Discord user token.
         channel_id (str): The ID of the channel to fetch messages from.
         output_file (str): Path to save the messages to.
-        format_type (str, optional): Format to save messages in. Options: "text", "json", "csv", "markdown". Defaults to "text".
+        format_type (str, optional): Format to save messages in. Options: "text", "json", "jsonl", "csv", "markdown". Defaults to "text".
     """
     # Create API client
     client = DiscordApiClient(token)
 
     # Initialize variables
     messages: List[Dict[str, Any]] = []
-    before: Optional[str] = None
-    limit: int = 100
 
     # Fetch all messages with pagination
-    while True:
-        try:
-            # Get batch of messages
-            new_messages = client.get_messages(channel_id, limit, before)
-
-            # If no new messages, we're done
-            if not new_messages:
-                break
-
+    try:
+        for new_messages in client.iter_pages(channel_id):
             # Add messages to our collection
             messages.extend(new_messages)
 
-            # Get ID of last message for pagination
-            before = new_messages[-1]['id']
-
             print(f"Fetched {len(messages)} messages so far.")
 
-        except Exception as e:
-            print(f"Error fetching messages: {str(e)}")
-            break
+    except Exception as e:
+        print(f"Error fetching messages: {str(e)}")
 
     # Sort messages by timestamp (oldest first)
     messages.sort(key=lambda x: x['timestamp'])
@@ -59,6 +46,8 @@ def get_messages(token: str, channel_id: str, output_file: str, format_type: str
     try:
         if format_type.lower() == "json":
             formatted_content = processor.format_json()
+        elif format_type.lower() == "jsonl":
+            formatted_content = processor.format_jsonl()
         elif format_type.lower() == "csv":
             formatted_content = processor.format_csv()
         elif format_type.lower() == "markdown":
@@ -98,7 +87,7 @@ def select_format() -> str:
     Display a simple dialog for the user to select the output format.
 
     Returns:
-        str: Selected format type ("text", "json", "csv", or "markdown").
+        str: Selected format type ("text", "json", "jsonl", "csv", or "markdown").
     """
     root = tk.Tk()
     root.title("Select Output Format")
@@ -118,6 +107,7 @@ def select_format() -> str:
     formats = [
         ("Plain Text", "text"),
         ("JSON", "json"),
+        ("JSON Lines", "jsonl"),
         ("CSV", "csv"),
         ("Markdown", "markdown")
     ]
@@ -0,0 +1,70 @@
+"""Measure the import time of Discord Messages Dump's entry points.
+
+Each module is imported in a fresh interpreter, so the timings include every
+dependency it pulls in. The script also reports which heavy optional modules
+each import loaded; the API and processor paths must not load any of them.
+
+Usage:
+    python benchmarks/import_time.py [--runs N]
+
+Measured results before and after lazy loading are kept in import_time.txt.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+
+# Entry points timed by the benchmark
+MODULES = [
+    "discord_messages_dump",
+    "discord_messages_dump.api",
+    "discord_messages_dump.message_processor",
+    "discord_messages_dump.cli",
+]
+
+# Modules that headless library use should never load
+HEAVY_MODULES = ["tkinter", "aiohttp", "tqdm", "dotenv", "pyarrow", "click"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1000, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module: str) -> Dict[str, object]:
+    """Import a module in a fresh interpreter.
+
+    Args:
+        module (str): The module to import.
+
+    Returns:
+        Dict[str, object]: The import time in milliseconds and the heavy modules loaded.
+    """
+    output = subprocess.check_output(
+        [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)]
+    )
+    return json.loads(output)
+
+
+def main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Imports per module (default: 5)")
+    args = parser.parse_args(argv)
+
+    print(f"{'module':<42} {'median':>9} {'min':>9}  heavy modules loaded")
+    for module in MODULES:
+        results = [measure(module) for _ in range(args.runs)]
+        times = [result["ms"] for result in results]
+        loaded = ", ".join(results[0]["loaded"]) or "-"
+        print(f"{module:<42} {statistics.median(times):>7.1f}ms {min(times):>7.1f}ms  {loaded}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
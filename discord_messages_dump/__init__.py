@@ -2,9 +2,40 @@
 
 __version__ = "0.1.0"
 
-from discord_messages_dump.api import DiscordApiClient
-from discord_messages_dump.message_processor import MessageProcessor
-from discord_messages_dump.file_handler import FileHandler
-from discord_messages_dump.cli import main as cli_main
+import importlib
+from typing import TYPE_CHECKING, Any, List
 
-__all__ = ["DiscordApiClient", "MessageProcessor", "FileHandler", "cli_main"]
+if TYPE_CHECKING:
+    from discord_messages_dump.api import DiscordApiClient
+    from discord_messages_dump.async_api import AsyncDiscordApiClient
+    from discord_messages_dump.message_processor import MessageProcessor
+    from discord_messages_dump.file_handler import FileHandler
+    from discord_messages_dump.cli import main as cli_main
+
+__all__ = ["DiscordApiClient", "AsyncDiscordApiClient", "MessageProcessor", "FileHandler", "cli_main"]
+
+# Public names and the (module, attribute) they are loaded from on first access, so
+# importing the package does not pull in aiohttp, click, tqdm or the GUI toolkit
+_LAZY_ATTRIBUTES = {
+    "DiscordApiClient": ("discord_messages_dump.api", "DiscordApiClient"),
+    "AsyncDiscordApiClient": ("discord_messages_dump.async_api", "AsyncDiscordApiClient"),
+    "MessageProcessor": ("discord_messages_dump.message_processor", "MessageProcessor"),
+    "FileHandler": ("discord_messages_dump.file_handler", "FileHandler"),
+    "cli_main": ("discord_messages_dump.cli", "main"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import a public name the first time it is accessed."""
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    value = getattr(importlib.import_module(module_name), attribute)
+    # Cache the value so later lookups skip this hook
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """List the module's attributes, including the lazily loaded ones."""
+    return sorted(set(globals()) | set(__all__))
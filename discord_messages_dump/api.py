@@ -1,9 +1,35 @@
 """Discord API Client for fetching messages from Discord channels."""
 
+import queue
+import threading
 import time
-from typing import Dict, List, Optional, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from discord_messages_dump.rate_limiter import RateLimiter
+from discord_messages_dump.records import FieldProjection, RecordFactory
+from discord_messages_dump.snowflake import now_snowflake, partition_range, window_cursors
+from discord_messages_dump.stats import DumpStats
+
+
+# Route template used as the rate limit key for message requests
+MESSAGES_ROUTE = "GET /channels/{channel_id}/messages"
+
+# Retry policy for failed requests
+MAX_RETRIES = 5
+RETRY_DELAYS = [1, 2, 4, 8, 16]  # Exponential backoff delays in seconds
+
+# Number of pages each slice of a parallel fetch holds before its worker blocks
+SLICE_QUEUE_SIZE = 2
+
+# Seconds between checks of the stop flag while a slice worker waits
+_POLL_INTERVAL = 0.1
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 
 
 class DiscordApiClient:
@@ -14,36 +40,145 @@ class DiscordApiClient:
     using a user token (selfbot). It handles rate limiting and implements
     exponential backoff retry logic.
     
+    Rate limits are tracked per bucket by a `RateLimiter`, which delays a
+    request only when Discord has reported that its bucket is exhausted, so
+    429 responses should be rare. Several clients can share one limiter to
+    pool their rate budget.
+    
+    All requests go through a single `requests.Session`, so the underlying
+    TCP/TLS connections are kept alive and reused across pages. The client
+    can be used as a context manager to release the pooled connections.
+    
     Attributes:
         token (str): The Discord user token for authentication.
         base_url (str): The base URL for Discord API requests.
+        session (requests.Session): The pooled HTTP session used for all requests.
+        rate_limiter (RateLimiter): The rate limiter scheduling all requests.
+        record_factory (Optional[RecordFactory]): Builder of compact records for fetched messages, if any.
+        projection (Optional[FieldProjection]): Projection applied to fetched messages, if any.
     """
 
-    def __init__(self, token: str) -> None:
+    def __init__(
+        self,
+        token: str,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        rate_limiter: Optional[RateLimiter] = None,
+        record_factory: Optional[RecordFactory] = None,
+        fields: Optional[Iterable[str]] = None,
+        stats: Optional[DumpStats] = None
+    ) -> None:
         """
         Initialize the Discord API client with a user token.
         
         Args:
             token (str): The Discord user token for authentication.
+            pool_connections (int, optional): Number of per-host connection pools to cache. Defaults to 10.
+            pool_maxsize (int, optional): Maximum number of connections kept alive per host. Defaults to 10.
+            pool_block (bool, optional): Whether to block when no free connection is available for a host
+                instead of opening a throwaway one. Defaults to False.
+            rate_limiter (Optional[RateLimiter], optional): Rate limiter to schedule requests with.
+                Pass a shared instance to pool the rate budget of several clients. Defaults to None,
+                which creates a private limiter.
+            record_factory (Optional[RecordFactory], optional): Builder of compact message records.
+                When given, every page is converted to slotted records holding only the factory's
+                fields as soon as it is decoded. Defaults to None, which returns the full dicts.
+            fields (Optional[Iterable[str]], optional): Dotted names of the message fields to keep,
+                e.g. {"id", "timestamp", "author.username", "content"}. Every page is projected onto
+                them right after it is decoded, so unused fields such as embeds are never retained.
+                Defaults to None, which keeps every field.
+            stats (Optional[DumpStats], optional): Collector of request timings and counters. When
+                given, the time spent in HTTP requests, rate limit waits, retry back-off and decoding
+                is recorded, along with each request's latency and size. Defaults to None.
+
+        Raises:
+            ValueError: If a field name is invalid.
         """
         self.token = token
         self.base_url = "https://discord.com/api/v9"
         self.headers = {
             'Authorization': token,
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            'User-Agent': USER_AGENT
         }
+        self.session = self._create_session(pool_connections, pool_maxsize, pool_block)
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.record_factory = record_factory
+        self.projection = FieldProjection(fields) if fields is not None else None
+        self.stats = stats
+
+    def _create_session(self, pool_connections: int, pool_maxsize: int, pool_block: bool) -> requests.Session:
+        """
+        Create the pooled HTTP session used for all API requests.
+        
+        Args:
+            pool_connections (int): Number of per-host connection pools to cache.
+            pool_maxsize (int): Maximum number of connections kept alive per host.
+            pool_block (bool): Whether to block when the per-host pool is exhausted.
+            
+        Returns:
+            requests.Session: A session with keep-alive adapters mounted for HTTP and HTTPS.
+        """
+        session = requests.Session()
+        session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def close(self) -> None:
+        """
+        Close the HTTP session and release all pooled connections.
+        
+        Returns:
+            None
+        """
+        self.session.close()
+
+    def __enter__(self) -> "DiscordApiClient":
+        """
+        Enter the runtime context for the client.
+        
+        Returns:
+            DiscordApiClient: The client itself.
+        """
+        return self
 
-    def get_messages(self, channel_id: str, limit: int = 100, before: Optional[str] = None) -> List[Dict[str, Any]]:
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        """
+        Exit the runtime context and close the HTTP session.
+        
+        Args:
+            exc_type (Any): The exception type, if an exception was raised.
+            exc_value (Any): The exception instance, if an exception was raised.
+            traceback (Any): The traceback, if an exception was raised.
+        """
+        self.close()
+
+    def get_messages(
+        self,
+        channel_id: str,
+        limit: int = 100,
+        before: Optional[str] = None,
+        after: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
         """
         Fetch messages from a Discord channel.
         
         This method retrieves messages from a specified Discord channel.
-        It handles pagination and rate limits automatically.
+        It waits for the rate limit bucket before sending the request and
+        handles rate limits automatically.
         
         Args:
             channel_id (str): The ID of the Discord channel to fetch messages from.
             limit (int, optional): Maximum number of messages to retrieve per request. Defaults to 100.
             before (Optional[str], optional): Message ID to fetch messages before. Used for pagination. Defaults to None.
+            after (Optional[str], optional): Message ID to fetch messages after. Used for incremental
+                updates. Defaults to None.
             
         Returns:
             List[Dict[str, Any]]: A list of message objects as dictionaries.
@@ -57,20 +192,33 @@ class DiscordApiClient:
         
         if before:
             url += f"&before={before}"
+        if after:
+            url += f"&after={after}"
             
         retry_count = 0
-        max_retries = 5
-        retry_delays = [1, 2, 4, 8, 16]  # Exponential backoff delays in seconds
         
-        while retry_count < max_retries:
+        while retry_count < MAX_RETRIES:
             try:
-                response = requests.get(url, headers=self.headers)
+                # Wait until the bucket has room for this request
+                waited = self.rate_limiter.acquire(MESSAGES_ROUTE, channel_id)
+                # Record the wait now, so it counts even if the request then fails
+                if self.stats is not None:
+                    self.stats.add_time("rate_limit_wait", waited)
+
+                start = time.perf_counter()
+                response = self.session.get(url)
+
+                if self.stats is not None:
+                    self.stats.record_request(time.perf_counter() - start, len(response.content))
                 
                 # Handle rate limits
                 if response.status_code == 429:
-                    self._handle_rate_limits(response)
+                    self._handle_rate_limits(response, MESSAGES_ROUTE, channel_id)
                     retry_count += 1
                     continue
+                
+                # Remember the bucket state for the next request
+                self.rate_limiter.update(MESSAGES_ROUTE, response.headers, channel_id)
                     
                 # Handle other errors
                 if response.status_code != 200:
@@ -84,7 +232,17 @@ class DiscordApiClient:
                         )
                         
                 # Return successful response
-                return response.json()
+                start = time.perf_counter()
+                messages = response.json()
+                if self.projection is not None:
+                    messages = self.projection.apply_page(messages)
+                if self.record_factory is not None:
+                    messages = self.record_factory.build_page(messages)
+
+                if self.stats is not None:
+                    self.stats.add_time("decode", time.perf_counter() - start)
+                    self.stats.record_page(len(messages))
+                return messages
                 
             except (requests.exceptions.RequestException, ValueError) as e:
                 # If it's a ValueError (invalid token or channel), re-raise immediately
@@ -92,10 +250,12 @@ class DiscordApiClient:
                     raise
                 
                 # Otherwise, implement retry logic with exponential backoff
-                if retry_count < max_retries - 1:
-                    delay = retry_delays[retry_count]
+                if retry_count < MAX_RETRIES - 1:
+                    delay = RETRY_DELAYS[retry_count]
                     print(f"Request failed. Retrying in {delay} seconds...")
                     time.sleep(delay)
+                    if self.stats is not None:
+                        self.stats.add_time("retry_backoff", delay)
                     retry_count += 1
                 else:
                     # If we've exhausted all retries, raise the exception
@@ -104,25 +264,295 @@ class DiscordApiClient:
         # This should never be reached due to the raise in the else clause above
         return []
 
-    def _handle_rate_limits(self, response: requests.Response) -> None:
+    def iter_pages(
+        self,
+        channel_id: str,
+        limit: Optional[int] = None,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        prefetch: bool = False
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Iterate over a channel's history one page at a time.
+        
+        By default the history is walked backwards, newest message first. When
+        only `after` is given, it is walked forwards from that message instead
+        and every page is ordered oldest first. When both are given, the history
+        is walked backwards from `before` and stops exactly at `after`. Only the
+        current page is held in memory, so arbitrarily long histories can be
+        processed in constant memory.
+        
+        `since` and `until` are converted into synthetic snowflake cursors, so a
+        time window is reached with the first request instead of by paging
+        through everything newer. A window is always walked backwards.
+        
+        With `prefetch`, the request for the next page is sent on a background
+        thread as soon as the current page's cursor is known, so it is in flight
+        while the caller processes the current page. At most one request is
+        ahead, and it goes through the client's rate limiter like any other.
+        Closing the generator waits for a request still in flight.
+        
+        Args:
+            channel_id (str): The ID of the Discord channel to fetch messages from.
+            limit (Optional[int], optional): Maximum number of messages to fetch in total.
+                Defaults to None (the whole history).
+            before (Optional[str], optional): Message ID to start before. Defaults to None (the newest message).
+            after (Optional[str], optional): Message ID to start after, walking forwards, or to
+                stop at when `before` is also given. Defaults to None.
+            since (Optional[datetime], optional): Only fetch messages created at or after this time.
+                Naive datetimes are taken to be UTC. Defaults to None.
+            until (Optional[datetime], optional): Only fetch messages created before this time. Defaults to None.
+            prefetch (bool, optional): Request the next page while the current one is processed.
+                Defaults to False.
+            
+        Yields:
+            List[Dict[str, Any]]: Pages of up to 100 message objects.
+            
+        Raises:
+            requests.exceptions.RequestException: If there's an error with the HTTP request.
+            ValueError: If the channel ID is invalid or the token is incorrect.
+        """
+        if since is not None or until is not None:
+            before, after = window_cursors(before, after, since, until)
+        
+        forward = bool(after) and not before
+        lower_bound = int(after) if after and before else None
+        fetched = 0
+        
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        pending: Optional[Future] = None
+        
+        try:
+            while limit is None or fetched < limit:
+                batch_size = 100 if limit is None else min(100, limit - fetched)
+                if pending is not None:
+                    # This page was requested while the previous one was processed
+                    batch = pending.result()
+                    pending = None
+                else:
+                    batch = self.get_messages(
+                        channel_id, limit=batch_size, before=before, after=after if forward else None
+                    )
+                
+                if not batch:
+                    break
+                
+                if forward:
+                    # Discord returns each page newest first; walk forwards oldest first
+                    batch.sort(key=lambda message: int(message["id"]))
+                    after = batch[-1]["id"]
+                else:
+                    before = batch[-1]["id"]
+                
+                fetched += len(batch)
+                
+                if lower_bound is not None:
+                    # Stop exactly at the lower bound of the range
+                    page = [message for message in batch if int(message["id"]) > lower_bound]
+                    done = len(page) < len(batch)
+                else:
+                    page = batch
+                    done = False
+                
+                # A short page means the end of the history has been reached
+                done = done or len(batch) < batch_size or (limit is not None and fetched >= limit)
+                
+                if executor is not None and not done:
+                    pending = executor.submit(
+                        self.get_messages,
+                        channel_id,
+                        limit=100 if limit is None else min(100, limit - fetched),
+                        before=before,
+                        after=after if forward else None
+                    )
+                
+                if page:
+                    yield page
+                if done:
+                    break
+        finally:
+            if executor is not None:
+                # Drop a prefetched page the caller no longer wants, but let a request
+                # already in flight finish, so the session is not used after the caller
+                # is done with the client
+                if pending is not None:
+                    pending.cancel()
+                executor.shutdown(wait=True)
+
+    def iter_pages_parallel(
+        self,
+        channel_id: str,
+        partitions: int = 4,
+        limit: Optional[int] = None,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Iterate over a channel's history newest first, fetching time slices concurrently.
+        
+        Snowflake IDs encode their creation time, so the range between `after`
+        (default: the channel's creation) and `before` (default: now) is split
+        into slices of equal duration, each paginated by its own worker thread.
+        All workers share this client's rate limiter, so together they stay
+        within one rate budget. Pages are yielded in exactly the same order as
+        `iter_pages` would yield them, with no gaps or duplicates. A slice that
+        is not being yielded yet is fetched at most SLICE_QUEUE_SIZE pages
+        ahead, after which its worker waits, so memory use stays bounded and
+        no requests are spent on pages beyond the limit.
+        
+        Args:
+            channel_id (str): The ID of the Discord channel to fetch messages from.
+            partitions (int, optional): The number of time slices fetched concurrently. Keep this
+                at or below the client's `pool_maxsize`. Defaults to 4.
+            limit (Optional[int], optional): Maximum number of messages to fetch in total.
+                Defaults to None (the whole history).
+            before (Optional[str], optional): Message ID to start before. Defaults to None (now).
+            after (Optional[str], optional): Message ID to stop at. Defaults to None (the channel's creation).
+            since (Optional[datetime], optional): Only fetch messages created at or after this time.
+                Naive datetimes are taken to be UTC. Defaults to None.
+            until (Optional[datetime], optional): Only fetch messages created before this time. Defaults to None.
+            
+        Yields:
+            List[Dict[str, Any]]: Pages of message objects, newest first.
+            
+        Raises:
+            requests.exceptions.RequestException: If there's an error with the HTTP request.
+            ValueError: If the channel ID is invalid or the token is incorrect.
+        """
+        if limit is not None and limit <= 0:
+            return
+        
+        before, after = window_cursors(before, after, since, until)
+        upper = int(before) if before else now_snowflake()
+        # No message in a channel is older than the channel itself
+        lower = int(after) if after else (int(channel_id) if channel_id.isdigit() else 0)
+        if upper <= lower:
+            return
+        
+        # Newest slice first. Each slice covers (bounds[k], bounds[k + 1]]; the
+        # newest one stops short of `upper`, which is itself exclusive.
+        bounds = partition_range(lower, upper, partitions)
+        slices = []
+        for k in reversed(range(partitions)):
+            slice_before = bounds[k + 1] if k == partitions - 1 else bounds[k + 1] + 1
+            slices.append((str(slice_before), str(bounds[k])))
+        
+        stop = threading.Event()
+        
+        def put(pages: "queue.Queue[Any]", item: Any) -> bool:
+            # Wait for room in the queue, giving up once the consumer has stopped
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=_POLL_INTERVAL)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def fetch_slice(slice_before: str, slice_after: str, pages: "queue.Queue[Any]") -> None:
+            try:
+                for page in self.iter_pages(channel_id, before=slice_before, after=slice_after):
+                    if not put(pages, page):
+                        break
+            except Exception as e:
+                put(pages, e)
+            finally:
+                put(pages, None)
+        
+        slice_queues: List["queue.Queue[Any]"] = [queue.Queue(maxsize=SLICE_QUEUE_SIZE) for _ in slices]
+        fetched = 0
+        
+        with ThreadPoolExecutor(max_workers=partitions) as executor:
+            for (slice_before, slice_after), pages in zip(slices, slice_queues):
+                executor.submit(fetch_slice, slice_before, slice_after, pages)
+            
+            try:
+                # Stitch the slices back together, newest first
+                for pages in slice_queues:
+                    while True:
+                        page = pages.get()
+                        if page is None:
+                            break
+                        if isinstance(page, Exception):
+                            raise page
+                        
+                        if limit is not None and fetched + len(page) >= limit:
+                            # Stop the workers before the caller processes the last page
+                            stop.set()
+                            yield page[:limit - fetched]
+                            return
+                        
+                        yield page
+                        fetched += len(page)
+            finally:
+                # Let the remaining workers finish early
+                stop.set()
+
+    def iter_messages(
+        self,
+        channel_id: str,
+        limit: Optional[int] = None,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        prefetch: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over a channel's messages, fetching one page at a time.
+        
+        Messages are yielded newest first, or oldest first when only `after` is given.
+        
+        Args:
+            channel_id (str): The ID of the Discord channel to fetch messages from.
+            limit (Optional[int], optional): Maximum number of messages to yield.
+                Defaults to None (the whole history).
+            before (Optional[str], optional): Message ID to start before. Defaults to None (the newest message).
+            after (Optional[str], optional): Message ID to start after, walking forwards. Defaults to None.
+            since (Optional[datetime], optional): Only fetch messages created at or after this time.
+                Naive datetimes are taken to be UTC. Defaults to None.
+            until (Optional[datetime], optional): Only fetch messages created before this time. Defaults to None.
+            prefetch (bool, optional): Request the next page while the current one is processed.
+                Defaults to False.
+            
+        Yields:
+            Dict[str, Any]: Message objects as dictionaries.
+            
+        Raises:
+            requests.exceptions.RequestException: If there's an error with the HTTP request.
+            ValueError: If the channel ID is invalid or the token is incorrect.
+        """
+        pages = self.iter_pages(
+            channel_id, limit=limit, before=before, after=after, since=since, until=until, prefetch=prefetch
+        )
+        for page in pages:
+            yield from page
+
+    def _handle_rate_limits(self, response: requests.Response, route: str = MESSAGES_ROUTE, major: str = "") -> None:
         """
         Handle Discord API rate limits.
         
-        This method parses the rate limit headers from the Discord API response
-        and waits for the appropriate amount of time before allowing the next request.
+        This method records the 429 response in the rate limiter, so requests
+        sharing the limiter hold off as well, and waits for the appropriate
+        amount of time before allowing the next request.
         
         Args:
             response (requests.Response): The HTTP response from the Discord API.
+            route (str, optional): The route template of the request. Defaults to MESSAGES_ROUTE.
+            major (str, optional): The route's major parameter. Defaults to "".
             
         Returns:
             None
         """
-        if 'X-RateLimit-Reset-After' in response.headers:
-            # Get the number of seconds to wait before making another request
-            reset_after = float(response.headers['X-RateLimit-Reset-After'])
-            print(f"Rate limited. Waiting for {reset_after:.2f} seconds...")
-            time.sleep(reset_after)
-        else:
-            # If the header is missing, use a default wait time
-            print("Rate limited. Waiting for 5 seconds...")
-            time.sleep(5)
+        retry_after = self.rate_limiter.on_rate_limited(route, response.headers, major)
+        print(f"Rate limited. Waiting for {retry_after:.2f} seconds...")
+        time.sleep(retry_after)
+        if self.stats is not None:
+            self.stats.add_time("rate_limit_wait", retry_after)
+        
+        # The penalty has been served, so the bucket is replenished
+        self.rate_limiter.clear(route, major)
@@ -0,0 +1,100 @@
+"""Archive maintenance for incremental syncs.
+
+This module provides functions for reading existing message archives and
+merging newly fetched messages into them without refetching the history.
+"""
+
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+
+# Archive formats that the sync command can merge new messages into
+SYNC_FORMATS = ["json", "sqlite"]
+
+
+def newest_message_id(messages: Iterable[Dict[str, Any]]) -> Optional[str]:
+    """Find the ID of the newest message.
+
+    Discord message IDs are snowflakes, so the newest message has the
+    numerically largest ID.
+
+    Args:
+        messages (Iterable[Dict[str, Any]]): Discord message objects.
+
+    Returns:
+        Optional[str]: The ID of the newest message, or None if there are no messages.
+    """
+    newest: Optional[int] = None
+    for message in messages:
+        message_id = int(message["id"])
+        if newest is None or message_id > newest:
+            newest = message_id
+    return None if newest is None else str(newest)
+
+
+def merge_messages(
+    existing: List[Dict[str, Any]],
+    new: Iterable[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Merge new messages into an archive's messages.
+
+    Messages are deduplicated by ID, with the newly fetched copy winning so
+    that edits are picked up, and ordered newest first like a dump.
+
+    Args:
+        existing (List[Dict[str, Any]]): The messages already in the archive.
+        new (Iterable[Dict[str, Any]]): The newly fetched messages.
+
+    Returns:
+        List[Dict[str, Any]]: The merged messages, newest first.
+    """
+    merged = {message["id"]: message for message in existing}
+    for message in new:
+        merged[message["id"]] = message
+    return sorted(merged.values(), key=lambda message: int(message["id"]), reverse=True)
+
+
+def read_json_archive(path: str) -> List[Dict[str, Any]]:
+    """Read the messages of a JSON archive.
+
+    Args:
+        path (str): Path of the archive.
+
+    Returns:
+        List[Dict[str, Any]]: The archived messages, or an empty list if the archive does not exist.
+
+    Raises:
+        ValueError: If the file is not a JSON array of messages.
+    """
+    if not os.path.exists(path):
+        return []
+
+    with open(path, 'r', encoding='utf-8') as f:
+        messages = json.load(f)
+
+    if not isinstance(messages, list):
+        raise ValueError(f"{path} is not a JSON message archive.")
+    return messages
+
+
+def write_json_archive(path: str, messages: List[Dict[str, Any]]) -> None:
+    """Write the messages of a JSON archive atomically.
+
+    The archive is written to a temporary file that then replaces the old
+    archive, so readers never see a partially written file.
+
+    Args:
+        path (str): Path of the archive.
+        messages (List[Dict[str, Any]]): The messages to write.
+    """
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(messages, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
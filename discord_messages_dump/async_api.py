@@ -0,0 +1,256 @@
+"""Asyncio Discord API Client for fetching messages from Discord channels."""
+
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+from discord_messages_dump.api import MAX_RETRIES, MESSAGES_ROUTE, RETRY_DELAYS, USER_AGENT
+from discord_messages_dump.exceptions import DiscordApiError
+from discord_messages_dump.rate_limiter import RateLimiter
+
+
+# Errors that are retried with exponential backoff
+if AIOHTTP_AVAILABLE:
+    RETRYABLE_ERRORS: tuple = (DiscordApiError, aiohttp.ClientError, asyncio.TimeoutError)
+else:
+    RETRYABLE_ERRORS = (DiscordApiError, asyncio.TimeoutError)
+
+
+class AsyncDiscordApiClient:
+    """
+    Asyncio client for interacting with the Discord API.
+
+    This is the asyncio counterpart of `DiscordApiClient`. It follows the same
+    rate limit and retry rules, but every wait is an `asyncio.sleep`, so many
+    channels can be fetched concurrently in one event loop. Requires aiohttp.
+
+    Attributes:
+        token (str): The Discord user token for authentication.
+        base_url (str): The base URL for Discord API requests.
+        rate_limiter (RateLimiter): The rate limiter scheduling all requests.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        rate_limiter: Optional[RateLimiter] = None,
+        session: Optional[Any] = None
+    ) -> None:
+        """
+        Initialize the asyncio Discord API client with a user token.
+
+        Args:
+            token (str): The Discord user token for authentication.
+            limit (int, optional): Maximum number of simultaneous connections. Defaults to 100.
+            limit_per_host (int, optional): Maximum number of simultaneous connections per host. Defaults to 10.
+            rate_limiter (Optional[RateLimiter], optional): Rate limiter to schedule requests with.
+                Defaults to None, which creates a private limiter.
+            session (Optional[aiohttp.ClientSession], optional): Session to send requests with.
+                Defaults to None, which creates a pooled session on first use.
+
+        Raises:
+            ImportError: If aiohttp is not installed and no session is given.
+        """
+        if session is None and not AIOHTTP_AVAILABLE:
+            raise ImportError(
+                "aiohttp is required for AsyncDiscordApiClient. Install it with 'pip install aiohttp'."
+            )
+
+        self.token = token
+        self.base_url = "https://discord.com/api/v9"
+        self.headers = {
+            'Authorization': token,
+            'User-Agent': USER_AGENT
+        }
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._session = session
+
+    def _get_session(self) -> Any:
+        """
+        Return the HTTP session, creating it inside the running event loop if needed.
+
+        Returns:
+            aiohttp.ClientSession: The pooled HTTP session.
+        """
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self._limit, limit_per_host=self._limit_per_host)
+            self._session = aiohttp.ClientSession(headers=self.headers, connector=connector)
+        return self._session
+
+    async def close(self) -> None:
+        """
+        Close the HTTP session and release all pooled connections.
+
+        Returns:
+            None
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "AsyncDiscordApiClient":
+        """
+        Enter the asynchronous runtime context for the client.
+
+        Returns:
+            AsyncDiscordApiClient: The client itself.
+        """
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        """
+        Exit the asynchronous runtime context and close the HTTP session.
+
+        Args:
+            exc_type (Any): The exception type, if an exception was raised.
+            exc_value (Any): The exception instance, if an exception was raised.
+            traceback (Any): The traceback, if an exception was raised.
+        """
+        await self.close()
+
+    async def _acquire(self, route: str, major: str) -> None:
+        """
+        Wait without blocking the event loop until the bucket has room for a request.
+
+        Args:
+            route (str): The route template of the request.
+            major (str): The route's major parameter.
+        """
+        while True:
+            delay = self.rate_limiter.reserve(route, major)
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    async def get_messages(
+        self,
+        channel_id: str,
+        limit: int = 100,
+        before: Optional[str] = None,
+        after: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch messages from a Discord channel.
+
+        Args:
+            channel_id (str): The ID of the Discord channel to fetch messages from.
+            limit (int, optional): Maximum number of messages to retrieve per request. Defaults to 100.
+            before (Optional[str], optional): Message ID to fetch messages before. Used for pagination. Defaults to None.
+            after (Optional[str], optional): Message ID to fetch messages after. Used for incremental
+                updates. Defaults to None.
+
+        Returns:
+            List[Dict[str, Any]]: A list of message objects as dictionaries.
+
+        Raises:
+            DiscordApiError: If the API keeps returning an error status after all retries.
+            aiohttp.ClientError: If there's an error with the HTTP request after all retries.
+            ValueError: If the channel ID is invalid or the token is incorrect.
+        """
+        endpoint = f"/channels/{channel_id}/messages"
+        url = f"{self.base_url}{endpoint}?limit={limit}"
+
+        if before:
+            url += f"&before={before}"
+        if after:
+            url += f"&after={after}"
+
+        session = self._get_session()
+        retry_count = 0
+
+        while retry_count < MAX_RETRIES:
+            try:
+                # Wait until the bucket has room for this request
+                await self._acquire(MESSAGES_ROUTE, channel_id)
+
+                async with session.get(url) as response:
+                    # Handle rate limits
+                    if response.status == 429:
+                        await self._handle_rate_limits(response, MESSAGES_ROUTE, channel_id)
+                        retry_count += 1
+                        continue
+
+                    self.rate_limiter.update(MESSAGES_ROUTE, response.headers, channel_id)
+
+                    # Handle other errors
+                    if response.status != 200:
+                        if response.status == 401:
+                            raise ValueError("Invalid Discord token. Authentication failed.")
+                        elif response.status == 404:
+                            raise ValueError(f"Channel with ID {channel_id} not found.")
+                        else:
+                            text = await response.text()
+                            raise DiscordApiError(f"Error: {text}", response.status)
+
+                    return await response.json()
+
+            except RETRYABLE_ERRORS:
+                # Retry with exponential backoff without blocking the event loop
+                if retry_count < MAX_RETRIES - 1:
+                    delay = RETRY_DELAYS[retry_count]
+                    print(f"Request failed. Retrying in {delay} seconds...")
+                    await asyncio.sleep(delay)
+                    retry_count += 1
+                else:
+                    raise
+
+        return []
+
+    async def iter_messages(
+        self,
+        channel_id: str,
+        limit: Optional[int] = None,
+        before: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over a channel's messages, newest first, fetching one page at a time.
+
+        Args:
+            channel_id (str): The ID of the Discord channel to fetch messages from.
+            limit (Optional[int], optional): Maximum number of messages to yield. Defaults to None (all messages).
+            before (Optional[str], optional): Message ID to start before. Defaults to None (the newest message).
+
+        Yields:
+            Dict[str, Any]: Message objects as dictionaries.
+        """
+        fetched = 0
+
+        while limit is None or fetched < limit:
+            batch_size = 100 if limit is None else min(100, limit - fetched)
+            batch = await self.get_messages(channel_id, limit=batch_size, before=before)
+
+            for message in batch:
+                yield message
+
+            fetched += len(batch)
+
+            # A short page means the start of the channel has been reached
+            if len(batch) < batch_size:
+                break
+
+            before = batch[-1]["id"]
+
+    async def _handle_rate_limits(self, response: Any, route: str = MESSAGES_ROUTE, major: str = "") -> None:
+        """
+        Handle Discord API rate limits without blocking the event loop.
+
+        Args:
+            response (aiohttp.ClientResponse): The HTTP response from the Discord API.
+            route (str, optional): The route template of the request. Defaults to MESSAGES_ROUTE.
+            major (str, optional): The route's major parameter. Defaults to "".
+        """
+        retry_after = self.rate_limiter.on_rate_limited(route, response.headers, major)
+        print(f"Rate limited. Waiting for {retry_after:.2f} seconds...")
+        await asyncio.sleep(retry_after)
+
+        # The penalty has been served, so the bucket is replenished
+        self.rate_limiter.clear(route, major)
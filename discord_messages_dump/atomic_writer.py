@@ -0,0 +1,178 @@
+"""Atomic, buffered output files for Discord Messages Dump.
+
+An AtomicFileWriter accepts output chunk by chunk through a large write
+buffer into a temporary file next to its target. Closing the writer flushes
+and fsyncs the temporary file and renames it over the target in one step,
+so readers see either the previous file or the complete new one, never a
+partially written dump. Targets ending in .gz or .zst are compressed as
+the chunks are written.
+"""
+
+import os
+import uuid
+from typing import Any, Optional, Union
+
+from discord_messages_dump.compression import compress_stream
+
+
+# Size of the write buffer in bytes
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+
+def _fsync_directory(directory: str) -> None:
+    """Persist a rename by syncing its directory, where the platform supports it."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class AtomicFileWriter:
+    """
+    Writer that replaces its target file atomically when closed.
+
+    Used as a context manager, the file is committed when the block completes
+    and discarded if it raises, leaving any existing target untouched.
+
+    Example:
+        >>> with AtomicFileWriter("messages.txt") as writer:
+        ...     for chunk in formatter.format_stream(messages):
+        ...         writer.write(chunk)
+
+    Attributes:
+        path (str): Path of the target file.
+        temp_path (str): Path of the temporary file being written.
+        bytes_written (int): Number of bytes written so far, before compression.
+        closed (bool): Whether the writer has been committed or aborted.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        level: Optional[int] = None,
+        threads: int = 0
+    ) -> None:
+        """
+        Open a temporary file next to the target, creating its directory if needed.
+
+        Args:
+            path (str): Path of the target file. A `.gz` or `.zst` extension compresses the output.
+            buffer_size (int, optional): Size of the write buffer in bytes. Defaults to 1 MiB.
+            level (Optional[int], optional): Compression level of a compressed target. Defaults to None,
+                which uses the compression's default level.
+            threads (int, optional): Number of zstd worker threads, or -1 for one per CPU. Defaults to 0.
+
+        Raises:
+            IOError: If the temporary file cannot be created.
+            ImportError: If zstd compression is requested and zstandard is not installed.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        self.path = path
+        self.temp_path = os.path.join(directory, f".{os.path.basename(path)}.{uuid.uuid4().hex[:12]}.tmp")
+        self.bytes_written = 0
+        self.closed = False
+
+        # Create directory if it doesn't exist
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(self.temp_path, 'xb', buffering=buffer_size)
+        try:
+            self._stream = compress_stream(self._file, path, level, threads)
+        except Exception:
+            self._discard()
+            raise
+
+    def write(self, data: Union[str, bytes]) -> int:
+        """
+        Write a chunk of output.
+
+        Args:
+            data (Union[str, bytes]): The chunk. Strings are encoded as UTF-8.
+
+        Returns:
+            int: The number of bytes written, before compression.
+
+        Raises:
+            ValueError: If the writer has already been closed.
+        """
+        if self.closed:
+            raise ValueError("Cannot write to a closed AtomicFileWriter")
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self._stream.write(data)
+        self.bytes_written += len(data)
+        return len(data)
+
+    def close(self) -> None:
+        """
+        Commit the output: flush, fsync and rename the temporary file over the target.
+
+        Raises:
+            IOError: If the file cannot be written or renamed. The temporary file is removed.
+        """
+        if self.closed:
+            return
+        self.closed = True
+
+        try:
+            if self._stream is not self._file:
+                # Finish the compressed stream
+                self._stream.close()
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            os.replace(self.temp_path, self.path)
+        except BaseException:
+            self._discard()
+            raise
+
+        _fsync_directory(os.path.dirname(os.path.abspath(self.path)))
+
+    def abort(self) -> None:
+        """Discard the output, leaving any existing target file untouched."""
+        if self.closed:
+            return
+        self.closed = True
+        self._discard()
+
+    def _discard(self) -> None:
+        """Close and remove the temporary file."""
+        try:
+            self._file.close()
+        except OSError:
+            pass
+        try:
+            os.remove(self.temp_path)
+        except OSError:
+            pass
+
+    def __enter__(self) -> "AtomicFileWriter":
+        """
+        Enter the runtime context for the writer.
+
+        Returns:
+            AtomicFileWriter: The writer itself.
+        """
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        """
+        Exit the runtime context, committing the output unless an exception was raised.
+
+        Args:
+            exc_type (Any): The exception type, if an exception was raised.
+            exc_value (Any): The exception instance, if an exception was raised.
+            traceback (Any): The traceback, if an exception was raised.
+        """
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -0,0 +1,276 @@
+"""Pagination checkpoints for resumable dumps and incremental syncs.
+
+This module provides a Checkpoint class that records how far a dump has
+progressed, so that an interrupted dump can continue from the last saved
+pagination cursor instead of refetching the whole history, and a SyncState
+class that records the newest archived message of each archive and channel.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+logger = logging.getLogger("discord-dump.checkpoint")
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO 8601 date saved in a checkpoint, or None if it is missing."""
+    return None if value is None else datetime.fromisoformat(value)
+
+
+class Checkpoint:
+    """On-disk pagination checkpoint for a dump.
+
+    A checkpoint is only saved after a complete page has been written, so
+    its cursor, message count and output offset always describe the same
+    consistent state of the output file. The time window and limit of the
+    dump are saved with it, since resuming with different ones would mix
+    two different selections of messages in one file.
+
+    Attributes:
+        path (str): Path of the checkpoint file.
+        channel_id (str): The ID of the channel being dumped.
+        format_type (str): The output format of the dump.
+        output_file (str): Path of the output file being written.
+        since (Optional[datetime]): Start of the dump's time window, or None.
+        until (Optional[datetime]): End of the dump's time window, or None.
+        limit (Optional[int]): Maximum number of messages of the dump, or None for the whole history.
+        before (Optional[str]): Pagination cursor; the ID of the oldest message written so far.
+        count (int): The number of messages written so far.
+        offset (int): Size in bytes of the output written so far.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        channel_id: str,
+        format_type: str,
+        output_file: str,
+        before: Optional[str] = None,
+        count: int = 0,
+        offset: int = 0,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> None:
+        """Initialize the checkpoint.
+
+        Args:
+            path (str): Path of the checkpoint file.
+            channel_id (str): The ID of the channel being dumped.
+            format_type (str): The output format of the dump.
+            output_file (str): Path of the output file being written.
+            before (Optional[str], optional): Pagination cursor. Defaults to None.
+            count (int, optional): The number of messages written so far. Defaults to 0.
+            offset (int, optional): Size in bytes of the output written so far. Defaults to 0.
+            since (Optional[datetime], optional): Start of the dump's time window. Defaults to None.
+            until (Optional[datetime], optional): End of the dump's time window. Defaults to None.
+            limit (Optional[int], optional): Maximum number of messages of the dump. Defaults to None,
+                which means the whole history.
+        """
+        self.path = path
+        self.channel_id = channel_id
+        self.format_type = format_type
+        self.output_file = output_file
+        self.since = since
+        self.until = until
+        self.limit = limit
+        self.before = before
+        self.count = count
+        self.offset = offset
+
+    @classmethod
+    def load(cls, path: str) -> Optional["Checkpoint"]:
+        """Load a checkpoint from disk.
+
+        Args:
+            path (str): Path of the checkpoint file.
+
+        Returns:
+            Optional[Checkpoint]: The checkpoint, or None if the file does not exist.
+
+        Raises:
+            ValueError: If the checkpoint file is malformed.
+        """
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return cls(
+                path,
+                channel_id=data["channel_id"],
+                format_type=data["format_type"],
+                output_file=data["output_file"],
+                before=data.get("before"),
+                count=int(data.get("count", 0)),
+                offset=int(data.get("offset", 0)),
+                since=_parse_datetime(data.get("since")),
+                until=_parse_datetime(data.get("until")),
+                limit=None if data.get("limit") is None else int(data["limit"])
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid checkpoint file {path}: {str(e)}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the checkpoint to a dictionary.
+
+        Returns:
+            Dict[str, Any]: The checkpoint as a dictionary.
+        """
+        return {
+            "channel_id": self.channel_id,
+            "format_type": self.format_type,
+            "output_file": self.output_file,
+            "since": None if self.since is None else self.since.isoformat(),
+            "until": None if self.until is None else self.until.isoformat(),
+            "limit": self.limit,
+            "before": self.before,
+            "count": self.count,
+            "offset": self.offset
+        }
+
+    def matches(
+        self,
+        channel_id: str,
+        format_type: str,
+        output_file: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> bool:
+        """Check whether the checkpoint belongs to the given dump.
+
+        Args:
+            channel_id (str): The ID of the channel being dumped.
+            format_type (str): The output format of the dump.
+            output_file (str): Path of the output file being written.
+            since (Optional[datetime], optional): Start of the dump's time window. Defaults to None.
+            until (Optional[datetime], optional): End of the dump's time window. Defaults to None.
+            limit (Optional[int], optional): Maximum number of messages of the dump. Defaults to None.
+
+        Returns:
+            bool: True if the checkpoint was written by the same dump, False otherwise.
+        """
+        return (
+            self.channel_id == channel_id
+            and self.format_type == format_type.lower()
+            and os.path.abspath(self.output_file) == os.path.abspath(output_file)
+            and self.since == since
+            and self.until == until
+            and self.limit == limit
+        )
+
+    def save(self) -> None:
+        """Write the checkpoint to disk atomically.
+
+        The checkpoint is written to a temporary file that then replaces the
+        previous checkpoint, so a crash never leaves a truncated checkpoint.
+        """
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        logger.debug(f"Checkpoint saved: {self.count} messages, before={self.before}")
+
+    def delete(self) -> None:
+        """Remove the checkpoint file once the dump has completed."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class SyncState:
+    """On-disk record of the newest archived message per archive and channel.
+
+    The sync command records the newest message it archived for each archive
+    file and channel. Entries are keyed by the absolute path of the archive,
+    so syncing the same channel into several archives keeps them apart. The
+    sync cursor itself is taken from the archive, which stays correct when an
+    archive is replaced or deleted.
+
+    Attributes:
+        path (str): Path of the state file.
+        archives (Dict[str, Dict[str, str]]): Newest archived message ID by channel ID,
+            by absolute archive path.
+    """
+
+    def __init__(self, path: str, archives: Optional[Dict[str, Dict[str, str]]] = None) -> None:
+        """Initialize the sync state.
+
+        Args:
+            path (str): Path of the state file.
+            archives (Optional[Dict[str, Dict[str, str]]], optional): Newest archived message ID by
+                channel ID, by absolute archive path. Defaults to None.
+        """
+        self.path = path
+        self.archives: Dict[str, Dict[str, str]] = {
+            archive: dict(channels) for archive, channels in (archives or {}).items()
+        }
+
+    @classmethod
+    def load(cls, path: str) -> "SyncState":
+        """Load the sync state from disk.
+
+        Args:
+            path (str): Path of the state file.
+
+        Returns:
+            SyncState: The stored state, or an empty state if the file does not exist.
+
+        Raises:
+            ValueError: If the state file is malformed.
+        """
+        if not os.path.exists(path):
+            return cls(path)
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if "archives" not in data and "channels" in data:
+                # Entries of older versions do not say which archive they belong to
+                logger.warning(f"Ignoring the entries of {path}, which were not recorded per archive.")
+                return cls(path)
+            return cls(path, {
+                str(archive): {str(k): str(v) for k, v in channels.items()}
+                for archive, channels in data["archives"].items()
+            })
+        except (KeyError, TypeError, AttributeError, ValueError) as e:
+            raise ValueError(f"Invalid sync state file {path}: {str(e)}")
+
+    def get(self, archive_file: str, channel_id: str) -> Optional[str]:
+        """Get the newest message ID of a channel recorded for an archive.
+
+        Args:
+            archive_file (str): Path of the archive.
+            channel_id (str): The ID of the channel.
+
+        Returns:
+            Optional[str]: The newest archived message ID, or None if the channel was never
+                synced into this archive.
+        """
+        return self.archives.get(os.path.abspath(archive_file), {}).get(channel_id)
+
+    def set(self, archive_file: str, channel_id: str, message_id: str) -> None:
+        """Record the newest message ID of a channel in an archive.
+
+        Args:
+            archive_file (str): Path of the archive.
+            channel_id (str): The ID of the channel.
+            message_id (str): The ID of the newest archived message.
+        """
+        self.archives.setdefault(os.path.abspath(archive_file), {})[channel_id] = message_id
+
+    def save(self) -> None:
+        """Write the sync state to disk atomically."""
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"archives": self.archives}, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
@@ -7,15 +7,39 @@ and save them in various formats.
 
 import os
 import sys
+import time
 import logging
-from typing import Optional, List, Dict, Any
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple, BinaryIO
 
 import click
-from dotenv import load_dotenv
-from tqdm import tqdm
 
 from discord_messages_dump.api import DiscordApiClient
-from discord_messages_dump.message_processor import MessageProcessor
+from discord_messages_dump.archive import (
+    SYNC_FORMATS,
+    merge_messages,
+    newest_message_id,
+    read_json_archive,
+    write_json_archive,
+)
+from discord_messages_dump.checkpoint import Checkpoint, SyncState
+from discord_messages_dump.columnar import DEFAULT_ROW_GROUP_SIZE, write_parquet
+from discord_messages_dump.atomic_writer import AtomicFileWriter
+from discord_messages_dump.compression import (
+    COMPRESSION_EXTENSIONS,
+    ZSTANDARD_AVAILABLE,
+    compression_for_path,
+    with_compression_extension
+)
+from discord_messages_dump.pipeline import Pipeline
+from discord_messages_dump.profiling import DEFAULT_MALLOC_TOP, ProfileSession
+from discord_messages_dump.progress import HistoryProgress
+from discord_messages_dump.records import FieldProjection, RecordFactory, fields_for_format
+from discord_messages_dump.sqlite_archive import SqliteArchive, write_sqlite
+from discord_messages_dump.stats import DumpStats, stage_timer
+from discord_messages_dump.message_processor import MessageProcessor, get_formatter
 from discord_messages_dump.file_handler import FileHandler
 
 
@@ -27,6 +51,31 @@ logging.basicConfig(
 )
 logger = logging.getLogger("discord-dump")
 
+# Formats written by a dedicated writer instead of a text formatter
+STRUCTURED_FORMATS = ["parquet", "sqlite"]
+
+# Resolution of the progress bar of an unlimited dump
+HISTORY_PROGRESS_STEPS = 1000
+
+
+class MessageLimit(click.ParamType):
+    """Click parameter type for --limit: a positive number of messages, or "all" for no limit."""
+
+    name = "limit"
+
+    def convert(self, value: Any, param: Optional[click.Parameter], ctx: Optional[click.Context]) -> Optional[int]:
+        if value is None or isinstance(value, int):
+            return value
+        if str(value).strip().lower() == "all":
+            return None
+        try:
+            limit = int(value)
+        except ValueError:
+            self.fail(f"{value!r} is neither a number of messages nor 'all'.", param, ctx)
+        if limit < 1:
+            self.fail(f"{limit} is not a positive number of messages.", param, ctx)
+        return limit
+
 
 def setup_logging(verbose: bool) -> None:
     """
@@ -42,10 +91,217 @@ def setup_logging(verbose: bool) -> None:
         logger.setLevel(logging.INFO)
 
 
+def progress_bar(**kwargs: Any) -> Any:
+    """
+    Create a tqdm progress bar, importing tqdm only once a bar is shown.
+
+    Args:
+        **kwargs (Any): Arguments for tqdm.
+
+    Returns:
+        Any: The progress bar.
+    """
+    from tqdm import tqdm
+    return tqdm(**kwargs)
+
+
+def describe_limit(limit: Optional[int]) -> str:
+    """
+    Describe a message limit for log messages.
+
+    Args:
+        limit (Optional[int]): Maximum number of messages, or None for no limit.
+
+    Returns:
+        str: E.g. "up to 100 messages" or "all messages".
+    """
+    return "all messages" if limit is None else f"up to {limit} messages"
+
+
+def history_progress_bar(progress: HistoryProgress) -> Any:
+    """
+    Create the progress bar of an unlimited dump, which shows the share of the history covered.
+
+    Args:
+        progress (HistoryProgress): The progress of the dump.
+
+    Returns:
+        Any: The progress bar. Without an estimate of the share covered it shows the throughput only.
+    """
+    if progress.fraction is None:
+        pbar = progress_bar(desc="Fetching messages", bar_format="{desc}: [{elapsed}{postfix}]")
+    else:
+        pbar = progress_bar(
+            total=HISTORY_PROGRESS_STEPS, initial=round(progress.fraction * HISTORY_PROGRESS_STEPS),
+            desc="Fetching messages", bar_format="{desc}: {percentage:3.0f}%|{bar}| [{elapsed}{postfix}]"
+        )
+    pbar.set_postfix_str(progress.describe())
+    return pbar
+
+
+def update_progress(pbar: Any, progress: Optional[HistoryProgress], page: List[Dict[str, Any]]) -> None:
+    """
+    Advance a progress bar past a page.
+
+    Args:
+        pbar (Any): The progress bar.
+        progress (Optional[HistoryProgress]): The progress of an unlimited dump, or None to count messages.
+        page (List[Dict[str, Any]]): The fetched page.
+    """
+    if progress is None:
+        pbar.update(len(page))
+        return
+
+    progress.update(page)
+    if progress.fraction is not None:
+        pbar.update(round(progress.fraction * HISTORY_PROGRESS_STEPS) - pbar.n)
+    pbar.set_postfix_str(progress.describe())
+
+
+def log_fetch_rate(progress: HistoryProgress) -> None:
+    """
+    Log the throughput of a finished unlimited dump.
+
+    Args:
+        progress (HistoryProgress): The progress of the dump.
+    """
+    logger.info(
+        f"Fetched {progress.messages} messages in {progress.pages} pages "
+        f"({progress.messages_per_second:.1f} msg/s, {progress.pages_per_second:.2f} pages/s)"
+    )
+
+
+def window_options(since: Optional[datetime], until: Optional[datetime]) -> Dict[str, datetime]:
+    """
+    Build the time window keyword arguments for the client's page iterators.
+
+    Args:
+        since (Optional[datetime]): Start of the window, or None.
+        until (Optional[datetime]): End of the window, or None.
+
+    Returns:
+        Dict[str, datetime]: `since` and `until`, leaving out the unset ones.
+    """
+    window = {}
+    if since is not None:
+        window["since"] = since
+    if until is not None:
+        window["until"] = until
+    return window
+
+
+def iter_pages_with_progress(
+    client: DiscordApiClient,
+    channel_id: str,
+    limit: Optional[int] = 100,
+    partitions: int = 1,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    prefetch: bool = False
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream pages of messages from Discord with a progress bar.
+
+    With a limit the bar counts messages towards it. Without one, the bar
+    shows how far the fetch has moved back through the channel's history,
+    with the throughput and the estimated time remaining.
+
+    Args:
+        client (DiscordApiClient): The Discord API client.
+        channel_id (str): The ID of the channel to fetch messages from.
+        limit (Optional[int], optional): Maximum number of messages to retrieve, or None for
+            the whole history. Defaults to 100.
+        partitions (int, optional): Number of time slices to fetch concurrently. Defaults to 1.
+        since (Optional[datetime], optional): Only fetch messages created at or after this time. Defaults to None.
+        until (Optional[datetime], optional): Only fetch messages created before this time. Defaults to None.
+        prefetch (bool, optional): Request each page while the previous one is processed.
+            Ignored when fetching time slices in parallel. Defaults to False.
+
+    Yields:
+        List[Dict[str, Any]]: Pages of message objects, newest first.
+    """
+    fetched = 0
+    window = window_options(since, until)
+
+    if partitions > 1:
+        pages = client.iter_pages_parallel(channel_id, partitions, limit=limit, **window)
+    elif prefetch:
+        pages = client.iter_pages(channel_id, limit=limit, prefetch=True, **window)
+    else:
+        pages = client.iter_pages(channel_id, limit=limit, **window)
+
+    # Create a progress bar
+    if limit is None:
+        # Slices fetched in parallel arrive out of order, so only their throughput is shown
+        progress: Optional[HistoryProgress] = HistoryProgress(channel_id, since, until, ordered=partitions == 1)
+        pbar = history_progress_bar(progress)
+    else:
+        progress = None
+        pbar = progress_bar(total=limit, desc="Fetching messages", unit="msg",
+                            bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]")
+
+    with pbar:
+        for batch in pages:
+            fetched += len(batch)
+
+            # Update progress bar
+            update_progress(pbar, progress, batch)
+
+            # Log progress
+            if progress is None:
+                logger.debug(f"Fetched {fetched}/{limit} messages")
+            else:
+                logger.debug(f"Fetched {progress.describe()}")
+
+            yield batch
+
+        if progress is not None:
+            progress.finish()
+            update_progress(pbar, progress, [])
+
+    logger.debug("No more messages to fetch")
+    if progress is not None:
+        log_fetch_rate(progress)
+
+
+def iter_messages_with_progress(
+    client: DiscordApiClient,
+    channel_id: str,
+    limit: Optional[int] = 100,
+    partitions: int = 1,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    prefetch: bool = False
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream messages from Discord page by page with a progress bar.
+
+    Args:
+        client (DiscordApiClient): The Discord API client.
+        channel_id (str): The ID of the channel to fetch messages from.
+        limit (Optional[int], optional): Maximum number of messages to retrieve, or None for
+            the whole history. Defaults to 100.
+        partitions (int, optional): Number of time slices to fetch concurrently. Defaults to 1.
+        since (Optional[datetime], optional): Only fetch messages created at or after this time. Defaults to None.
+        until (Optional[datetime], optional): Only fetch messages created before this time. Defaults to None.
+        prefetch (bool, optional): Request each page while the previous one is processed.
+            Ignored when fetching time slices in parallel. Defaults to False.
+
+    Yields:
+        Dict[str, Any]: Message objects as dictionaries, newest first.
+    """
+    for page in iter_pages_with_progress(client, channel_id, limit, partitions, since, until, prefetch):
+        yield from page
+
+
 def get_messages_with_progress(
     client: DiscordApiClient,
     channel_id: str,
-    limit: int = 100
+    limit: Optional[int] = 100,
+    partitions: int = 1,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    prefetch: bool = False
 ) -> List[Dict[str, Any]]:
     """
     Fetch messages from Discord with a progress bar.
@@ -53,45 +309,551 @@ def get_messages_with_progress(
     Args:
         client (DiscordApiClient): The Discord API client.
         channel_id (str): The ID of the channel to fetch messages from.
-        limit (int, optional): Maximum number of messages to retrieve. Defaults to 100.
+        limit (Optional[int], optional): Maximum number of messages to retrieve, or None for
+            the whole history. Defaults to 100.
+        partitions (int, optional): Number of time slices to fetch concurrently. Defaults to 1.
+        since (Optional[datetime], optional): Only fetch messages created at or after this time. Defaults to None.
+        until (Optional[datetime], optional): Only fetch messages created before this time. Defaults to None.
+        prefetch (bool, optional): Request each page while the previous one is processed.
+            Ignored when fetching time slices in parallel. Defaults to False.
 
     Returns:
         List[Dict[str, Any]]: A list of message objects as dictionaries.
     """
-    messages: List[Dict[str, Any]] = []
-    before: Optional[str] = None
+    return list(iter_messages_with_progress(client, channel_id, limit, partitions, since, until, prefetch))
 
-    # Create a progress bar
-    with tqdm(total=limit, desc="Fetching messages", unit="msg",
-              bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]") as pbar:
 
-        while len(messages) < limit:
-            # Calculate how many messages to fetch in this batch
-            batch_size = min(100, limit - len(messages))
+def dump_with_checkpoint(
+    client: DiscordApiClient,
+    channel_id: str,
+    format_type: str,
+    output_file: str,
+    limit: Optional[int],
+    checkpoint_file: str,
+    checkpoint_interval: int = 10,
+    resume: bool = False,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    stats: Optional[DumpStats] = None
+) -> int:
+    """
+    Stream messages into a file page by page, saving a pagination checkpoint as it goes.
+
+    Every page is formatted and written as soon as it arrives. After every
+    `checkpoint_interval` pages, and whenever the dump is interrupted, the
+    pagination cursor and the size of the output written so far are saved to
+    the checkpoint file. With `resume`, the output is truncated back to the
+    checkpointed size and the dump continues from the saved cursor.
 
-            # Fetch messages
-            logger.debug(f"Fetching batch of {batch_size} messages before ID: {before}")
-            batch = client.get_messages(channel_id, limit=batch_size, before=before)
+    Args:
+        client (DiscordApiClient): The Discord API client.
+        channel_id (str): The ID of the channel to fetch messages from.
+        format_type (str): The output format (text, json, jsonl, csv, markdown).
+        output_file (str): Path to write the messages to.
+        limit (Optional[int]): Maximum number of messages to retrieve in total, or None for the whole history.
+        checkpoint_file (str): Path of the checkpoint file.
+        checkpoint_interval (int, optional): Number of pages between checkpoints. Defaults to 10.
+        resume (bool, optional): Whether to continue from an existing checkpoint. Defaults to False.
+        since (Optional[datetime], optional): Only fetch messages created at or after this time. Defaults to None.
+        until (Optional[datetime], optional): Only fetch messages created before this time. Defaults to None.
+        stats (Optional[DumpStats], optional): Collector of the time spent formatting and writing. Defaults to None.
 
-            # If no messages were returned, we've reached the end
-            if not batch:
-                logger.debug("No more messages to fetch")
-                break
+    Returns:
+        int: The total number of messages in the output file.
 
-            # Add messages to our list
-            messages.extend(batch)
+    Raises:
+        ValueError: If the checkpoint belongs to a different dump.
+    """
+    formatter = get_formatter(format_type)
+    checkpoint = Checkpoint.load(checkpoint_file) if resume else None
 
-            # Update progress bar
-            pbar.update(len(batch))
+    if checkpoint is not None and not checkpoint.matches(channel_id, format_type, output_file, since, until, limit):
+        raise ValueError(
+            f"Checkpoint {checkpoint_file} belongs to a different dump. Resume with the same channel, "
+            f"format, output file, --since, --until and --limit, or start over without --resume."
+        )
 
-            # Update 'before' for pagination
-            before = batch[-1]["id"]
+    output: Optional[BinaryIO] = None
+    if checkpoint is not None and os.path.exists(output_file):
+        logger.info(f"Resuming from checkpoint: {checkpoint.count} messages already saved")
+        output = open(output_file, 'r+b')
 
-            # Log progress
-            logger.debug(f"Fetched {len(messages)}/{limit} messages")
+        # Drop anything written after the last checkpoint
+        output.truncate(checkpoint.offset)
+        output.seek(checkpoint.offset)
+    else:
+        if checkpoint is not None:
+            logger.warning(
+                f"Checkpoint {checkpoint_file} was found, but its output file {output_file} is missing. "
+                f"Starting a new dump."
+            )
+        elif resume:
+            logger.warning(f"No checkpoint found at {checkpoint_file}. Starting a new dump.")
+        directory = os.path.dirname(output_file)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        # The output is created when the first page arrives, so a dump that
+        # finds no messages leaves an existing file untouched
+        checkpoint = Checkpoint(
+            checkpoint_file, channel_id, format_type.lower(), output_file, since=since, until=until, limit=limit
+        )
+
+    remaining = None if limit is None else max(0, limit - checkpoint.count)
+    initial_offset = output.tell() if output is not None else 0
+    pages_since_save = 0
+
+    if limit is None:
+        progress: Optional[HistoryProgress] = HistoryProgress(
+            channel_id, since, until, before=checkpoint.before, messages=checkpoint.count
+        )
+        pbar = history_progress_bar(progress)
+    else:
+        progress = None
+        pbar = progress_bar(total=limit, initial=checkpoint.count, desc="Fetching messages", unit="msg",
+                            bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]")
+
+    try:
+        with pbar:
+            try:
+                window = window_options(since, until)
+                pages = client.iter_pages(
+                    channel_id, limit=remaining, before=checkpoint.before, **window
+                ) if remaining != 0 else []
+
+                for page in pages:
+                    if output is None:
+                        output = open(output_file, 'wb')
+
+                    with stage_timer(stats, "format"):
+                        data = "".join(formatter.format_stream(page, start_index=checkpoint.count, final=False))
+                    with stage_timer(stats, "write"):
+                        output.write(data.encode('utf-8'))
+
+                    # The page is complete, so the checkpoint may now move past it
+                    checkpoint.before = page[-1]["id"]
+                    checkpoint.count += len(page)
+                    checkpoint.offset = output.tell()
+                    update_progress(pbar, progress, page)
+
+                    pages_since_save += 1
+                    if pages_since_save >= checkpoint_interval:
+                        output.flush()
+                        os.fsync(output.fileno())
+                        checkpoint.save()
+                        pages_since_save = 0
+
+            except BaseException:
+                # Persist the last complete page so the dump can be resumed. Without
+                # any output there is nothing to resume, and a checkpoint would point
+                # --resume at a file this dump never wrote.
+                if output is not None:
+                    output.flush()
+                    os.fsync(output.fileno())
+                    checkpoint.save()
+                logger.error(
+                    f"Dump interrupted after {checkpoint.count} messages. "
+                    f"Run the same command with --resume to continue."
+                )
+                raise
+
+            if output is not None:
+                for chunk in formatter.format_stream([], start_index=checkpoint.count):
+                    output.write(chunk.encode('utf-8'))
+
+                if stats is not None:
+                    stats.record_write(output.tell() - initial_offset)
+
+            if progress is not None:
+                progress.finish()
+                update_progress(pbar, progress, [])
+    finally:
+        if output is not None:
+            output.close()
+
+    checkpoint.delete()
+    if progress is not None:
+        log_fetch_rate(progress)
+
+    return checkpoint.count
+
+
+def read_channel_file(path: str) -> List[str]:
+    """
+    Read channel IDs from a file with one ID per line.
+
+    Blank lines and lines starting with # are skipped.
+
+    Args:
+        path (str): Path of the channel file.
+
+    Returns:
+        List[str]: The channel IDs in file order.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = [line.strip() for line in f]
+    return [line for line in lines if line and not line.startswith("#")]
 
-    # Trim to limit if we fetched more than requested
-    return messages[:limit]
+
+def dump_channel(
+    client: DiscordApiClient,
+    channel_id: str,
+    format_type: str,
+    output_file: str,
+    limit: Optional[int],
+    partitions: int = 1,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    compress_level: Optional[int] = None,
+    compress_threads: int = 0,
+    stats: Optional[DumpStats] = None,
+    prefetch: bool = False
+) -> Dict[str, Any]:
+    """
+    Stream one channel's messages into its own output file.
+
+    Args:
+        client (DiscordApiClient): The Discord API client.
+        channel_id (str): The ID of the channel to fetch messages from.
+        format_type (str): The output format (text, json, jsonl, csv, markdown, parquet, sqlite).
+        output_file (str): Path to write the messages to.
+        limit (Optional[int]): Maximum number of messages to retrieve, or None for the whole history.
+        partitions (int, optional): Number of time slices to fetch concurrently. Defaults to 1.
+        since (Optional[datetime], optional): Only fetch messages created at or after this time. Defaults to None.
+        until (Optional[datetime], optional): Only fetch messages created before this time. Defaults to None.
+        row_group_size (int, optional): Number of messages per row group of Parquet output. Defaults to 10000.
+        compress_level (Optional[int], optional): Compression level of a .gz or .zst output file.
+            Defaults to None, which uses the compression's default level.
+        compress_threads (int, optional): Number of zstd worker threads. Defaults to 0.
+        stats (Optional[DumpStats], optional): Collector of the time spent formatting and writing. Defaults to None.
+        prefetch (bool, optional): Request each page while the previous one is processed.
+            Ignored when fetching time slices in parallel. Defaults to False.
+
+    Returns:
+        Dict[str, Any]: The channel ID, output file, message count and elapsed seconds.
+    """
+    start = time.monotonic()
+    window = window_options(since, until)
+
+    if partitions > 1:
+        pages = client.iter_pages_parallel(channel_id, partitions, limit=limit, **window)
+    elif prefetch:
+        pages = client.iter_pages(channel_id, limit=limit, prefetch=True, **window)
+    else:
+        pages = client.iter_pages(channel_id, limit=limit, **window)
+
+    if format_type.lower() in STRUCTURED_FORMATS:
+        # Fetch the next pages while the current one is written
+        messages = (message for page in Pipeline(pages) for message in page)
+        count = write_structured(messages, format_type, output_file, row_group_size, stats)
+    else:
+        count = write_formatted(pages, format_type, output_file, compress_level, compress_threads, stats)
+
+    elapsed = time.monotonic() - start
+    logger.debug(f"Channel {channel_id}: {count} messages saved to {output_file}")
+
+    return {
+        "channel_id": channel_id,
+        "output_file": output_file,
+        "count": count,
+        "elapsed": elapsed,
+        "error": None
+    }
+
+
+def write_structured(
+    messages: Iterable[Dict[str, Any]],
+    format_type: str,
+    output_file: str,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    stats: Optional[DumpStats] = None
+) -> int:
+    """
+    Stream messages into a Parquet file or a SQLite archive.
+
+    Args:
+        messages (Iterable[Dict[str, Any]]): Message objects, consumed lazily.
+        format_type (str): The output format (parquet, sqlite).
+        output_file (str): Path of the file or database to write to.
+        row_group_size (int, optional): Number of messages per row group of Parquet output. Defaults to 10000.
+        stats (Optional[DumpStats], optional): Collector of the time spent writing, which leaves out
+            the time spent waiting for messages. Defaults to None.
+
+    Returns:
+        int: The number of messages written.
+    """
+    def write(messages: Iterable[Dict[str, Any]]) -> int:
+        if format_type.lower() == "sqlite":
+            return write_sqlite(messages, output_file)
+        return write_parquet(messages, output_file, row_group_size)
+
+    if stats is None:
+        return write(messages)
+
+    waited = 0.0
+
+    def timed(messages: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        nonlocal waited
+        iterator = iter(messages)
+        while True:
+            start = time.perf_counter()
+            try:
+                message = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                waited += time.perf_counter() - start
+            yield message
+
+    start = time.perf_counter()
+    count = write(timed(messages))
+    stats.add_time("write", time.perf_counter() - start - waited)
+    if count:
+        stats.record_write(os.path.getsize(output_file))
+    return count
+
+
+def write_formatted(
+    pages: Iterable[List[Dict[str, Any]]],
+    format_type: str,
+    output_file: str,
+    compress_level: Optional[int] = None,
+    compress_threads: int = 0,
+    stats: Optional[DumpStats] = None
+) -> int:
+    """
+    Format pages of messages into a file as they arrive.
+
+    Fetching, formatting and writing run as a pipeline on separate threads
+    connected by bounded queues, so the next pages are fetched while the
+    current ones are formatted and written. The output replaces the file
+    atomically once it is complete, and files ending in .gz or .zst are
+    compressed as the chunks are written. Without any messages the output is
+    discarded, so an existing file is kept.
+
+    Args:
+        pages (Iterable[List[Dict[str, Any]]]): Pages of message objects.
+        format_type (str): The output format (text, json, jsonl, csv, markdown).
+        output_file (str): Path to write the messages to.
+        compress_level (Optional[int], optional): Compression level of a compressed output file.
+            Defaults to None, which uses the compression's default level.
+        compress_threads (int, optional): Number of zstd worker threads. Defaults to 0.
+        stats (Optional[DumpStats], optional): Collector of the time spent formatting and writing. Defaults to None.
+
+    Returns:
+        int: The number of messages written.
+    """
+    formatter = get_formatter(format_type)
+    count = 0
+
+    def format_page(page: List[Dict[str, Any]]) -> bytes:
+        nonlocal count
+        with stage_timer(stats, "format"):
+            chunk = "".join(formatter.format_stream(page, start_index=count, final=False))
+        count += len(page)
+        return chunk.encode('utf-8')
+
+    with AtomicFileWriter(output_file, level=compress_level, threads=compress_threads) as output:
+        for data in Pipeline(pages).add_stage(format_page):
+            with stage_timer(stats, "write"):
+                output.write(data)
+
+        if not count:
+            output.abort()
+            return count
+
+        with stage_timer(stats, "write"):
+            for chunk in formatter.format_stream([], start_index=count):
+                output.write(chunk)
+            # Commit here, so flushing and syncing count as writing
+            output.close()
+
+    if stats is not None:
+        stats.record_write(os.path.getsize(output_file))
+    return count
+
+
+def dump_channels(
+    client: DiscordApiClient,
+    channel_ids: List[str],
+    format_type: str,
+    output_dir: str,
+    limit: Optional[int],
+    workers: int = 4,
+    partitions: int = 1,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    compress: Optional[str] = None,
+    compress_level: Optional[int] = None,
+    compress_threads: int = 0,
+    stats: Optional[DumpStats] = None,
+    prefetch: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Dump several channels concurrently, one output file per channel.
+
+    All workers send their requests through the same client, so they share
+    one rate limiter and one connection pool. A failing channel is recorded
+    in its result and does not stop the other channels.
+
+    Args:
+        client (DiscordApiClient): The Discord API client.
+        channel_ids (List[str]): The IDs of the channels to dump.
+        format_type (str): The output format (text, json, jsonl, csv, markdown, parquet, sqlite).
+        output_dir (str): Directory to write the `<channel_id><extension>` files to.
+        limit (Optional[int]): Maximum number of messages to retrieve per channel, or None for
+            each channel's whole history.
+        workers (int, optional): Number of channels fetched concurrently. Defaults to 4.
+        partitions (int, optional): Number of time slices to fetch concurrently per channel. Defaults to 1.
+        since (Optional[datetime], optional): Only fetch messages created at or after this time. Defaults to None.
+        until (Optional[datetime], optional): Only fetch messages created before this time. Defaults to None.
+        row_group_size (int, optional): Number of messages per row group of Parquet output. Defaults to 10000.
+        compress (Optional[str], optional): Compression of the output files (gzip, zstd). Defaults to None.
+        compress_level (Optional[int], optional): Compression level. Defaults to None,
+            which uses the compression's default level.
+        compress_threads (int, optional): Number of zstd worker threads per file. Defaults to 0.
+        stats (Optional[DumpStats], optional): Collector of the time spent formatting and writing,
+            shared by all channels. Defaults to None.
+        prefetch (bool, optional): Request each channel's next page while the current one is processed.
+            Defaults to False.
+
+    Returns:
+        List[Dict[str, Any]]: One result per channel, in the order of `channel_ids`.
+    """
+    extension = FileHandler().get_file_extension(format_type)
+    if compress:
+        extension += COMPRESSION_EXTENSIONS[compress]
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    results: Dict[str, Dict[str, Any]] = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor, \
+            progress_bar(total=len(channel_ids), desc="Dumping channels", unit="channel") as pbar:
+        futures = {
+            executor.submit(
+                dump_channel, client, channel_id, format_type,
+                os.path.join(output_dir, f"{channel_id}{extension}"), limit, partitions, since, until,
+                row_group_size, compress_level, compress_threads, stats, prefetch
+            ): channel_id
+            for channel_id in channel_ids
+        }
+
+        for future in as_completed(futures):
+            channel_id = futures[future]
+            try:
+                results[channel_id] = future.result()
+            except Exception as e:
+                logger.error(f"Failed to dump channel {channel_id}: {str(e)}")
+                results[channel_id] = {
+                    "channel_id": channel_id,
+                    "output_file": None,
+                    "count": 0,
+                    "elapsed": 0.0,
+                    "error": str(e)
+                }
+            pbar.update(1)
+
+    return [results[channel_id] for channel_id in channel_ids]
+
+
+def log_throughput_summary(results: List[Dict[str, Any]], elapsed: float) -> None:
+    """
+    Log the per-channel and total throughput of a multi-channel dump.
+
+    Args:
+        results (List[Dict[str, Any]]): The per-channel results from `dump_channels`.
+        elapsed (float): Wall-clock seconds the whole dump took.
+    """
+    logger.info("Channel summary:")
+    for result in results:
+        if result["error"]:
+            logger.info(f"  {result['channel_id']}: failed ({result['error']})")
+            continue
+        if not result["count"]:
+            logger.info(f"  {result['channel_id']}: no messages")
+            continue
+        rate = result["count"] / result["elapsed"] if result["elapsed"] else 0.0
+        logger.info(
+            f"  {result['channel_id']}: {result['count']} messages in "
+            f"{result['elapsed']:.1f}s ({rate:.1f} msg/s) -> {result['output_file']}"
+        )
+
+    total = sum(result["count"] for result in results)
+    rate = total / elapsed if elapsed else 0.0
+    logger.info(f"Total: {total} messages from {len(results)} channels in {elapsed:.1f}s ({rate:.1f} msg/s)")
+
+
+def resolve_credentials(token: Optional[str], channel_id: Optional[str]) -> Tuple[str, str]:
+    """
+    Determine the Discord token and channel ID from the options or the environment.
+
+    Args:
+        token (Optional[str]): The token given on the command line.
+        channel_id (Optional[str]): The channel ID given on the command line.
+
+    Returns:
+        Tuple[str, str]: The token and channel ID. Exits the program if either is missing.
+    """
+    # Load environment variables
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    # Get token from option or environment
+    token = token or os.getenv("DISCORD_TOKEN")
+    if not token:
+        logger.error("Discord token not provided. Use --token option or set DISCORD_TOKEN environment variable.")
+        sys.exit(1)
+
+    # Get channel ID from option or environment
+    channel_id = channel_id or os.getenv("DISCORD_CHANNEL_ID")
+    if not channel_id:
+        logger.error("Channel ID not provided. Use --channel-id option or set DISCORD_CHANNEL_ID environment variable.")
+        sys.exit(1)
+
+    return token, channel_id
+
+
+def resolve_output_file(
+    file_handler: FileHandler,
+    output_file: Optional[str],
+    format_type: str,
+    no_gui: bool,
+    compress: Optional[str] = None
+) -> str:
+    """
+    Determine the output file path, opening a file dialog if needed.
+
+    Args:
+        file_handler (FileHandler): The file handler used to open the dialog.
+        output_file (Optional[str]): The output file given on the command line.
+        format_type (str): The output format, used to pick the default file name.
+        no_gui (bool): Whether the GUI file dialog is disabled.
+        compress (Optional[str], optional): Compression of the output (gzip, zstd), whose
+            extension is appended to the path if missing. Defaults to None.
+
+    Returns:
+        str: The output file path. Exits the program if no path could be determined.
+    """
+    if not output_file and not no_gui:
+        # Get default filename based on format type
+        _, _, default_filename = file_handler.get_file_type_info(format_type)
+
+        logger.info("Opening file dialog to select output location")
+        output_file = file_handler.open_save_dialog(default_filename, format_type)
+
+        if not output_file:
+            logger.error("No output file selected. Exiting.")
+            sys.exit(1)
+    elif not output_file and no_gui:
+        logger.error("No output file specified and GUI is disabled. Use --output-file option.")
+        sys.exit(1)
+
+    if compress:
+        output_file = with_compression_extension(output_file, compress)
+
+    return output_file
 
 
 @click.group()
@@ -114,12 +876,20 @@ def install_completion():
 )
 @click.option(
     "--channel-id",
-    help="ID of the Discord channel to fetch messages from. Can also be set via DISCORD_CHANNEL_ID environment variable."
+    "channel_ids",
+    multiple=True,
+    help="ID of a Discord channel to fetch messages from. Repeat to dump several channels. "
+         "Can also be set via DISCORD_CHANNEL_ID environment variable."
+)
+@click.option(
+    "--channel-file",
+    type=click.Path(exists=True, dir_okay=False),
+    help="File with one channel ID per line to dump in addition to --channel-id."
 )
 @click.option(
     "--format",
     "format_type",
-    type=click.Choice(["text", "json", "csv", "markdown"], case_sensitive=False),
+    type=click.Choice(["text", "json", "jsonl", "csv", "markdown", "parquet", "sqlite"], case_sensitive=False),
     default="text",
     help="Output format for the messages. Default: text"
 )
@@ -127,17 +897,139 @@ def install_completion():
     "--output-file",
     help="Path to save the messages to. If not provided and --no-gui is not set, a file dialog will open."
 )
+@click.option(
+    "--output-dir",
+    default=".",
+    help="Directory for the per-channel output files when dumping several channels. Default: ."
+)
 @click.option(
     "--limit",
-    type=int,
+    type=MessageLimit(),
     default=100,
-    help="Maximum number of messages to retrieve. Default: 100"
+    help="Maximum number of messages to retrieve, or 'all' for the whole history. Default: 100"
+)
+@click.option(
+    "--since",
+    type=click.DateTime(formats=["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S"]),
+    help="Only fetch messages created at or after this UTC date or time."
+)
+@click.option(
+    "--until",
+    type=click.DateTime(formats=["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S"]),
+    help="Only fetch messages created before this UTC date or time."
 )
 @click.option(
     "--no-gui",
     is_flag=True,
     help="Disable GUI file dialog for selecting output file."
 )
+@click.option(
+    "--checkpoint",
+    is_flag=True,
+    help="Write messages to the output file as they arrive and save a checkpoint so an interrupted dump can be resumed."
+)
+@click.option(
+    "--checkpoint-file",
+    help="Path of the checkpoint file. Default: the output file name with a .checkpoint suffix."
+)
+@click.option(
+    "--checkpoint-interval",
+    type=click.IntRange(min=1),
+    default=10,
+    help="Number of pages between checkpoints. Default: 10"
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Continue an interrupted dump from its checkpoint and append to the existing output. Implies --checkpoint."
+)
+@click.option(
+    "--partitions",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Split the history into this many time slices and fetch them concurrently. Default: 1"
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=4,
+    help="Number of channels fetched concurrently when dumping several channels. Default: 4"
+)
+@click.option(
+    "--row-group-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_ROW_GROUP_SIZE,
+    help=f"Number of messages per row group of Parquet output. Default: {DEFAULT_ROW_GROUP_SIZE}"
+)
+@click.option(
+    "--compress",
+    type=click.Choice(list(COMPRESSION_EXTENSIONS), case_sensitive=False),
+    help="Compress text, json, jsonl, csv or markdown output as it is written. "
+         "Also selected by a .gz or .zst output file extension."
+)
+@click.option(
+    "--compress-level",
+    type=int,
+    help="Compression level, 0-9 for gzip and 1-22 for zstd. Default: 6 for gzip, 3 for zstd"
+)
+@click.option(
+    "--compress-threads",
+    type=click.IntRange(min=-1),
+    default=0,
+    help="Number of zstd compression threads, or -1 for one per CPU. Default: 0"
+)
+@click.option(
+    "--prefetch",
+    is_flag=True,
+    help="Request the next page of a single channel while the current page is processed."
+)
+@click.option(
+    "--pipeline",
+    is_flag=True,
+    help="Fetch, format and write text, json, jsonl, csv or markdown output concurrently "
+         "instead of holding all messages in memory."
+)
+@click.option(
+    "--format-workers",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of processes formatting large text, json, jsonl, csv or markdown dumps in chunks. Default: 1"
+)
+@click.option(
+    "--fields",
+    help="Comma-separated message fields to keep, e.g. id,timestamp,author.username,content. "
+         "Other fields such as embeds are dropped as soon as each page arrives."
+)
+@click.option(
+    "--compact",
+    is_flag=True,
+    help="Keep only the fields the text, csv or markdown format needs in compact records, "
+         "to reduce memory use."
+)
+@click.option(
+    "--stats-file",
+    type=click.Path(dir_okay=False),
+    help="Write the per-stage timings, counters and request latency percentiles to this JSON file."
+)
+@click.option(
+    "--profile",
+    "profile_file",
+    type=click.Path(dir_okay=False),
+    help="Profile the dump with cProfile and write the statistics to this pstats file. "
+         "Only the main thread is profiled."
+)
+@click.option(
+    "--trace-malloc",
+    is_flag=True,
+    help="Trace memory allocations and report the largest allocation sites after the messages "
+         "are fetched, formatted and saved."
+)
+@click.option(
+    "--malloc-top",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MALLOC_TOP,
+    help=f"Number of allocation sites reported by --trace-malloc. Default: {DEFAULT_MALLOC_TOP}"
+)
 @click.option(
     "--verbose",
     is_flag=True,
@@ -145,90 +1037,261 @@ def install_completion():
 )
 def dump(
     token: Optional[str],
-    channel_id: Optional[str],
+    channel_ids: Tuple[str, ...],
+    channel_file: Optional[str],
     format_type: str,
     output_file: Optional[str],
-    limit: int,
+    output_dir: str,
+    limit: Optional[int],
+    since: Optional[datetime],
+    until: Optional[datetime],
     no_gui: bool,
+    checkpoint: bool,
+    checkpoint_file: Optional[str],
+    checkpoint_interval: int,
+    resume: bool,
+    partitions: int,
+    workers: int,
+    row_group_size: int,
+    compress: Optional[str],
+    compress_level: Optional[int],
+    compress_threads: int,
+    prefetch: bool,
+    pipeline: bool,
+    format_workers: int,
+    fields: Optional[str],
+    compact: bool,
+    stats_file: Optional[str],
+    profile_file: Optional[str],
+    trace_malloc: bool,
+    malloc_top: int,
     verbose: bool
 ) -> None:
     """
-    Fetch messages from a Discord channel and save them to a file.
+    Fetch messages from Discord channels and save them to files.
 
     If --token or --channel-id are not provided, the tool will attempt to load them
     from environment variables DISCORD_TOKEN and DISCORD_CHANNEL_ID respectively.
 
     If --output-file is not provided and --no-gui is not set, a file dialog will open
     to select the output file location.
+
+    With --checkpoint, messages are written as they arrive and the pagination cursor
+    is saved periodically, so an interrupted dump can be continued with --resume.
+
+    With --partitions, the history is split into time slices by snowflake ID and
+    the slices are fetched concurrently under one shared rate limiter.
+
+    With several --channel-id options or a --channel-file, the channels are fetched
+    by --workers concurrent workers sharing one rate limiter, and each channel is
+    saved to its own file in --output-dir.
+
+    With --limit all, the whole history is fetched. The progress bar then estimates the
+    share covered from the timestamp in the current pagination cursor, which moves from
+    now back to the channel's creation, and shows msg/s, pages/s and the time remaining.
+
+    With --since and --until, the dates are converted into snowflake cursors, so the
+    fetch starts right at the end of the window and stops exactly at its start.
+
+    With --fields, every page is reduced to the given fields as soon as it is received.
+
+    With --compress, or an output file ending in .gz or .zst, the output is compressed
+    as it is written, without an uncompressed copy on disk.
+
+    With --prefetch, the request for the next page is in flight while the current
+    page is processed.
+
+    With --pipeline, pages are formatted and written on separate threads while the
+    next pages are fetched, so memory use stays bounded and the stages overlap.
+    Several channels are always dumped this way.
+
+    With --format-workers, the fetched messages are formatted in chunks by a pool of
+    processes, producing the same output as formatting them in one process.
+
+    Every dump ends with a summary of the time spent in HTTP requests, rate limit waits,
+    retry back-off, decoding, formatting and writing, the pages, messages and bytes
+    transferred, and the p50/p95/p99 request latency. With --stats-file, the summary is
+    also written as JSON.
+
+    With --profile, the dump runs under cProfile and the statistics are written to a
+    pstats file. With --trace-malloc, the memory allocated while fetching, formatting
+    and saving is reported by allocation site.
     """
     # Set up logging based on verbosity
     setup_logging(verbose)
 
-    # Load environment variables
-    load_dotenv()
+    # Profile until the command finishes, however it exits
+    session = click.get_current_context().with_resource(
+        ProfileSession(profile_file, trace_malloc, malloc_top)
+    )
 
-    # Get token from option or environment
-    token = token or os.getenv("DISCORD_TOKEN")
-    if not token:
-        logger.error("Discord token not provided. Use --token option or set DISCORD_TOKEN environment variable.")
+    if partitions > 1 and (checkpoint or resume):
+        logger.error("--partitions cannot be combined with --checkpoint or --resume.")
         sys.exit(1)
 
-    # Get channel ID from option or environment
-    channel_id = channel_id or os.getenv("DISCORD_CHANNEL_ID")
-    if not channel_id:
-        logger.error("Channel ID not provided. Use --channel-id option or set DISCORD_CHANNEL_ID environment variable.")
+    if format_type.lower() in STRUCTURED_FORMATS and (checkpoint or resume):
+        logger.error(f"--checkpoint and --resume are not supported for {format_type} output.")
         sys.exit(1)
 
-    # Create API client
+    if since is not None and until is not None and since >= until:
+        logger.error("--since must be earlier than --until.")
+        sys.exit(1)
+
+    field_list = parse_fields(fields) if fields else None
+
+    if compress is None and output_file:
+        compress = compression_for_path(output_file)
+    if compress is not None:
+        compress = compress.lower()
+        if format_type.lower() in STRUCTURED_FORMATS:
+            logger.error(f"Compression is not supported for {format_type} output.")
+            sys.exit(1)
+        if checkpoint or resume:
+            logger.error("Compression cannot be combined with --checkpoint or --resume.")
+            sys.exit(1)
+        if compress == "zstd" and not ZSTANDARD_AVAILABLE:
+            logger.error("zstandard is required for zstd compression. Install it with 'pip install zstandard'.")
+            sys.exit(1)
+
+    # Report the hot-path stats when the command finishes, however it exits
+    stats = DumpStats()
+    click.get_current_context().call_on_close(lambda: report_stats(stats, stats_file))
+
+    # Remove duplicates but keep the given order
+    channel_list = list(channel_ids)
+    if channel_file:
+        channel_list += read_channel_file(channel_file)
+    channel_list = list(dict.fromkeys(channel_list))
+
+    if len(channel_list) > 1:
+        dump_many(token, channel_list, format_type, output_file, output_dir, limit,
+                  checkpoint or resume, partitions, workers, verbose, since, until, row_group_size,
+                  field_list, compress, compress_level, compress_threads, stats,
+                  compact, prefetch, format_workers)
+        session.phase("saved")
+        return
+
+    token, channel_id = resolve_credentials(token, channel_list[0] if channel_list else None)
+
+    # Create API client, with a connection per concurrent slice
     logger.debug("Initializing Discord API client")
-    client = DiscordApiClient(token)
+    client_options: Dict[str, Any] = {"pool_maxsize": partitions} if partitions > 10 else {}
+    if field_list:
+        client_options["fields"] = field_list
+    if compact:
+        record_factory = compact_record_factory(format_type)
+        if record_factory is not None:
+            client_options["record_factory"] = record_factory
+    client = DiscordApiClient(token, stats=stats, **client_options)
 
     try:
+        if checkpoint or resume:
+            # Stream pages straight into the output file
+            output_file = resolve_output_file(FileHandler(), output_file, format_type, no_gui)
+            checkpoint_file = checkpoint_file or f"{output_file}.checkpoint"
+
+            logger.info(f"Fetching {describe_limit(limit)} from channel {channel_id}")
+            count = dump_with_checkpoint(
+                client, channel_id, format_type, output_file, limit,
+                checkpoint_file, checkpoint_interval, resume, since, until, stats
+            )
+
+            if not count:
+                logger.error("No messages found in the specified channel.")
+                sys.exit(1)
+
+            session.phase("saved")
+            logger.info(f"All {count} messages saved to: {output_file} in {format_type} format")
+            return
+
+        if format_type.lower() in STRUCTURED_FORMATS:
+            # Stream messages straight into row groups or database transactions
+            output_file = resolve_output_file(FileHandler(), output_file, format_type, no_gui)
+            existed = os.path.exists(output_file)
+
+            logger.info(f"Fetching {describe_limit(limit)} from channel {channel_id}")
+            pages = iter_pages_with_progress(client, channel_id, limit, partitions, since, until, prefetch)
+            messages = (message for page in Pipeline(pages) for message in page)
+            count = write_structured(messages, format_type, output_file, row_group_size, stats)
+
+            if not count:
+                # Parquet output is only written with messages, but opening a SQLite archive creates it
+                if not existed and os.path.exists(output_file):
+                    os.remove(output_file)
+                logger.error("No messages found in the specified channel.")
+                sys.exit(1)
+
+            session.phase("saved")
+            logger.info(f"All {count} messages saved to: {output_file} in {format_type} format")
+            return
+
+        if pipeline:
+            # Format and write each page while the next ones are fetched
+            output_file = resolve_output_file(FileHandler(), output_file, format_type, no_gui, compress)
+
+            logger.info(f"Fetching {describe_limit(limit)} from channel {channel_id}")
+            pages = iter_pages_with_progress(client, channel_id, limit, partitions, since, until, prefetch)
+            count = write_formatted(pages, format_type, output_file, compress_level, compress_threads, stats)
+
+            if not count:
+                logger.error("No messages found in the specified channel.")
+                sys.exit(1)
+
+            session.phase("saved")
+            logger.info(f"All {count} messages saved to: {output_file} in {format_type} format")
+            return
+
         # Fetch messages with progress bar
-        logger.info(f"Fetching up to {limit} messages from channel {channel_id}")
-        messages = get_messages_with_progress(client, channel_id, limit)
+        logger.info(f"Fetching {describe_limit(limit)} from channel {channel_id}")
+        messages = get_messages_with_progress(client, channel_id, limit, partitions, since, until, prefetch)
 
         if not messages:
             logger.error("No messages found in the specified channel.")
             sys.exit(1)
 
         logger.info(f"Successfully fetched {len(messages)} messages")
+        session.phase("fetched")
 
         # Process messages
         logger.debug(f"Processing messages in {format_type} format")
         processor = MessageProcessor(messages)
 
         # Format messages based on the specified format type
-        if format_type.lower() == "json":
-            formatted_content = processor.format_json()
-        elif format_type.lower() == "csv":
-            formatted_content = processor.format_csv()
-        elif format_type.lower() == "markdown":
-            formatted_content = processor.format_markdown()
-        else:  # Default to text format
-            formatted_content = processor.format_text()
+        with stats.timer("format"):
+            if format_workers > 1:
+                formatted_content = processor.format_parallel(format_type, format_workers)
+            elif format_type.lower() == "json":
+                formatted_content = processor.format_json()
+            elif format_type.lower() == "jsonl":
+                formatted_content = processor.format_jsonl()
+            elif format_type.lower() == "csv":
+                formatted_content = processor.format_csv()
+            elif format_type.lower() == "markdown":
+                formatted_content = processor.format_markdown()
+            else:  # Default to text format
+                formatted_content = processor.format_text()
+        session.phase("formatted")
 
         # Initialize file handler
         file_handler = FileHandler()
 
         # Determine output file path
-        if not output_file and not no_gui:
-            # Get default filename based on format type
-            _, _, default_filename = file_handler.get_file_type_info(format_type)
-
-            logger.info("Opening file dialog to select output location")
-            output_file = file_handler.open_save_dialog(default_filename, format_type)
+        output_file = resolve_output_file(file_handler, output_file, format_type, no_gui, compress)
 
-            if not output_file:
-                logger.error("No output file selected. Exiting.")
-                sys.exit(1)
-        elif not output_file and no_gui:
-            logger.error("No output file specified and GUI is disabled. Use --output-file option.")
-            sys.exit(1)
+        # Compression settings, compressing by the file extension
+        compress_options: Dict[str, int] = {}
+        if compress_level is not None:
+            compress_options["level"] = compress_level
+        if compress_threads:
+            compress_options["threads"] = compress_threads
 
         # Save formatted content to file
         logger.debug(f"Saving content to {output_file}")
-        if file_handler.save_content(formatted_content, output_file):
+        with stats.timer("write"):
+            saved = file_handler.save_content(formatted_content, output_file, **compress_options)
+        if saved:
+            stats.record_write(output_size(output_file))
+            session.phase("saved")
             logger.info(f"All messages saved to: {output_file} in {format_type} format")
         else:
             logger.error(f"Failed to save messages to: {output_file}")
@@ -239,6 +1302,412 @@ def dump(
         if verbose:
             logger.exception("Detailed error information:")
         sys.exit(1)
+    finally:
+        client.close()
+
+
+def output_size(path: str) -> int:
+    """
+    Get the size of an output file on disk.
+
+    Args:
+        path (str): Path of the file.
+
+    Returns:
+        int: The size in bytes, or 0 if the file cannot be read.
+    """
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def report_stats(stats: DumpStats, stats_file: Optional[str] = None) -> None:
+    """
+    Log the hot-path stats of a dump and optionally write them to a JSON file.
+
+    Nothing is reported if the dump stopped before sending a request.
+
+    Args:
+        stats (DumpStats): The stats of the dump.
+        stats_file (Optional[str], optional): Path of the JSON file. Defaults to None.
+    """
+    if not stats.requests:
+        return
+    stats.log_summary()
+    if stats_file:
+        try:
+            stats.write_json(stats_file)
+            logger.info(f"Stats written to {stats_file}")
+        except OSError as e:
+            logger.error(f"Failed to write stats to {stats_file}: {str(e)}")
+
+
+def parse_fields(fields: str) -> List[str]:
+    """
+    Parse the value of the --fields option, exiting with an error if a field is invalid.
+
+    Args:
+        fields (str): Comma-separated dotted field names.
+
+    Returns:
+        List[str]: The field names.
+    """
+    field_list = [field.strip() for field in fields.split(",") if field.strip()]
+    try:
+        FieldProjection(field_list)
+    except ValueError as e:
+        logger.error(f"Invalid --fields: {str(e)}")
+        sys.exit(1)
+    return field_list
+
+
+def compact_record_factory(format_type: str) -> Optional[RecordFactory]:
+    """
+    Get the factory of compact records holding the fields a format needs.
+
+    Args:
+        format_type (str): The output format.
+
+    Returns:
+        Optional[RecordFactory]: The record factory, or None if the format needs the full messages.
+    """
+    record_fields = fields_for_format(format_type)
+    if record_fields is None:
+        logger.warning(f"--compact is ignored for {format_type} output, which needs the full messages.")
+        return None
+    return RecordFactory(record_fields)
+
+
+def dump_many(
+    token: Optional[str],
+    channel_ids: List[str],
+    format_type: str,
+    output_file: Optional[str],
+    output_dir: str,
+    limit: Optional[int],
+    checkpoint: bool,
+    partitions: int,
+    workers: int,
+    verbose: bool,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    fields: Optional[List[str]] = None,
+    compress: Optional[str] = None,
+    compress_level: Optional[int] = None,
+    compress_threads: int = 0,
+    stats: Optional[DumpStats] = None,
+    compact: bool = False,
+    prefetch: bool = False,
+    format_workers: int = 1
+) -> None:
+    """
+    Run the dump command for several channels.
+
+    Every channel is fetched, formatted and written through a pipeline, as
+    with --pipeline for a single channel.
+
+    Args:
+        token (Optional[str]): The token given on the command line.
+        channel_ids (List[str]): The IDs of the channels to dump.
+        format_type (str): The output format.
+        output_file (Optional[str]): The output file given on the command line, which is not allowed here.
+        output_dir (str): Directory for the per-channel output files.
+        limit (Optional[int]): Maximum number of messages to retrieve per channel, or None for
+            each channel's whole history.
+        checkpoint (bool): Whether checkpointing was requested, which is not allowed here.
+        partitions (int): Number of time slices to fetch concurrently per channel.
+        workers (int): Number of channels fetched concurrently.
+        verbose (bool): Whether verbose logging is enabled.
+        since (Optional[datetime], optional): Only fetch messages created at or after this time. Defaults to None.
+        until (Optional[datetime], optional): Only fetch messages created before this time. Defaults to None.
+        row_group_size (int, optional): Number of messages per row group of Parquet output. Defaults to 10000.
+        fields (Optional[List[str]], optional): Message fields to keep. Defaults to None, which keeps every field.
+        compress (Optional[str], optional): Compression of the output files (gzip, zstd). Defaults to None.
+        compress_level (Optional[int], optional): Compression level. Defaults to None,
+            which uses the compression's default level.
+        compress_threads (int, optional): Number of zstd worker threads per file. Defaults to 0.
+        stats (Optional[DumpStats], optional): Collector of the dump's hot-path timings and counters.
+            Defaults to None.
+        compact (bool, optional): Whether to keep only the fields the format needs. Defaults to False.
+        prefetch (bool, optional): Whether to request each channel's next page while the current one
+            is processed. Defaults to False.
+        format_workers (int, optional): Number of formatting processes requested, which must be 1 here.
+            Defaults to 1.
+    """
+    if output_file:
+        logger.error("--output-file cannot be used with several channels. Use --output-dir instead.")
+        sys.exit(1)
+    if checkpoint:
+        logger.error("--checkpoint and --resume cannot be used with several channels.")
+        sys.exit(1)
+    if format_workers > 1:
+        logger.error("--format-workers cannot be used with several channels, which are formatted page by page.")
+        sys.exit(1)
+
+    token, _ = resolve_credentials(token, channel_ids[0])
+
+    # Every worker may hold a connection, so size the pool to match
+    connections = workers * partitions
+    client_options: Dict[str, Any] = {"pool_maxsize": connections} if connections > 10 else {}
+    if fields:
+        client_options["fields"] = fields
+    if compact:
+        record_factory = compact_record_factory(format_type)
+        if record_factory is not None:
+            client_options["record_factory"] = record_factory
+    if stats is not None:
+        client_options["stats"] = stats
+    client = DiscordApiClient(token, **client_options)
+
+    try:
+        logger.info(f"Fetching {describe_limit(limit)} from each of {len(channel_ids)} channels with {workers} workers")
+        start = time.monotonic()
+        results = dump_channels(
+            client, channel_ids, format_type, output_dir, limit, workers, partitions, since, until,
+            row_group_size, compress, compress_level, compress_threads, stats, prefetch
+        )
+        log_throughput_summary(results, time.monotonic() - start)
+    except Exception as e:
+        logger.error(f"Error: {str(e)}")
+        if verbose:
+            logger.exception("Detailed error information:")
+        sys.exit(1)
+    finally:
+        client.close()
+
+    if any(result["error"] for result in results):
+        sys.exit(1)
+
+
+def sync_sqlite_archive(
+    client: DiscordApiClient,
+    channel_id: str,
+    archive_file: str,
+    state: SyncState
+) -> None:
+    """
+    Append the messages newer than the last sync to a SQLite archive.
+
+    Args:
+        client (DiscordApiClient): The Discord API client.
+        channel_id (str): The ID of the channel to sync.
+        archive_file (str): Path of the SQLite archive.
+        state (SyncState): The sync state, updated and saved with the newest archived message.
+    """
+    with SqliteArchive(archive_file) as archive:
+        # The archive itself says how far it goes, whatever the state file recorded
+        after = archive.newest_message_id(channel_id)
+        if after:
+            logger.info(f"Fetching messages newer than {after} from channel {channel_id}")
+        else:
+            logger.info(f"No previous sync found. Fetching the full history of channel {channel_id}")
+
+        added = 0
+        newest = after
+        with progress_bar(desc="Fetching new messages", unit="msg") as pbar:
+            for page in client.iter_pages(channel_id, after=after):
+                added += archive.write(page)
+                # A first sync pages backwards, newest first, so take the largest ID seen
+                page_newest = max(page, key=lambda message: int(message["id"]))["id"]
+                if newest is None or int(page_newest) > int(newest):
+                    newest = page_newest
+                pbar.update(len(page))
+
+                if after:
+                    # Walking forwards, every page is complete up to newest,
+                    # so an interrupted sync resumes here
+                    state.set(archive_file, channel_id, newest)
+                    state.save()
+
+        if added:
+            logger.info(f"Added {added} new messages to {archive_file} ({archive.count()} total)")
+        else:
+            logger.info(f"{archive_file} is already up to date")
+
+    if newest:
+        state.set(archive_file, channel_id, newest)
+        state.save()
+
+
+@cli.command()
+@click.option(
+    "--token",
+    help="Discord user token for authentication. Can also be set via DISCORD_TOKEN environment variable."
+)
+@click.option(
+    "--channel-id",
+    help="ID of the Discord channel to sync. Can also be set via DISCORD_CHANNEL_ID environment variable."
+)
+@click.option(
+    "--archive",
+    "archive_file",
+    required=True,
+    help="Path of the archive to update. It is created with the full history on the first sync."
+)
+@click.option(
+    "--format",
+    "format_type",
+    type=click.Choice(SYNC_FORMATS, case_sensitive=False),
+    default="json",
+    help="Format of the archive. Default: json"
+)
+@click.option(
+    "--state-file",
+    default=".discord-dump-sync.json",
+    help="File recording the newest archived message of each archive and channel. Default: .discord-dump-sync.json"
+)
+@click.option(
+    "--verbose",
+    is_flag=True,
+    help="Enable verbose logging."
+)
+def sync(
+    token: Optional[str],
+    channel_id: Optional[str],
+    archive_file: str,
+    format_type: str,
+    state_file: str,
+    verbose: bool
+) -> None:
+    """
+    Fetch only the messages newer than the last sync and merge them into an archive.
+
+    The newest message ID in the archive is used as the `after` cursor, so quiet
+    channels are brought up to date with a single request, and a new or deleted
+    archive is filled with the full history. The state file records the newest
+    archived message of each archive and channel. SQLite archives are appended to
+    in place, one transaction per page.
+    """
+    # Set up logging based on verbosity
+    setup_logging(verbose)
+
+    token, channel_id = resolve_credentials(token, channel_id)
+
+    client = DiscordApiClient(token)
+
+    try:
+        state = SyncState.load(state_file)
+
+        if format_type.lower() == "sqlite":
+            sync_sqlite_archive(client, channel_id, archive_file, state)
+            return
+
+        existing = read_json_archive(archive_file)
+
+        # The archive itself says how far it goes, whatever the state file recorded
+        after = newest_message_id(existing)
+        if after:
+            logger.info(f"Fetching messages newer than {after} from channel {channel_id}")
+        else:
+            logger.info(f"No previous sync found. Fetching the full history of channel {channel_id}")
+
+        new_messages: List[Dict[str, Any]] = []
+        with progress_bar(desc="Fetching new messages", unit="msg") as pbar:
+            for page in client.iter_pages(channel_id, after=after):
+                new_messages.extend(page)
+                pbar.update(len(page))
+
+        if new_messages:
+            merged = merge_messages(existing, new_messages)
+            write_json_archive(archive_file, merged)
+            after = newest_message_id(merged)
+            logger.info(f"Added {len(new_messages)} new messages to {archive_file} ({len(merged)} total)")
+        else:
+            logger.info(f"{archive_file} is already up to date")
+
+        if after:
+            state.set(archive_file, channel_id, after)
+            state.save()
+
+    except Exception as e:
+        logger.error(f"Error: {str(e)}")
+        if verbose:
+            logger.exception("Detailed error information:")
+        sys.exit(1)
+    finally:
+        client.close()
+
+
+@cli.command()
+@click.argument("query", required=False)
+@click.option(
+    "--archive",
+    "archive_file",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="Path of the SQLite archive to search, as written by --format sqlite."
+)
+@click.option(
+    "--author",
+    help="Only show messages by this username."
+)
+@click.option(
+    "--channel-id",
+    help="Only show messages from this channel."
+)
+@click.option(
+    "--since",
+    type=click.DateTime(formats=["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S"]),
+    help="Only show messages created at or after this UTC date or time."
+)
+@click.option(
+    "--until",
+    type=click.DateTime(formats=["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S"]),
+    help="Only show messages created before this UTC date or time."
+)
+@click.option(
+    "--limit",
+    type=click.IntRange(min=1),
+    default=20,
+    help="Maximum number of results. Default: 20"
+)
+@click.option(
+    "--verbose",
+    is_flag=True,
+    help="Enable verbose logging."
+)
+def search(
+    query: Optional[str],
+    archive_file: str,
+    author: Optional[str],
+    channel_id: Optional[str],
+    since: Optional[datetime],
+    until: Optional[datetime],
+    limit: int,
+    verbose: bool
+) -> None:
+    """
+    Search a SQLite archive using its full-text index.
+
+    QUERY uses the SQLite FTS5 syntax: all words must match, "quoted text" matches
+    a phrase, and OR, NOT and prefix* are supported. Each result shows the message
+    ID, timestamp, author and the matching part of the content.
+    """
+    # Set up logging based on verbosity
+    setup_logging(verbose)
+
+    if not query and not author:
+        logger.error("Provide a search query or --author.")
+        sys.exit(1)
+
+    try:
+        start = time.monotonic()
+        with SqliteArchive(archive_file, read_only=True) as archive:
+            results = archive.search(query, author, channel_id, since, until, limit)
+        logger.debug(f"Found {len(results)} results in {(time.monotonic() - start) * 1000:.1f} ms")
+    except (ValueError, sqlite3.Error) as e:
+        logger.error(f"Error: {str(e)}")
+        sys.exit(1)
+
+    if not results:
+        logger.info("No matching messages found.")
+        return
+
+    for result in results:
+        snippet = (result["snippet"] or "").replace("\n", " ")
+        click.echo(f"{result['id']}  [{result['timestamp']}] {result['author']}: {snippet}")
 
 
 def main():
@@ -0,0 +1,297 @@
+"""Columnar export of Discord messages to Parquet.
+
+This module provides a MessageTable that collects messages column by column
+and a ParquetMessageWriter that flushes the table to a Parquet file one row
+group at a time, so very large channels can be exported in bounded memory.
+The file is written next to its target and renamed over it once complete.
+Requires pyarrow, which is only imported once a table is built.
+"""
+
+import importlib.util
+import logging
+import os
+import uuid
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+
+logger = logging.getLogger("discord-dump.columnar")
+
+# Number of messages per Parquet row group
+DEFAULT_ROW_GROUP_SIZE = 10000
+
+
+def _import_pyarrow() -> None:
+    """Import pyarrow into the module on first use."""
+    global pa, pq
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+
+def message_schema() -> "pa.Schema":
+    """Build the Arrow schema of exported messages.
+
+    Returns:
+        pa.Schema: Typed columns with int64 snowflakes, UTC timestamps,
+            dictionary-encoded usernames and nested attachments.
+    """
+    _import_pyarrow()
+    attachment = pa.struct([
+        ("id", pa.int64()),
+        ("filename", pa.string()),
+        ("url", pa.string()),
+        ("size", pa.int64()),
+    ])
+    return pa.schema([
+        ("id", pa.int64()),
+        ("channel_id", pa.int64()),
+        ("author_id", pa.int64()),
+        ("author_username", pa.dictionary(pa.int32(), pa.string())),
+        ("timestamp", pa.timestamp("us", tz="UTC")),
+        ("edited_timestamp", pa.timestamp("us", tz="UTC")),
+        ("content", pa.string()),
+        ("pinned", pa.bool_()),
+        ("attachments", pa.list_(attachment)),
+    ])
+
+
+def _to_int(value: Any) -> Optional[int]:
+    """Convert a snowflake or size to an int, or None if it is missing or malformed."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_datetime(value: Any) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp from the API, or None if it is missing or malformed."""
+    if not isinstance(value, str):
+        return None
+    try:
+        # fromisoformat only accepts the Z suffix from Python 3.11 on
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+class MessageTable:
+    """Column-oriented buffer of Discord messages.
+
+    Each field is appended to its own column as messages arrive, so a batch
+    can be handed to Arrow without converting row dictionaries first.
+
+    Attributes:
+        schema (pa.Schema): The Arrow schema of the table.
+        columns (Dict[str, List[Any]]): The buffered values of each column.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty table."""
+        self.schema = message_schema()
+        self.columns: Dict[str, List[Any]] = {name: [] for name in self.schema.names}
+
+    def __len__(self) -> int:
+        """Return the number of buffered messages."""
+        return len(self.columns["id"])
+
+    def append(self, message: Dict[str, Any]) -> None:
+        """Add a message to the table.
+
+        Args:
+            message (Dict[str, Any]): A Discord message object.
+        """
+        author = message.get("author") or {}
+        columns = self.columns
+        columns["id"].append(_to_int(message.get("id")))
+        columns["channel_id"].append(_to_int(message.get("channel_id")))
+        columns["author_id"].append(_to_int(author.get("id")))
+        columns["author_username"].append(author.get("username"))
+        columns["timestamp"].append(_to_datetime(message.get("timestamp")))
+        columns["edited_timestamp"].append(_to_datetime(message.get("edited_timestamp")))
+        columns["content"].append(message.get("content"))
+        columns["pinned"].append(message.get("pinned"))
+        columns["attachments"].append([
+            {
+                "id": _to_int(attachment.get("id")),
+                "filename": attachment.get("filename"),
+                "url": attachment.get("url"),
+                "size": _to_int(attachment.get("size")),
+            }
+            for attachment in message.get("attachments") or []
+        ])
+
+    def extend(self, messages: Iterable[Dict[str, Any]]) -> None:
+        """Add several messages to the table.
+
+        Args:
+            messages (Iterable[Dict[str, Any]]): Discord message objects.
+        """
+        for message in messages:
+            self.append(message)
+
+    def to_record_batch(self) -> "pa.RecordBatch":
+        """Convert the buffered messages to an Arrow record batch.
+
+        Returns:
+            pa.RecordBatch: The buffered messages with the table's schema.
+        """
+        arrays = [
+            pa.array(self.columns[field.name], type=field.type)
+            for field in self.schema
+        ]
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+    def clear(self) -> None:
+        """Remove all buffered messages."""
+        for values in self.columns.values():
+            values.clear()
+
+
+class ParquetMessageWriter:
+    """Streaming Parquet writer for Discord messages.
+
+    Messages are buffered in a MessageTable and written out as a row group
+    whenever `row_group_size` messages have accumulated, so memory use is
+    bounded by the row group size rather than by the channel size. The row
+    groups go to a temporary file that replaces the target when the writer is
+    closed, so an existing file is only overwritten by a complete one.
+
+    Attributes:
+        path (str): Path of the Parquet file.
+        temp_path (str): Path of the temporary file being written.
+        row_group_size (int): Number of messages per row group.
+        count (int): The number of messages written so far.
+    """
+
+    def __init__(self, path: str, row_group_size: int = DEFAULT_ROW_GROUP_SIZE) -> None:
+        """Open a Parquet file for writing, creating its directory if needed.
+
+        Args:
+            path (str): Path of the Parquet file.
+            row_group_size (int, optional): Number of messages per row group. Defaults to 10000.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError(
+                "pyarrow is required for Parquet output. Install it with 'pip install pyarrow'."
+            )
+
+        directory = os.path.dirname(os.path.abspath(path))
+        self.path = path
+        self.temp_path = os.path.join(directory, f".{os.path.basename(path)}.{uuid.uuid4().hex[:12]}.tmp")
+        self.row_group_size = row_group_size
+        self.count = 0
+        _import_pyarrow()
+        self._table = MessageTable()
+        # Create directory if it doesn't exist
+        os.makedirs(directory, exist_ok=True)
+        self._writer = pq.ParquetWriter(self.temp_path, self._table.schema)
+        self._closed = False
+
+    def write(self, messages: Iterable[Dict[str, Any]]) -> None:
+        """Add messages to the file, flushing full row groups.
+
+        Args:
+            messages (Iterable[Dict[str, Any]]): Discord message objects.
+        """
+        for message in messages:
+            self._table.append(message)
+            self.count += 1
+            if len(self._table) >= self.row_group_size:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered messages as a row group."""
+        if not len(self._table):
+            return
+        self._writer.write_batch(self._table.to_record_batch())
+        logger.debug(f"Row group written: {len(self._table)} messages, {self.count} in total")
+        self._table.clear()
+
+    def close(self) -> None:
+        """Write the remaining messages, finish the file and move it over the target."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self.flush()
+            self._writer.close()
+            os.replace(self.temp_path, self.path)
+        except BaseException:
+            self._discard()
+            raise
+
+    def abort(self) -> None:
+        """Discard the file, leaving any existing target untouched."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._writer.close()
+        finally:
+            self._discard()
+
+    def _discard(self) -> None:
+        """Remove the temporary file if it still exists."""
+        try:
+            os.remove(self.temp_path)
+        except OSError:
+            pass
+
+    def __enter__(self) -> "ParquetMessageWriter":
+        """
+        Enter the runtime context for the writer.
+
+        Returns:
+            ParquetMessageWriter: The writer itself.
+        """
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        """
+        Exit the runtime context, finishing the file or discarding it if an exception was raised.
+
+        Args:
+            exc_type (Any): The exception type, if an exception was raised.
+            exc_value (Any): The exception instance, if an exception was raised.
+            traceback (Any): The traceback, if an exception was raised.
+        """
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+def write_parquet(
+    messages: Iterable[Dict[str, Any]],
+    path: str,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE
+) -> int:
+    """Stream messages into a Parquet file.
+
+    Without any messages the file is not written, so an existing file is kept.
+
+    Args:
+        messages (Iterable[Dict[str, Any]]): Discord message objects, consumed lazily.
+        path (str): Path of the Parquet file.
+        row_group_size (int, optional): Number of messages per row group. Defaults to 10000.
+
+    Returns:
+        int: The number of messages written.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    with ParquetMessageWriter(path, row_group_size) as writer:
+        writer.write(messages)
+        if not writer.count:
+            writer.abort()
+    return writer.count
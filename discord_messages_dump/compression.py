@@ -0,0 +1,115 @@
+"""Compressed output files for Discord Messages Dump.
+
+Formatted message archives are highly compressible text. This module wraps
+output files in compressors that work incrementally as chunks are written,
+so the uncompressed output never touches the disk. The compression is
+selected by the file extension: `.gz` for gzip and `.zst` for Zstandard,
+which requires the zstandard package.
+"""
+
+import gzip
+import os
+from typing import BinaryIO, Dict, Optional
+
+try:
+    import zstandard
+    ZSTANDARD_AVAILABLE = True
+except ImportError:
+    ZSTANDARD_AVAILABLE = False
+
+
+# File extension of each compression
+COMPRESSION_EXTENSIONS: Dict[str, str] = {
+    "gzip": ".gz",
+    "zstd": ".zst",
+}
+
+# Compression levels used when none is given
+DEFAULT_LEVELS: Dict[str, int] = {
+    "gzip": 6,
+    "zstd": 3,
+}
+
+
+def compression_for_path(path: str) -> Optional[str]:
+    """Determine the compression of a file from its extension.
+
+    Args:
+        path (str): Path of the file.
+
+    Returns:
+        Optional[str]: "gzip" or "zstd", or None for an uncompressed file.
+    """
+    lower = path.lower()
+    for compression, extension in COMPRESSION_EXTENSIONS.items():
+        if lower.endswith(extension):
+            return compression
+    return None
+
+
+def with_compression_extension(path: str, compression: str) -> str:
+    """Append the extension of a compression to a path unless it already has it.
+
+    Args:
+        path (str): Path of the file, e.g. "messages.txt".
+        compression (str): The compression (gzip, zstd).
+
+    Returns:
+        str: The path with the compression's extension, e.g. "messages.txt.gz".
+
+    Raises:
+        ValueError: If the compression is not supported.
+    """
+    extension = COMPRESSION_EXTENSIONS.get(compression.lower())
+    if extension is None:
+        raise ValueError(
+            f"Unsupported compression: {compression}. "
+            f"Valid options are: {', '.join(COMPRESSION_EXTENSIONS)}"
+        )
+    return path if path.lower().endswith(extension) else path + extension
+
+
+def compress_stream(raw: BinaryIO, path: str, level: Optional[int] = None, threads: int = 0) -> BinaryIO:
+    """Wrap a binary file in the compressor its target path asks for.
+
+    Data written to the returned stream is compressed as it arrives. Closing
+    the stream finishes the compressed data but leaves `raw` open, so the
+    caller can still flush and sync it.
+
+    Args:
+        raw (BinaryIO): The writable binary file receiving the compressed data.
+        path (str): Path of the target file. A `.gz` or `.zst` extension selects the compression.
+        level (Optional[int], optional): Compression level, 0-9 for gzip and 1-22 for zstd.
+            Defaults to None, which uses 6 for gzip and 3 for zstd.
+        threads (int, optional): Number of zstd worker threads, or -1 for one per CPU.
+            Ignored for gzip. Defaults to 0, which compresses on the writing thread.
+
+    Returns:
+        BinaryIO: The compressing stream, or `raw` itself if the path is not compressed.
+
+    Raises:
+        ImportError: If zstd compression is requested and zstandard is not installed.
+    """
+    compression = compression_for_path(path)
+
+    if compression == "gzip":
+        # The header records the target's name rather than that of `raw`
+        return gzip.GzipFile(
+            filename=os.path.basename(path),
+            mode="wb",
+            compresslevel=DEFAULT_LEVELS["gzip"] if level is None else level,
+            fileobj=raw
+        )
+
+    if compression == "zstd":
+        if not ZSTANDARD_AVAILABLE:
+            raise ImportError(
+                "zstandard is required for .zst output. Install it with 'pip install zstandard'."
+            )
+        compressor = zstandard.ZstdCompressor(
+            level=DEFAULT_LEVELS["zstd"] if level is None else level,
+            threads=threads
+        )
+        return compressor.stream_writer(raw, closefd=False)  # type: ignore[return-value]
+
+    return raw
@@ -10,7 +10,6 @@ import logging
 from typing import Optional, Dict, Any, Union
 from pathlib import Path
 
-import dotenv
 try:
     import keyring
     KEYRING_AVAILABLE = True
@@ -35,7 +34,7 @@ class Config:
     Attributes:
         token (str): The Discord user token.
         channel_id (str): The Discord channel ID.
-        format_type (str): The output format (text, json, csv, markdown).
+        format_type (str): The output format (text, json, jsonl, csv, markdown, parquet, sqlite).
         output_file (Optional[str]): The output file path.
         limit (int): The maximum number of messages to retrieve.
         log_level (str): The log level.
@@ -46,7 +45,7 @@ class Config:
     CHANNEL_ID_PATTERN = r"^[0-9]{17,19}$"
     
     # Valid format types
-    VALID_FORMATS = ["text", "json", "csv", "markdown"]
+    VALID_FORMATS = ["text", "json", "jsonl", "csv", "markdown", "parquet", "sqlite"]
     
     # Valid log levels
     VALID_LOG_LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
@@ -79,6 +78,7 @@ class Config:
     def _load_env_file(self) -> None:
         """Load environment variables from .env file."""
         if os.path.exists(self.env_file):
+            import dotenv
             dotenv.load_dotenv(self.env_file)
             logger.debug(f"Loaded environment variables from {self.env_file}")
         else:
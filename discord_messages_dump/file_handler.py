@@ -1,14 +1,19 @@
 """File handler for Discord Messages Dump.
 
 This module provides a FileHandler class for handling file operations
-such as opening file dialogs and saving content to files.
+such as opening file dialogs and saving content to files. tkinter is only
+imported when a dialog is shown, so headless use never loads the GUI toolkit.
 """
 
+import logging
 import os
-import tkinter as tk
-from tkinter import filedialog, messagebox
 from typing import Optional
 
+from discord_messages_dump.atomic_writer import AtomicFileWriter
+
+
+logger = logging.getLogger("discord-dump.file_handler")
+
 
 class FileHandler:
     """
@@ -30,7 +35,7 @@ class FileHandler:
         Get the appropriate file extension for the given format type.
         
         Args:
-            format_type (str): The format type (text, json, csv, markdown).
+            format_type (str): The format type (text, json, jsonl, csv, markdown, parquet, sqlite).
             
         Returns:
             str: The file extension including the dot (e.g., ".txt").
@@ -38,8 +43,11 @@ class FileHandler:
         format_map = {
             "text": ".txt",
             "json": ".json",
+            "jsonl": ".jsonl",
             "csv": ".csv",
-            "markdown": ".md"
+            "markdown": ".md",
+            "parquet": ".parquet",
+            "sqlite": ".sqlite"
         }
         return format_map.get(format_type.lower(), ".txt")
     
@@ -48,7 +56,7 @@ class FileHandler:
         Get file type information for the given format type.
         
         Args:
-            format_type (str): The format type (text, json, csv, markdown).
+            format_type (str): The format type (text, json, jsonl, csv, markdown, parquet, sqlite).
             
         Returns:
             tuple: A tuple containing (extension, filetypes, default_filename).
@@ -58,12 +66,21 @@ class FileHandler:
         if format_type.lower() == "json":
             filetypes = [("JSON Files", "*.json"), ("All Files", "*.*")]
             default_filename = "discord_messages.json"
+        elif format_type.lower() == "jsonl":
+            filetypes = [("JSON Lines Files", "*.jsonl"), ("All Files", "*.*")]
+            default_filename = "discord_messages.jsonl"
         elif format_type.lower() == "csv":
             filetypes = [("CSV Files", "*.csv"), ("All Files", "*.*")]
             default_filename = "discord_messages.csv"
         elif format_type.lower() == "markdown":
             filetypes = [("Markdown Files", "*.md"), ("All Files", "*.*")]
             default_filename = "discord_messages.md"
+        elif format_type.lower() == "parquet":
+            filetypes = [("Parquet Files", "*.parquet"), ("All Files", "*.*")]
+            default_filename = "discord_messages.parquet"
+        elif format_type.lower() == "sqlite":
+            filetypes = [("SQLite Databases", "*.sqlite *.db"), ("All Files", "*.*")]
+            default_filename = "discord_messages.sqlite"
         else:  # Default to text
             filetypes = [("Text Files", "*.txt"), ("All Files", "*.*")]
             default_filename = "discord_messages.txt"
@@ -81,6 +98,9 @@ class FileHandler:
         Returns:
             Optional[str]: The selected file path, or None if canceled.
         """
+        import tkinter as tk
+        from tkinter import filedialog
+
         root = tk.Tk()
         root.withdraw()  # Hide the main window
         
@@ -120,6 +140,9 @@ class FileHandler:
         Returns:
             bool: True if the user confirms overwrite, False otherwise.
         """
+        import tkinter as tk
+        from tkinter import messagebox
+
         root = tk.Tk()
         root.withdraw()  # Hide the main window
         
@@ -131,13 +154,21 @@ class FileHandler:
         
         return result
     
-    def save_content(self, content: str, file_path: str) -> bool:
+    def save_content(self, content: str, file_path: str, level: Optional[int] = None, threads: int = 0) -> bool:
         """
         Save content to a file.
         
+        The content is written to a temporary file that replaces the target
+        only once it is complete, so an interrupted save never leaves a
+        truncated file behind. Files ending in .gz or .zst are compressed with
+        gzip or zstd as the content is written.
+        
         Args:
             content (str): The content to save.
             file_path (str): Path to save the content to.
+            level (Optional[int], optional): Compression level of a compressed file. Defaults to None,
+                which uses the compression's default level.
+            threads (int, optional): Number of zstd worker threads, or -1 for one per CPU. Defaults to 0.
             
         Returns:
             bool: True if the save was successful, False otherwise.
@@ -151,20 +182,35 @@ class FileHandler:
             if directory and not os.path.exists(directory):
                 os.makedirs(directory)
                 
-            # Write content to file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # Write content to a temporary file and move it into place
+            with AtomicFileWriter(file_path, level=level, threads=threads) as writer:
+                writer.write(content)
                 
             return True
         except IOError as e:
             # Show error message
-            root = tk.Tk()
-            root.withdraw()
-            messagebox.showerror("Save Error", f"Error saving file: {str(e)}")
+            self._show_error("Save Error", f"Error saving file: {str(e)}")
             return False
         except Exception as e:
             # Show error message for any other exceptions
+            self._show_error("Error", f"An unexpected error occurred: {str(e)}")
+            return False
+    
+    def _show_error(self, title: str, message: str) -> None:
+        """
+        Show an error dialog, or log the error where no GUI is available.
+        
+        Args:
+            title (str): The title of the dialog.
+            message (str): The error message.
+        """
+        try:
+            import tkinter as tk
+            from tkinter import messagebox
+
             root = tk.Tk()
             root.withdraw()
-            messagebox.showerror("Error", f"An unexpected error occurred: {str(e)}")
-            return False
+            messagebox.showerror(title, message)
+        except Exception:
+            # No Tk installed, or no display to show it on
+            logger.error(f"{title}: {message}")
@@ -1,14 +1,20 @@
 """Message processor and formatters for Discord message data.
 
 This module provides classes for processing and formatting Discord message data
-into various output formats including plain text, JSON, CSV, and Markdown.
+into various output formats including plain text, JSON, JSON Lines, CSV, and Markdown.
+Large message lists can be formatted in chunks across a process pool.
 """
 
 import abc
 import csv
 import io
 import json
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Type
+
+
+# Number of messages formatted by each task of a process pool
+DEFAULT_CHUNK_SIZE = 10000
 
 
 class MessageProcessingError(Exception):
@@ -20,11 +26,17 @@ class MessageFormatter(abc.ABC):
     """Abstract base class for message formatters.
     
     This class defines the interface for all message formatters.
-    Concrete formatter classes should inherit from this class and
-    implement the format method.
+    Output is produced incrementally: a header (which may depend on the
+    first message), one chunk per message and a footer. Concrete formatter
+    classes should inherit from this class and implement the format_message
+    method, overriding format_header and format_footer where needed.
+    
+    Attributes:
+        name (str): Human-readable name of the format, used in error messages.
     """
     
-    @abc.abstractmethod
+    name = "messages"
+    
     def format(self, messages: List[Dict[str, Any]]) -> str:
         """Format the messages into a specific output format.
         
@@ -37,148 +49,349 @@ class MessageFormatter(abc.ABC):
         Raises:
             MessageProcessingError: If there's an error formatting the messages.
         """
+        return "".join(self.format_stream(messages))
+    
+    def format_stream(
+        self,
+        messages: Iterable[Dict[str, Any]],
+        start_index: int = 0,
+        final: bool = True
+    ) -> Iterator[str]:
+        """Format messages incrementally, yielding output chunks as they are produced.
+        
+        The messages are consumed lazily, so a generator of messages can be
+        formatted in constant memory. Joining the chunks gives exactly the
+        same output as format.
+        
+        Output can be produced in several calls, e.g. one per page or across
+        a resumed run: pass the number of messages already written as
+        start_index and set final to False on every call but the last.
+        
+        Args:
+            messages (Iterable[Dict[str, Any]]): Iterable of Discord message objects.
+            start_index (int, optional): Number of messages already written by earlier calls.
+                The header is only emitted when this is 0. Defaults to 0.
+            final (bool, optional): Whether to emit the footer after the last message. Defaults to True.
+            
+        Yields:
+            str: Chunks of formatted output.
+            
+        Raises:
+            MessageProcessingError: If there's an error formatting the messages.
+        """
+        index = start_index
+        for message in messages:
+            if index == 0:
+                yield self._render(self.format_header, message)
+            yield self._render(self.format_message, message, index)
+            index += 1
+        
+        if final:
+            if index == 0:
+                yield self._render(self.format_header, None)
+            yield self._render(self.format_footer, index)
+    
+    def format_header(self, first_message: Optional[Dict[str, Any]]) -> str:
+        """Format the output that precedes the first message.
+        
+        Args:
+            first_message (Optional[Dict[str, Any]]): The first message, or None if there are no messages.
+            
+        Returns:
+            str: The formatted header.
+        """
+        return ""
+    
+    @abc.abstractmethod
+    def format_message(self, message: Dict[str, Any], index: int) -> str:
+        """Format a single message, including any separator that precedes it.
+        
+        Args:
+            message (Dict[str, Any]): A Discord message object.
+            index (int): Position of the message in the output, starting at 0.
+            
+        Returns:
+            str: The formatted message.
+        """
         pass
-
-
-class TextFormatter(MessageFormatter):
-    """Formatter for plain text output."""
     
-    def format(self, messages: List[Dict[str, Any]]) -> str:
-        """Format messages as plain text.
+    def format_footer(self, count: int) -> str:
+        """Format the output that follows the last message.
         
-        Format: [timestamp] username: content
+        Args:
+            count (int): The number of messages that were formatted.
+            
+        Returns:
+            str: The formatted footer.
+        """
+        return ""
+    
+    def _render(self, method: Callable[..., str], *args: Any) -> str:
+        """Call a formatting hook, wrapping any error in a MessageProcessingError.
         
         Args:
-            messages (List[Dict[str, Any]]): List of Discord message objects.
+            method (Callable[..., str]): The formatting hook to call.
+            *args (Any): Arguments for the hook.
             
         Returns:
-            str: Messages formatted as plain text.
+            str: The formatted chunk.
             
         Raises:
-            MessageProcessingError: If there's an error formatting the messages.
+            MessageProcessingError: If the hook raises an exception.
         """
         try:
-            result = []
-            for message in messages:
-                # Extract required fields with fallbacks for malformed data
-                timestamp = message.get('timestamp', 'unknown_time')
-                author = message.get('author', {})
-                username = author.get('username', 'unknown_user')
-                content = message.get('content', '')
-                
-                # Format the message
-                result.append(f"[{timestamp}] {username}: {content}")
-            
-            return "\n".join(result)
+            return method(*args)
         except Exception as e:
-            raise MessageProcessingError(f"Error formatting messages as text: {str(e)}")
+            raise MessageProcessingError(f"Error formatting messages as {self.name}: {str(e)}")
+
+
+class TextFormatter(MessageFormatter):
+    """Formatter for plain text output.
+    
+    Format: [timestamp] username: content
+    """
+    
+    name = "text"
+    
+    def format_message(self, message: Dict[str, Any], index: int) -> str:
+        """Format a message as a line of plain text.
+        
+        Args:
+            message (Dict[str, Any]): A Discord message object.
+            index (int): Position of the message in the output, starting at 0.
+            
+        Returns:
+            str: The message formatted as plain text, preceded by a newline unless it is the first.
+        """
+        # Extract required fields with fallbacks for malformed data
+        timestamp = message.get('timestamp', 'unknown_time')
+        author = message.get('author', {})
+        username = author.get('username', 'unknown_user')
+        content = message.get('content', '')
+        
+        line = f"[{timestamp}] {username}: {content}"
+        return line if index == 0 else "\n" + line
 
 
 class JsonFormatter(MessageFormatter):
-    """Formatter for JSON output."""
+    """Formatter for JSON output.
     
-    def format(self, messages: List[Dict[str, Any]]) -> str:
-        """Format messages as JSON.
+    The output is a JSON array indented by two spaces, identical to
+    ``json.dumps(messages, indent=2)``.
+    """
+    
+    name = "JSON"
+    
+    def format_header(self, first_message: Optional[Dict[str, Any]]) -> str:
+        """Open the JSON array.
         
         Args:
-            messages (List[Dict[str, Any]]): List of Discord message objects.
+            first_message (Optional[Dict[str, Any]]): The first message, or None if there are no messages.
             
         Returns:
-            str: Messages formatted as a JSON string.
+            str: The opening bracket.
+        """
+        return "["
+    
+    def format_message(self, message: Dict[str, Any], index: int) -> str:
+        """Format a message as an element of the indented JSON array.
+        
+        Args:
+            message (Dict[str, Any]): A Discord message object.
+            index (int): Position of the message in the output, starting at 0.
             
-        Raises:
-            MessageProcessingError: If there's an error formatting the messages.
+        Returns:
+            str: The message as indented JSON, preceded by the element separator.
         """
-        try:
-            return json.dumps(messages, indent=2)
-        except Exception as e:
-            raise MessageProcessingError(f"Error formatting messages as JSON: {str(e)}")
+        element = "  " + json.dumps(message, indent=2).replace("\n", "\n  ")
+        return ("\n" if index == 0 else ",\n") + element
+    
+    def format_footer(self, count: int) -> str:
+        """Close the JSON array.
+        
+        Args:
+            count (int): The number of messages that were formatted.
+            
+        Returns:
+            str: The closing bracket.
+        """
+        return "]" if count == 0 else "\n]"
+
+
+class JsonLinesFormatter(MessageFormatter):
+    """Formatter for JSON Lines output.
+    
+    Each message is written as one compact JSON object per line, so the
+    output can be produced and read back one message at a time.
+    """
+    
+    name = "JSON Lines"
+    
+    def format_message(self, message: Dict[str, Any], index: int) -> str:
+        """Format a message as a line of compact JSON.
+        
+        Args:
+            message (Dict[str, Any]): A Discord message object.
+            index (int): Position of the message in the output, starting at 0.
+            
+        Returns:
+            str: The message as compact JSON, followed by a newline.
+        """
+        return json.dumps(message, separators=(",", ":")) + "\n"
 
 
 class CsvFormatter(MessageFormatter):
-    """Formatter for CSV output."""
+    """Formatter for CSV output.
     
-    def format(self, messages: List[Dict[str, Any]]) -> str:
-        """Format messages as CSV.
+    CSV columns: timestamp, author_id, author_username, content
+    """
+    
+    name = "CSV"
+    
+    def __init__(self) -> None:
+        """Initialize the formatter with a reusable row buffer."""
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, quoting=csv.QUOTE_MINIMAL)
+    
+    def _format_row(self, row: List[Any]) -> str:
+        """Format a single CSV row.
         
-        CSV columns: timestamp, author_id, author_username, content
+        Args:
+            row (List[Any]): The values of the row.
+            
+        Returns:
+            str: The row formatted as CSV, including the line terminator.
+        """
+        self._buffer.seek(0)
+        self._buffer.truncate(0)
+        self._writer.writerow(row)
+        return self._buffer.getvalue()
+    
+    def format_header(self, first_message: Optional[Dict[str, Any]]) -> str:
+        """Format the CSV header row.
         
         Args:
-            messages (List[Dict[str, Any]]): List of Discord message objects.
+            first_message (Optional[Dict[str, Any]]): The first message, or None if there are no messages.
             
         Returns:
-            str: Messages formatted as CSV.
+            str: The header row.
+        """
+        return self._format_row(['timestamp', 'author_id', 'author_username', 'content'])
+    
+    def format_message(self, message: Dict[str, Any], index: int) -> str:
+        """Format a message as a CSV row.
+        
+        Args:
+            message (Dict[str, Any]): A Discord message object.
+            index (int): Position of the message in the output, starting at 0.
             
-        Raises:
-            MessageProcessingError: If there's an error formatting the messages.
+        Returns:
+            str: The message formatted as a CSV row.
         """
-        try:
-            output = io.StringIO()
-            writer = csv.writer(output, quoting=csv.QUOTE_MINIMAL)
-            
-            # Write header
-            writer.writerow(['timestamp', 'author_id', 'author_username', 'content'])
-            
-            # Write message data
-            for message in messages:
-                timestamp = message.get('timestamp', '')
-                author = message.get('author', {})
-                author_id = author.get('id', '')
-                username = author.get('username', '')
-                content = message.get('content', '')
-                
-                writer.writerow([timestamp, author_id, username, content])
-            
-            return output.getvalue()
-        except Exception as e:
-            raise MessageProcessingError(f"Error formatting messages as CSV: {str(e)}")
+        timestamp = message.get('timestamp', '')
+        author = message.get('author', {})
+        author_id = author.get('id', '')
+        username = author.get('username', '')
+        content = message.get('content', '')
+        
+        return self._format_row([timestamp, author_id, username, content])
 
 
 class MarkdownFormatter(MessageFormatter):
-    """Formatter for Markdown output."""
+    """Formatter for Markdown output.
     
-    def format(self, messages: List[Dict[str, Any]]) -> str:
-        """Format messages as Markdown.
-        
-        Format:
-        # Discord Messages
+    Format:
+    # Discord Messages
+    
+    ## Channel: channel_name
+    
+    ### username - timestamp
+    
+    message content
+    """
+    
+    name = "Markdown"
+    
+    def format_header(self, first_message: Optional[Dict[str, Any]]) -> str:
+        """Format the document title and, if known, the channel heading.
         
-        ## Channel: channel_name
+        Args:
+            first_message (Optional[Dict[str, Any]]): The first message, or None if there are no messages.
+            
+        Returns:
+            str: The Markdown header.
+        """
+        header = "# Discord Messages\n"
         
-        ### username - timestamp
+        # Try to get channel name from the first message
+        if first_message is not None and 'channel_id' in first_message:
+            channel_id = first_message.get('channel_id', 'unknown')
+            header += f"\n## Channel: {channel_id}\n"
         
-        message content
+        return header
+    
+    def format_message(self, message: Dict[str, Any], index: int) -> str:
+        """Format a message as a Markdown section.
         
         Args:
-            messages (List[Dict[str, Any]]): List of Discord message objects.
+            message (Dict[str, Any]): A Discord message object.
+            index (int): Position of the message in the output, starting at 0.
             
         Returns:
-            str: Messages formatted as Markdown.
-            
-        Raises:
-            MessageProcessingError: If there's an error formatting the messages.
+            str: The message formatted as Markdown.
         """
-        try:
-            result = ["# Discord Messages\n"]
-            
-            # Try to get channel name from the first message
-            if messages and 'channel_id' in messages[0]:
-                channel_id = messages[0].get('channel_id', 'unknown')
-                result.append(f"## Channel: {channel_id}\n")
-            
-            # Format each message
-            for message in messages:
-                timestamp = message.get('timestamp', 'unknown_time')
-                author = message.get('author', {})
-                username = author.get('username', 'unknown_user')
-                content = message.get('content', '')
-                
-                result.append(f"### {username} - {timestamp}\n")
-                result.append(f"{content}\n")
-            
-            return "\n".join(result)
-        except Exception as e:
-            raise MessageProcessingError(f"Error formatting messages as Markdown: {str(e)}")
+        timestamp = message.get('timestamp', 'unknown_time')
+        author = message.get('author', {})
+        username = author.get('username', 'unknown_user')
+        content = message.get('content', '')
+        
+        return f"\n### {username} - {timestamp}\n\n{content}\n"
+
+
+# Formatter classes by format type
+FORMATTERS: Dict[str, Type[MessageFormatter]] = {
+    "text": TextFormatter,
+    "json": JsonFormatter,
+    "jsonl": JsonLinesFormatter,
+    "csv": CsvFormatter,
+    "markdown": MarkdownFormatter,
+}
+
+
+def get_formatter(format_type: str) -> MessageFormatter:
+    """Create the formatter for a format type.
+    
+    Args:
+        format_type (str): The format type (text, json, jsonl, csv, markdown).
+        
+    Returns:
+        MessageFormatter: A new formatter instance.
+        
+    Raises:
+        ValueError: If the format type is not supported.
+    """
+    formatter_class = FORMATTERS.get(format_type.lower())
+    if formatter_class is None:
+        raise ValueError(
+            f"Unsupported format type: {format_type}. "
+            f"Valid options are: {', '.join(FORMATTERS)}"
+        )
+    return formatter_class()
+
+
+def _format_chunk(format_type: str, messages: List[Dict[str, Any]], start_index: int, final: bool) -> str:
+    """Format one chunk of a message list in a worker process.
+    
+    Args:
+        format_type (str): The format type.
+        messages (List[Dict[str, Any]]): The messages of the chunk.
+        start_index (int): Position of the chunk's first message in the whole output.
+        final (bool): Whether this is the last chunk, which emits the footer.
+        
+    Returns:
+        str: The formatted chunk.
+    """
+    return "".join(get_formatter(format_type).format_stream(messages, start_index, final))
 
 
 class MessageProcessor:
@@ -202,6 +415,67 @@ class MessageProcessor:
         
         self.messages = messages
     
+    def format_stream(self, format_type: str) -> Iterator[str]:
+        """Format messages incrementally in the given format.
+        
+        Args:
+            format_type (str): The format type (text, json, jsonl, csv, markdown).
+            
+        Yields:
+            str: Chunks of formatted output.
+            
+        Raises:
+            ValueError: If the format type is not supported.
+            MessageProcessingError: If there's an error formatting the messages.
+        """
+        return get_formatter(format_type).format_stream(self.messages)
+    
+    def format_parallel(
+        self,
+        format_type: str,
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> str:
+        """Format messages in chunks across a process pool.
+        
+        Each chunk is formatted with the position of its first message, and
+        only the last chunk emits the footer, so joining the chunks in order
+        gives exactly the same output as formatting serially. Lists of at
+        most one chunk are formatted in the current process.
+        
+        Args:
+            format_type (str): The format type (text, json, jsonl, csv, markdown).
+            workers (Optional[int], optional): Number of worker processes. Defaults to None,
+                which uses one per CPU.
+            chunk_size (int, optional): Number of messages per chunk. Defaults to 10000.
+            
+        Returns:
+            str: The formatted messages.
+            
+        Raises:
+            ValueError: If the format type is not supported or chunk_size is not positive.
+            MessageProcessingError: If there's an error formatting the messages.
+        """
+        # Fail fast on an unknown format, before any process is started
+        get_formatter(format_type)
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        
+        count = len(self.messages)
+        if count <= chunk_size or workers == 1:
+            return _format_chunk(format_type, self.messages, 0, True)
+        
+        starts = range(0, count, chunk_size)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = executor.map(
+                _format_chunk,
+                [format_type] * len(starts),
+                [self.messages[start:start + chunk_size] for start in starts],
+                starts,
+                [start + chunk_size >= count for start in starts]
+            )
+            return "".join(chunks)
+    
     def format_text(self) -> str:
         """Format messages as plain text.
         
@@ -226,6 +500,18 @@ class MessageProcessor:
         formatter = JsonFormatter()
         return formatter.format(self.messages)
     
+    def format_jsonl(self) -> str:
+        """Format messages as JSON Lines.
+        
+        Returns:
+            str: Messages formatted as JSON Lines, one message per line.
+            
+        Raises:
+            MessageProcessingError: If there's an error formatting the messages.
+        """
+        formatter = JsonLinesFormatter()
+        return formatter.format(self.messages)
+    
     def format_csv(self) -> str:
         """Format messages as CSV.
         
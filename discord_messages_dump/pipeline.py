@@ -0,0 +1,186 @@
+"""Pipelined processing of message pages.
+
+A Pipeline runs a source iterator and a chain of stages on their own threads,
+connected by bounded queues. While one stage works on an item the previous
+stage already produces the next one, so fetching, formatting and writing
+overlap and the total time approaches that of the slowest stage. A full
+queue blocks the stage that feeds it, which keeps memory use bounded.
+"""
+
+import queue
+import threading
+from typing import Any, Callable, Iterable, Iterator, List
+
+
+# Number of items each queue holds before its producer blocks
+DEFAULT_QUEUE_SIZE = 4
+
+# Seconds between checks of the stop flag while waiting on a queue
+_POLL_INTERVAL = 0.1
+
+# Marks the end of a stage's output
+_DONE = object()
+
+
+class Pipeline:
+    """Chain of processing stages connected by bounded queues.
+
+    The source is iterated on one thread and every stage runs on a thread
+    of its own. Iterating the pipeline yields the output of the last stage
+    in the calling thread, which typically writes it out. An exception in
+    the source or any stage stops the pipeline and is re-raised to the
+    caller, and leaving the iteration early stops all threads.
+
+    Example:
+        >>> pipeline = Pipeline(client.iter_pages(channel_id)).add_stage(format_page)
+        >>> for chunk in pipeline:
+        ...     output.write(chunk)
+
+    Attributes:
+        queue_size (int): Number of items each queue holds before its producer blocks.
+    """
+
+    def __init__(self, source: Iterable[Any], queue_size: int = DEFAULT_QUEUE_SIZE) -> None:
+        """Initialize the pipeline.
+
+        Args:
+            source (Iterable[Any]): The items to process, e.g. pages of messages.
+            queue_size (int, optional): Number of items each queue holds before its
+                producer blocks. Defaults to 4.
+
+        Raises:
+            ValueError: If queue_size is not positive.
+        """
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+
+        self.queue_size = queue_size
+        self._source = source
+        self._stages: List[Callable[[Any], Any]] = []
+
+    def add_stage(self, stage: Callable[[Any], Any]) -> "Pipeline":
+        """Append a stage that transforms each item.
+
+        Stages are called with one item at a time, in order, always from the
+        same thread, so they may keep state such as a running count.
+
+        Args:
+            stage (Callable[[Any], Any]): Function from an input item to an output item.
+
+        Returns:
+            Pipeline: The pipeline itself, for chaining.
+        """
+        self._stages.append(stage)
+        return self
+
+    def __iter__(self) -> Iterator[Any]:
+        """Run the pipeline, yielding the output of the last stage.
+
+        Yields:
+            Any: The processed items, in source order.
+
+        Raises:
+            BaseException: Any exception raised by the source, or any Exception raised by a stage.
+        """
+        stop = threading.Event()
+        queues: List["queue.Queue[Any]"] = [
+            queue.Queue(maxsize=self.queue_size) for _ in range(len(self._stages) + 1)
+        ]
+
+        threads = [threading.Thread(
+            target=self._produce, args=(self._source, queues[0], stop),
+            name="pipeline-source", daemon=True
+        )]
+        for k, stage in enumerate(self._stages):
+            threads.append(threading.Thread(
+                target=self._transform, args=(stage, queues[k], queues[k + 1], stop),
+                name=f"pipeline-stage-{k + 1}", daemon=True
+            ))
+
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = self._get(queues[-1], stop)
+                if item is _DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            # Let the threads finish early if the caller stopped or a stage failed
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+    def _produce(self, source: Iterable[Any], output: "queue.Queue[Any]", stop: threading.Event) -> None:
+        """Feed the source items into the first queue."""
+        iterator = iter(source)
+        try:
+            for item in iterator:
+                if not self._put(output, item, stop):
+                    break
+        except BaseException as e:
+            # Includes KeyboardInterrupt and GeneratorExit, so the caller never
+            # mistakes an interrupted source for a complete one
+            self._put(output, e, stop)
+        finally:
+            try:
+                # Release resources held by generators, e.g. parallel fetch workers
+                close = getattr(iterator, "close", None)
+                if close is not None:
+                    close()
+            except BaseException as e:
+                self._put(output, e, stop)
+            finally:
+                self._put(output, _DONE, stop)
+
+    def _transform(
+        self,
+        stage: Callable[[Any], Any],
+        source: "queue.Queue[Any]",
+        output: "queue.Queue[Any]",
+        stop: threading.Event
+    ) -> None:
+        """Apply a stage to every item of one queue and feed the results into the next."""
+        while True:
+            item = self._get(source, stop)
+            if item is _DONE or isinstance(item, BaseException):
+                # Forward the end of the stream or the upstream error
+                self._put(output, item, stop)
+                return
+
+            try:
+                result = stage(item)
+            except Exception as e:
+                self._put(output, e, stop)
+                return
+
+            if not self._put(output, result, stop):
+                return
+
+    @staticmethod
+    def _put(output: "queue.Queue[Any]", item: Any, stop: threading.Event) -> bool:
+        """Put an item into a queue, waiting for space until the pipeline stops.
+
+        Returns:
+            bool: Whether the item was queued.
+        """
+        while not stop.is_set():
+            try:
+                output.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @staticmethod
+    def _get(source: "queue.Queue[Any]", stop: threading.Event) -> Any:
+        """Get an item from a queue, returning the end marker if the pipeline stops."""
+        while not stop.is_set():
+            try:
+                return source.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+        return _DONE
@@ -0,0 +1,162 @@
+"""Built-in profiling of dumps.
+
+A ProfileSession wraps a run in cProfile and writes the collected statistics
+to a pstats file, and can take tracemalloc snapshots at the boundaries of
+the fetch, format and save phases. Each snapshot logs the allocation sites
+that grew the most since the previous one, so the time and memory of a slow
+dump can be attributed without patching the package.
+"""
+
+import cProfile
+import io
+import logging
+import pstats
+import tracemalloc
+from typing import Any, List, Optional, Tuple
+
+
+logger = logging.getLogger("discord-dump.profiling")
+
+# Number of functions listed in the profile summary
+PROFILE_SUMMARY_SIZE = 20
+
+# Number of allocation sites listed per memory snapshot
+DEFAULT_MALLOC_TOP = 10
+
+# Allocations of the tracer itself and of module imports, left out of the reports
+_SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+]
+
+
+def _take_snapshot() -> tracemalloc.Snapshot:
+    """Take a memory snapshot without the tracer's and the import system's allocations."""
+    return tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+
+class ProfileSession:
+    """Context manager profiling the time and memory of a run.
+
+    cProfile only records the thread that entered the session. Work done on
+    pipeline, prefetch or partition threads appears as time spent waiting for
+    their results.
+
+    Example:
+        >>> with ProfileSession("dump.pstats", trace_malloc=True) as session:
+        ...     messages = fetch()
+        ...     session.phase("fetched")
+
+    Attributes:
+        profile_file (Optional[str]): Path the pstats file is written to, or None to skip cProfile.
+        trace_malloc (bool): Whether memory snapshots are taken at phase boundaries.
+        top (int): Number of allocation sites reported per snapshot.
+        phases (List[Tuple[str, int, int]]): Label, traced bytes and peak traced bytes of each snapshot.
+    """
+
+    def __init__(
+        self,
+        profile_file: Optional[str] = None,
+        trace_malloc: bool = False,
+        top: int = DEFAULT_MALLOC_TOP
+    ) -> None:
+        """Initialize the session.
+
+        Args:
+            profile_file (Optional[str], optional): Path to write the pstats file to. Defaults to None,
+                which disables cProfile.
+            trace_malloc (bool, optional): Whether to take memory snapshots at phase boundaries. Defaults to False.
+            top (int, optional): Number of allocation sites reported per snapshot. Defaults to 10.
+        """
+        self.profile_file = profile_file
+        self.trace_malloc = trace_malloc
+        self.top = top
+        self.phases: List[Tuple[str, int, int]] = []
+
+        self._profiler: Optional[cProfile.Profile] = None
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._started_tracing = False
+
+    def __enter__(self) -> "ProfileSession":
+        """
+        Start tracing memory and profiling.
+
+        Returns:
+            ProfileSession: The session itself.
+        """
+        if self.trace_malloc:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            self._snapshot = _take_snapshot()
+
+        if self.profile_file:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def phase(self, label: str) -> None:
+        """
+        Mark the end of a phase, logging the memory allocated during it.
+
+        Does nothing unless memory tracing is enabled.
+
+        Args:
+            label (str): Name of the phase, e.g. "fetched".
+        """
+        if self._snapshot is None:
+            return
+
+        # Keep the profiler out of the snapshot's cost
+        if self._profiler is not None:
+            self._profiler.disable()
+
+        snapshot = _take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        self.phases.append((label, current, peak))
+
+        lines = [
+            f"Memory after {label}: {current / 1024 / 1024:.1f} MiB traced, "
+            f"{peak / 1024 / 1024:.1f} MiB peak. Largest growth:"
+        ]
+        for stat in snapshot.compare_to(self._snapshot, "lineno")[:self.top]:
+            lines.append(f"  {stat}")
+        logger.info("\n".join(lines))
+
+        self._snapshot = snapshot
+        if hasattr(tracemalloc, "reset_peak"):
+            # Report the peak of each phase on its own (Python 3.9+)
+            tracemalloc.reset_peak()
+
+        if self._profiler is not None:
+            self._profiler.enable()
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        """
+        Stop profiling, write the pstats file and log the most expensive functions.
+
+        The statistics are written even if the run fails or exits early.
+
+        Args:
+            exc_type (Any): The exception type, if an exception was raised.
+            exc_value (Any): The exception instance, if an exception was raised.
+            traceback (Any): The traceback, if an exception was raised.
+        """
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler.dump_stats(self.profile_file)
+
+            summary = io.StringIO()
+            stats = pstats.Stats(self._profiler, stream=summary)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_SUMMARY_SIZE)
+            logger.info(
+                f"Profile written to {self.profile_file}. "
+                f"Inspect it with 'python -m pstats {self.profile_file}'.\n{summary.getvalue().strip()}"
+            )
+            self._profiler = None
+
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self._snapshot = None
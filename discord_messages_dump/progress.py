@@ -0,0 +1,161 @@
+"""Progress estimates for unlimited dumps.
+
+Without a message limit there is no total to count towards, but a channel's
+history still has a known extent: every message ID is a snowflake holding its
+creation time, and the channel's own ID holds the time the channel was
+created. A HistoryProgress tracks how far the pagination cursor has moved
+from the newest end of the history towards the channel's creation, and
+derives the fraction done, the throughput and the remaining time from it.
+"""
+
+import time
+from datetime import datetime
+from typing import Any, Callable, List, Optional
+
+from discord_messages_dump.snowflake import datetime_to_snowflake, snowflake_to_timestamp
+
+
+def format_duration(seconds: float) -> str:
+    """Format a duration as H:MM:SS, or M:SS below an hour.
+
+    Args:
+        seconds (float): The duration in seconds.
+
+    Returns:
+        str: The formatted duration, e.g. "1:02:03".
+    """
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
+class HistoryProgress:
+    """Progress of a newest-first walk through a channel's history.
+
+    The position is the creation time of the oldest message fetched so far,
+    measured between the newest end of the window (`until`, or now) and its
+    oldest end (`since`, or the creation of the channel). The remaining time
+    is extrapolated from the share of the history covered since the walk
+    started, so a resumed dump is estimated from its own pace.
+
+    Example:
+        >>> progress = HistoryProgress(channel_id)
+        >>> for page in client.iter_pages(channel_id):
+        ...     progress.update(page)
+        ...     print(f"{progress.fraction:.0%}, {progress.describe()}")
+
+    Attributes:
+        messages (int): Number of messages fetched, including any counted before a resume.
+        pages (int): Number of pages fetched since the walk started.
+        fraction (Optional[float]): Share of the history covered, from 0 to 1, or None
+            if the pages do not arrive in order.
+    """
+
+    def __init__(
+        self,
+        channel_id: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        before: Optional[str] = None,
+        messages: int = 0,
+        ordered: bool = True,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """Initialize the progress.
+
+        Args:
+            channel_id (str): The ID of the channel, whose snowflake holds its creation time.
+            since (Optional[datetime], optional): Oldest end of the window. Defaults to None,
+                which uses the creation of the channel.
+            until (Optional[datetime], optional): Newest end of the window. Defaults to None, which uses now.
+            before (Optional[str], optional): Cursor a resumed walk starts from. Defaults to None.
+            messages (int, optional): Number of messages fetched before a resume. Defaults to 0.
+            ordered (bool, optional): Whether pages arrive newest first. Slices fetched in parallel
+                arrive out of order, so only their throughput is tracked. Defaults to True.
+            clock (Callable[[], float], optional): Monotonic clock in seconds. Defaults to time.monotonic.
+        """
+        self._oldest = snowflake_to_timestamp(channel_id)
+        if since is not None:
+            self._oldest = max(self._oldest, snowflake_to_timestamp(datetime_to_snowflake(since)))
+        self._newest = snowflake_to_timestamp(datetime_to_snowflake(until)) if until is not None else time.time()
+
+        self.messages = messages
+        self.pages = 0
+        self.fraction: Optional[float] = None
+        if ordered:
+            self.fraction = self._position(before) if before else 0.0
+
+        self._initial_messages = messages
+        self._initial_fraction = self.fraction or 0.0
+        self._clock = clock
+        self._started = clock()
+
+    def _position(self, snowflake: Any) -> float:
+        """Get the share of the window newer than a snowflake."""
+        span = self._newest - self._oldest
+        if span <= 0:
+            return 1.0
+        covered = (self._newest - snowflake_to_timestamp(snowflake)) / span
+        return min(max(covered, 0.0), 1.0)
+
+    def update(self, page: List[Any]) -> None:
+        """Record a fetched page.
+
+        Args:
+            page (List[Any]): The page of messages, newest first.
+        """
+        if not page:
+            return
+        self.messages += len(page)
+        self.pages += 1
+        if self.fraction is not None:
+            self.fraction = max(self.fraction, self._position(page[-1]["id"]))
+
+    def finish(self) -> None:
+        """Mark the walk as complete, which it is once the pages run out."""
+        if self.fraction is not None:
+            self.fraction = 1.0
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the walk started."""
+        return self._clock() - self._started
+
+    @property
+    def messages_per_second(self) -> float:
+        """Messages fetched per second since the walk started."""
+        elapsed = self.elapsed
+        return (self.messages - self._initial_messages) / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def pages_per_second(self) -> float:
+        """Pages fetched per second since the walk started."""
+        elapsed = self.elapsed
+        return self.pages / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Estimated seconds until the walk reaches the oldest end, or None if unknown."""
+        if self.fraction is None:
+            return None
+        gained = self.fraction - self._initial_fraction
+        if gained <= 0:
+            return None
+        return self.elapsed * (1.0 - self.fraction) / gained
+
+    def describe(self) -> str:
+        """Summarize the throughput and remaining time.
+
+        Returns:
+            str: E.g. "12345 msgs, 180.2 msg/s, 1.80 pages/s, ETA 1:02:03".
+        """
+        summary = (
+            f"{self.messages} msgs, {self.messages_per_second:.1f} msg/s, "
+            f"{self.pages_per_second:.2f} pages/s"
+        )
+        eta = self.eta
+        if eta is not None:
+            summary += f", ETA {format_duration(eta)}"
+        return summary
@@ -0,0 +1,216 @@
+"""Rate limit tracking for the Discord API.
+
+This module provides a RateLimiter class that tracks Discord's per-route
+rate limit buckets and the global limit from response headers, so that
+requests can be scheduled just in time instead of waiting for a 429.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Mapping, Optional
+
+
+class _Bucket:
+    """State of a single Discord rate limit bucket.
+
+    Attributes:
+        limit (Optional[int]): The number of requests allowed per window.
+        remaining (Optional[int]): Requests left in the current window, or None if unknown.
+        reset_at (float): Clock time at which the current window resets.
+    """
+
+    __slots__ = ("limit", "remaining", "reset_at")
+
+    def __init__(self) -> None:
+        """Initialize an empty bucket with unknown limits."""
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: float = 0.0
+
+
+class RateLimiter:
+    """Proactive, bucket-aware rate limiter for Discord API requests.
+
+    Discord groups routes into buckets identified by the ``X-RateLimit-Bucket``
+    header. Each bucket is further split by the route's major parameter (the
+    channel ID for message routes). The limiter records ``X-RateLimit-Remaining``
+    and ``X-RateLimit-Reset-After`` for every bucket and reserves a slot before
+    each request, waiting only when the bucket is known to be exhausted. A
+    sliding window additionally keeps the client under the global limit.
+
+    The limiter is thread-safe, so one instance can be shared by several
+    clients or worker threads to pool their rate budget.
+
+    Attributes:
+        global_limit (int): Maximum number of requests per global period.
+        global_period (float): Length of the global window in seconds.
+        default_retry_after (float): Wait time used when a 429 carries no reset header.
+    """
+
+    def __init__(
+        self,
+        global_limit: int = 50,
+        global_period: float = 1.0,
+        default_retry_after: float = 5.0,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """Initialize the rate limiter.
+
+        Args:
+            global_limit (int, optional): Maximum number of requests per global period. Defaults to 50.
+            global_period (float, optional): Length of the global window in seconds. Defaults to 1.0.
+            default_retry_after (float, optional): Wait time used when a 429 response carries
+                no reset header. Defaults to 5.0.
+            clock (Callable[[], float], optional): Monotonic clock function. Defaults to time.monotonic.
+        """
+        self.global_limit = global_limit
+        self.global_period = global_period
+        self.default_retry_after = default_retry_after
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._route_buckets: Dict[str, str] = {}
+        self._buckets: Dict[str, _Bucket] = {}
+        self._global_reset_at = 0.0
+        self._recent: Deque[float] = deque()
+
+    def _bucket_key(self, route: str, major: str) -> str:
+        """Return the key under which the bucket for a route is stored.
+
+        Args:
+            route (str): The route template, e.g. ``GET /channels/{channel_id}/messages``.
+            major (str): The route's major parameter.
+
+        Returns:
+            str: The bucket key, falling back to the route itself while the bucket hash is unknown.
+        """
+        return f"{self._route_buckets.get(route, route)}:{major}"
+
+    def reserve(self, route: str, major: str = "") -> float:
+        """Try to reserve a slot for a request without blocking.
+
+        Args:
+            route (str): The route template of the request.
+            major (str, optional): The route's major parameter. Defaults to "".
+
+        Returns:
+            float: 0.0 if a slot was reserved, otherwise the number of seconds
+                to wait before trying again.
+        """
+        with self._lock:
+            now = self._clock()
+
+            # A global 429 blocks every route
+            if self._global_reset_at > now:
+                return self._global_reset_at - now
+
+            bucket = self._buckets.get(self._bucket_key(route, major))
+            if bucket is not None and bucket.remaining is not None:
+                if bucket.reset_at <= now:
+                    # The window has reset since we last heard from Discord
+                    bucket.remaining = bucket.limit
+                elif bucket.remaining <= 0:
+                    return bucket.reset_at - now
+
+            # Keep under the global limit with a sliding window
+            while self._recent and self._recent[0] <= now - self.global_period:
+                self._recent.popleft()
+            if len(self._recent) >= self.global_limit:
+                return self._recent[0] + self.global_period - now
+
+            self._recent.append(now)
+            if bucket is not None and bucket.remaining is not None:
+                bucket.remaining -= 1
+            return 0.0
+
+    def acquire(self, route: str, major: str = "") -> float:
+        """Block until a request slot is available for the route.
+
+        Args:
+            route (str): The route template of the request.
+            major (str, optional): The route's major parameter. Defaults to "".
+
+        Returns:
+            float: The total number of seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            delay = self.reserve(route, major)
+            if delay <= 0:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+    def update(self, route: str, headers: Mapping[str, str], major: str = "") -> None:
+        """Record the rate limit state reported in a response.
+
+        Args:
+            route (str): The route template of the request.
+            headers (Mapping[str, str]): The response headers.
+            major (str, optional): The route's major parameter. Defaults to "".
+        """
+        with self._lock:
+            if 'X-RateLimit-Bucket' in headers:
+                self._route_buckets[route] = headers['X-RateLimit-Bucket']
+
+            if 'X-RateLimit-Remaining' not in headers or 'X-RateLimit-Reset-After' not in headers:
+                return
+
+            key = self._bucket_key(route, major)
+            bucket = self._buckets.setdefault(key, _Bucket())
+            if 'X-RateLimit-Limit' in headers:
+                bucket.limit = int(headers['X-RateLimit-Limit'])
+            bucket.remaining = int(headers['X-RateLimit-Remaining'])
+            bucket.reset_at = self._clock() + float(headers['X-RateLimit-Reset-After'])
+
+    def on_rate_limited(self, route: str, headers: Mapping[str, str], major: str = "") -> float:
+        """Record a 429 response so that no other request hits the same limit.
+
+        Args:
+            route (str): The route template of the request.
+            headers (Mapping[str, str]): The headers of the 429 response.
+            major (str, optional): The route's major parameter. Defaults to "".
+
+        Returns:
+            float: The number of seconds to wait before retrying.
+        """
+        if 'X-RateLimit-Reset-After' in headers:
+            retry_after = float(headers['X-RateLimit-Reset-After'])
+        elif 'Retry-After' in headers:
+            retry_after = float(headers['Retry-After'])
+        else:
+            retry_after = self.default_retry_after
+
+        is_global = (
+            str(headers.get('X-RateLimit-Global', '')).lower() == 'true'
+            or headers.get('X-RateLimit-Scope') == 'global'
+        )
+
+        with self._lock:
+            reset_at = self._clock() + retry_after
+            if is_global:
+                self._global_reset_at = max(self._global_reset_at, reset_at)
+            else:
+                if 'X-RateLimit-Bucket' in headers:
+                    self._route_buckets[route] = headers['X-RateLimit-Bucket']
+                bucket = self._buckets.setdefault(self._bucket_key(route, major), _Bucket())
+                bucket.remaining = 0
+                bucket.reset_at = reset_at
+
+        return retry_after
+
+    def clear(self, route: str, major: str = "") -> None:
+        """Mark a route's limits as replenished after its penalty has been waited out.
+
+        The bucket's remaining count becomes unknown until the next response
+        reports it, and any global block is lifted.
+
+        Args:
+            route (str): The route template of the request.
+            major (str, optional): The route's major parameter. Defaults to "".
+        """
+        with self._lock:
+            self._global_reset_at = 0.0
+            bucket = self._buckets.get(self._bucket_key(route, major))
+            if bucket is not None:
+                bucket.remaining = None
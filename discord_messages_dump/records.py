@@ -0,0 +1,258 @@
+"""Compact message records for in-memory dumps.
+
+Discord returns every message as a large nested dict, but the text, CSV and
+Markdown formats only read a handful of its fields. This module provides
+slotted MessageRecord and AuthorRecord classes that keep just those fields,
+and a RecordFactory that builds them with a shared instance per author.
+Records offer the same `.get` and `[]` access as dicts, so formatters and
+pagination code work on them unchanged.
+
+For callers that need plain dicts, FieldProjection drops every field outside
+a set of dotted field names instead, e.g. the embeds and components of bot
+messages.
+"""
+
+import sys
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple, Union
+
+
+# Fields a record can hold. Nested author fields use dotted names.
+MESSAGE_FIELDS = ("id", "channel_id", "timestamp", "content")
+AUTHOR_FIELDS = ("author.id", "author.username")
+
+# Fields each format reads, besides the message ID needed for pagination
+FORMAT_FIELDS: Dict[str, FrozenSet[str]] = {
+    "text": frozenset({"timestamp", "author.username", "content"}),
+    "csv": frozenset({"timestamp", "author.id", "author.username", "content"}),
+    "markdown": frozenset({"channel_id", "timestamp", "author.username", "content"}),
+}
+
+
+def fields_for_format(format_type: str) -> Optional[FrozenSet[str]]:
+    """Get the message fields a format reads.
+
+    Args:
+        format_type (str): The output format.
+
+    Returns:
+        Optional[FrozenSet[str]]: The fields the format needs, or None if it needs the full message.
+    """
+    return FORMAT_FIELDS.get(format_type.lower())
+
+
+class _Record:
+    """Dict-like read access to the slots of a record.
+
+    Slots that were never assigned behave like missing keys, so `.get`
+    falls back to its default exactly as it would for a dict without the key.
+    """
+
+    __slots__ = ()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a field, or the default if the record does not hold it."""
+        if key not in self.__slots__:
+            return default
+        return getattr(self, key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        """Return a field, raising KeyError if the record does not hold it."""
+        if key in self.__slots__:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        """Return whether the record holds a field."""
+        return key in self.__slots__ and hasattr(self, key)  # type: ignore[arg-type]
+
+    def keys(self) -> Iterator[str]:
+        """Iterate over the names of the fields the record holds."""
+        return (key for key in self.__slots__ if hasattr(self, key))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the record to a plain dict.
+
+        Returns:
+            Dict[str, Any]: The fields the record holds.
+        """
+        return {
+            key: value.to_dict() if isinstance(value, _Record) else value
+            for key, value in ((key, getattr(self, key)) for key in self.keys())
+        }
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class AuthorRecord(_Record):
+    """Compact message author. Instances are shared between messages by the factory."""
+
+    __slots__ = ("id", "username")
+
+
+class MessageRecord(_Record):
+    """Compact Discord message holding only the fields a format needs."""
+
+    __slots__ = ("id", "channel_id", "timestamp", "content", "author")
+
+
+class RecordFactory:
+    """Builder of compact message records.
+
+    Author records are interned: every message by the same author (with the
+    same username) refers to one shared AuthorRecord, and usernames are
+    interned strings.
+
+    Attributes:
+        fields (FrozenSet[str]): The fields kept on every record, always including the message ID.
+    """
+
+    def __init__(self, fields: Iterable[str]) -> None:
+        """Initialize the factory.
+
+        Args:
+            fields (Iterable[str]): The fields to keep, e.g. {"timestamp", "author.username", "content"}.
+
+        Raises:
+            ValueError: If a field cannot be held by a compact record.
+        """
+        fields = frozenset(fields) | {"id"}
+        unsupported = fields - set(MESSAGE_FIELDS) - set(AUTHOR_FIELDS)
+        if unsupported:
+            raise ValueError(
+                f"Unsupported record fields: {', '.join(sorted(unsupported))}. "
+                f"Valid options are: {', '.join(MESSAGE_FIELDS + AUTHOR_FIELDS)}"
+            )
+
+        self.fields = fields
+        self._message_fields = tuple(name for name in MESSAGE_FIELDS if name in fields)
+        self._author_fields = tuple(
+            name.split(".", 1)[1] for name in AUTHOR_FIELDS if name in fields
+        )
+        self._authors: Dict[Tuple[Any, ...], AuthorRecord] = {}
+
+    def _author(self, author: Dict[str, Any]) -> AuthorRecord:
+        """Return the shared record for an author."""
+        values = tuple(author.get(name) for name in self._author_fields)
+        record = self._authors.get(values)
+        if record is None:
+            record = AuthorRecord()
+            for name in self._author_fields:
+                if name in author:
+                    value = author[name]
+                    setattr(record, name, sys.intern(value) if isinstance(value, str) else value)
+            self._authors[values] = record
+        return record
+
+    def build(self, message: Dict[str, Any]) -> MessageRecord:
+        """Build the compact record of a message.
+
+        Args:
+            message (Dict[str, Any]): A Discord message object.
+
+        Returns:
+            MessageRecord: The message's compact record.
+        """
+        record = MessageRecord()
+        for name in self._message_fields:
+            if name in message:
+                setattr(record, name, message[name])
+        if self._author_fields and "author" in message:
+            record.author = self._author(message["author"] or {})
+        return record
+
+    def build_page(self, messages: List[Dict[str, Any]]) -> List[MessageRecord]:
+        """Build the compact records of a page of messages.
+
+        Args:
+            messages (List[Dict[str, Any]]): Discord message objects.
+
+        Returns:
+            List[MessageRecord]: The messages' compact records, in the same order.
+        """
+        return [self.build(message) for message in messages]
+
+
+class FieldProjection:
+    """Projection of Discord messages onto a set of fields.
+
+    Field names are dotted paths into the message, e.g. "author.username".
+    A path through a list applies to every element, so "attachments.url"
+    keeps the URL of each attachment. Everything outside the paths is
+    dropped, and fields missing from a message stay missing.
+
+    Attributes:
+        fields (FrozenSet[str]): The kept fields, always including the message ID.
+    """
+
+    def __init__(self, fields: Iterable[str]) -> None:
+        """Initialize the projection.
+
+        Args:
+            fields (Iterable[str]): The fields to keep, e.g. {"id", "timestamp", "author.id", "content"}.
+
+        Raises:
+            ValueError: If a field name is empty or has an empty path segment.
+        """
+        self.fields = frozenset(fields) | {"id"}
+        self._tree: Dict[str, Any] = {}
+
+        for field in sorted(self.fields):
+            path = field.split(".")
+            if not all(path):
+                raise ValueError(f"Invalid field name: '{field}'")
+
+            node = self._tree
+            for name in path[:-1]:
+                child = node.setdefault(name, {})
+                if child is True:
+                    # The whole parent is kept already
+                    break
+                node = child
+            else:
+                # A whole field replaces any of its subfields
+                node[path[-1]] = True
+
+    def apply(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Project a message onto the fields.
+
+        Args:
+            message (Dict[str, Any]): A Discord message object.
+
+        Returns:
+            Dict[str, Any]: A new dict holding only the projected fields.
+        """
+        return self._project(message, self._tree)
+
+    def apply_page(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Project a page of messages onto the fields.
+
+        Args:
+            messages (List[Dict[str, Any]]): Discord message objects.
+
+        Returns:
+            List[Dict[str, Any]]: The projected messages, in the same order.
+        """
+        return [self._project(message, self._tree) for message in messages]
+
+    def _project(self, value: Dict[str, Any], tree: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep the keys of a dict selected by a projection tree."""
+        projected: Dict[str, Any] = {}
+        for name, subtree in tree.items():
+            if name not in value:
+                continue
+            projected[name] = self._project_value(value[name], subtree)
+        return projected
+
+    def _project_value(self, value: Any, subtree: Union[bool, Dict[str, Any]]) -> Any:
+        """Project a field value, descending into dicts and lists of dicts."""
+        if subtree is True:
+            return value
+        if isinstance(value, dict):
+            return self._project(value, subtree)  # type: ignore[arg-type]
+        if isinstance(value, list):
+            return [self._project_value(item, subtree) for item in value]
+        return value
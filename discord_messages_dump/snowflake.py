@@ -0,0 +1,128 @@
+"""Helpers for Discord snowflake IDs.
+
+Discord IDs are snowflakes: the top 42 bits hold the number of milliseconds
+since the Discord epoch (2015-01-01). This module converts between snowflakes
+and timestamps, so that synthetic snowflakes can be used as pagination
+cursors for arbitrary points in time.
+"""
+
+import time
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple, Union
+
+
+# Milliseconds between the Unix epoch and the Discord epoch (2015-01-01T00:00:00Z)
+DISCORD_EPOCH = 1420070400000
+
+# Number of low bits holding the worker, process and increment fields
+TIMESTAMP_SHIFT = 22
+
+
+def snowflake_to_timestamp(snowflake: Union[int, str]) -> float:
+    """Get the Unix timestamp encoded in a snowflake.
+
+    Args:
+        snowflake (Union[int, str]): The snowflake ID.
+
+    Returns:
+        float: Seconds since the Unix epoch.
+    """
+    return ((int(snowflake) >> TIMESTAMP_SHIFT) + DISCORD_EPOCH) / 1000
+
+
+def timestamp_to_snowflake(timestamp: float) -> int:
+    """Build the smallest snowflake for a Unix timestamp.
+
+    Args:
+        timestamp (float): Seconds since the Unix epoch.
+
+    Returns:
+        int: A synthetic snowflake that sorts before every ID created at or after the timestamp.
+    """
+    milliseconds = int(timestamp * 1000) - DISCORD_EPOCH
+    return max(milliseconds, 0) << TIMESTAMP_SHIFT
+
+
+def snowflake_to_datetime(snowflake: Union[int, str]) -> datetime:
+    """Get the creation time encoded in a snowflake.
+
+    Args:
+        snowflake (Union[int, str]): The snowflake ID.
+
+    Returns:
+        datetime: The creation time as a timezone-aware UTC datetime.
+    """
+    return datetime.fromtimestamp(snowflake_to_timestamp(snowflake), tz=timezone.utc)
+
+
+def datetime_to_snowflake(value: datetime) -> int:
+    """Build the smallest snowflake for a point in time.
+
+    Args:
+        value (datetime): The point in time. Naive datetimes are taken to be UTC.
+
+    Returns:
+        int: A synthetic snowflake that sorts before every ID created at or after the given time.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return timestamp_to_snowflake(value.timestamp())
+
+
+def now_snowflake() -> int:
+    """Build the synthetic snowflake for the current time.
+
+    Returns:
+        int: The smallest snowflake for the current time.
+    """
+    return timestamp_to_snowflake(time.time())
+
+
+def partition_range(lower: int, upper: int, partitions: int) -> List[int]:
+    """Split a snowflake range into slices of equal duration.
+
+    Args:
+        lower (int): The lower end of the range.
+        upper (int): The upper end of the range.
+        partitions (int): The number of slices.
+
+    Returns:
+        List[int]: `partitions + 1` ascending boundaries, starting at `lower` and ending at `upper`.
+    """
+    span = upper - lower
+    return [lower + span * i // partitions for i in range(partitions)] + [upper]
+
+
+def window_cursors(
+    before: Optional[str],
+    after: Optional[str],
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None
+) -> Tuple[Optional[str], Optional[str]]:
+    """Narrow pagination cursors to a time window.
+
+    `since` is inclusive and `until` is exclusive. When `since` is given the
+    upper cursor is always set, so that the window is walked backwards and
+    stops exactly at its lower edge.
+
+    Args:
+        before (Optional[str]): Message ID to fetch messages before.
+        after (Optional[str]): Message ID to fetch messages after.
+        since (Optional[datetime], optional): Start of the window. Defaults to None.
+        until (Optional[datetime], optional): End of the window. Defaults to None.
+
+    Returns:
+        Tuple[Optional[str], Optional[str]]: The `before` and `after` cursors for the window.
+    """
+    if until is not None:
+        upper = datetime_to_snowflake(until)
+        before = str(upper if before is None else min(int(before), upper))
+
+    if since is not None:
+        # `after` is exclusive, so step back one ID to include the first instant
+        lower = max(datetime_to_snowflake(since) - 1, 0)
+        after = str(lower if after is None else max(int(after), lower))
+        if before is None:
+            before = str(now_snowflake())
+
+    return before, after
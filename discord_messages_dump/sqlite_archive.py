@@ -0,0 +1,432 @@
+"""SQLite archive backend for Discord messages.
+
+This module provides a SqliteArchive class that stores messages in a
+normalized, indexed SQLite database. Pages are written with executemany
+inside one WAL-mode transaction each, and messages are inserted with
+INSERT OR IGNORE on their ID, so rerunning a dump or sync is idempotent.
+New messages are added to an FTS5 full-text index as they are written.
+An archive opened read-only is queried as it is, without touching the file.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from discord_messages_dump.snowflake import window_cursors
+
+
+logger = logging.getLogger("discord-dump.sqlite")
+
+# Number of messages written per transaction by write_sqlite
+DEFAULT_BATCH_SIZE = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    username TEXT,
+    global_name TEXT
+);
+
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    channel_id INTEGER,
+    author_id INTEGER REFERENCES users (id),
+    content TEXT,
+    timestamp TEXT,
+    edited_timestamp TEXT,
+    pinned INTEGER,
+    type INTEGER,
+    raw TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS messages_channel_id ON messages (channel_id, id);
+CREATE INDEX IF NOT EXISTS messages_author_id ON messages (author_id);
+
+CREATE TABLE IF NOT EXISTS attachments (
+    id INTEGER PRIMARY KEY,
+    message_id INTEGER NOT NULL REFERENCES messages (id),
+    filename TEXT,
+    url TEXT,
+    size INTEGER,
+    content_type TEXT
+);
+
+CREATE INDEX IF NOT EXISTS attachments_message_id ON attachments (message_id);
+
+CREATE TABLE IF NOT EXISTS reactions (
+    message_id INTEGER NOT NULL REFERENCES messages (id),
+    emoji TEXT NOT NULL,
+    count INTEGER,
+    PRIMARY KEY (message_id, emoji)
+);
+"""
+
+# Full-text index over message content and author names. The trigger indexes
+# each message when it is first inserted, inside the same transaction.
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5 (content, author);
+
+CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts (rowid, content, author)
+    VALUES (new.id, new.content, (SELECT username FROM users WHERE id = new.author_id));
+END;
+"""
+
+
+def _to_int(value: Any) -> Optional[int]:
+    """Convert a snowflake or size to an int, or None if it is missing or malformed."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _emoji_key(emoji: Dict[str, Any]) -> str:
+    """Build a stable key for a reaction emoji: the custom emoji ID or the unicode character."""
+    if emoji.get("id"):
+        return f"{emoji.get('name') or ''}:{emoji['id']}"
+    return emoji.get("name") or ""
+
+
+class SqliteArchive:
+    """Normalized SQLite store of Discord messages.
+
+    Messages, their authors, attachments and reactions are kept in separate
+    tables. The full message object is also stored as JSON in the `raw`
+    column, so the archive can be exported to any other format later.
+
+    Attributes:
+        path (str): Path of the database file.
+        read_only (bool): Whether the archive was opened for reading only.
+        connection (sqlite3.Connection): The open database connection.
+        fts_enabled (bool): Whether the full-text index is available.
+    """
+
+    def __init__(self, path: str, read_only: bool = False) -> None:
+        """Open the archive, creating the database and its tables if needed.
+
+        A read-only archive must already exist. Its journal mode, tables and
+        full-text index are left as they are. While no other connection has
+        the archive open, it is opened as immutable, which creates no -wal or
+        -shm files and works in a read-only directory. While a dump or sync
+        is writing to it, it is read through the write-ahead log instead, so
+        committed pages are seen.
+
+        Args:
+            path (str): Path of the database file.
+            read_only (bool, optional): Whether to open the archive for reading only. Defaults to False.
+
+        Raises:
+            ValueError: If a read-only archive holds no messages table.
+            sqlite3.Error: If the database cannot be opened.
+        """
+        self.path = path
+        self.read_only = read_only
+
+        if read_only:
+            uri = f"{Path(path).resolve().as_uri()}?mode=ro"
+            # A WAL database has a -wal file exactly while a connection has it open
+            if not os.path.exists(f"{path}-wal"):
+                uri += "&immutable=1"
+            self.connection = sqlite3.connect(uri, uri=True)
+            tables = {
+                row[0] for row in self.connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            }
+            if "messages" not in tables:
+                self.connection.close()
+                raise ValueError(f"{path} is not a message archive.")
+            self.fts_enabled = "messages_fts" in tables
+            return
+
+        self.connection = sqlite3.connect(path)
+
+        # WAL lets readers query the archive while a dump is appending to it
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.fts_enabled = self._create_fts_index()
+
+    def _create_fts_index(self) -> bool:
+        """
+        Create the full-text index, indexing existing messages if it is new.
+
+        Returns:
+            bool: True if the index is available, False if SQLite was built without FTS5.
+        """
+        exists = self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'messages_fts'"
+        ).fetchone()
+
+        try:
+            self.connection.executescript(FTS_SCHEMA)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Full-text search is not available: {str(e)}")
+            return False
+
+        if not exists:
+            self.rebuild_index()
+        return True
+
+    def rebuild_index(self) -> None:
+        """Rebuild the full-text index from the archived messages."""
+        with self.connection:
+            self.connection.execute("DELETE FROM messages_fts")
+            self.connection.execute(
+                "INSERT INTO messages_fts (rowid, content, author) "
+                "SELECT m.id, m.content, u.username FROM messages m LEFT JOIN users u ON u.id = m.author_id"
+            )
+
+    def write(self, messages: Iterable[Dict[str, Any]]) -> int:
+        """Insert a batch of messages in one transaction.
+
+        Messages that are already archived are left unchanged.
+
+        Args:
+            messages (Iterable[Dict[str, Any]]): Discord message objects.
+
+        Returns:
+            int: The number of messages that were not archived yet.
+        """
+        users: Dict[int, tuple] = {}
+        message_rows: List[tuple] = []
+        attachment_rows: List[tuple] = []
+        reaction_rows: List[tuple] = []
+
+        for message in messages:
+            message_id = int(message["id"])
+            author = message.get("author") or {}
+            author_id = _to_int(author.get("id"))
+
+            if author_id is not None:
+                users[author_id] = (author_id, author.get("username"), author.get("global_name"))
+
+            message_rows.append((
+                message_id,
+                _to_int(message.get("channel_id")),
+                author_id,
+                message.get("content"),
+                message.get("timestamp"),
+                message.get("edited_timestamp"),
+                None if message.get("pinned") is None else int(bool(message["pinned"])),
+                _to_int(message.get("type")),
+                json.dumps(message, separators=(",", ":"))
+            ))
+
+            for attachment in message.get("attachments") or []:
+                attachment_rows.append((
+                    _to_int(attachment.get("id")),
+                    message_id,
+                    attachment.get("filename"),
+                    attachment.get("url"),
+                    _to_int(attachment.get("size")),
+                    attachment.get("content_type")
+                ))
+
+            for reaction in message.get("reactions") or []:
+                reaction_rows.append((
+                    message_id,
+                    _emoji_key(reaction.get("emoji") or {}),
+                    _to_int(reaction.get("count"))
+                ))
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO users (id, username, global_name) VALUES (?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET username = excluded.username, global_name = excluded.global_name",
+                list(users.values())
+            )
+            inserted = self.connection.executemany(
+                "INSERT OR IGNORE INTO messages "
+                "(id, channel_id, author_id, content, timestamp, edited_timestamp, pinned, type, raw) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                message_rows
+            ).rowcount
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO attachments (id, message_id, filename, url, size, content_type) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                attachment_rows
+            )
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO reactions (message_id, emoji, count) VALUES (?, ?, ?)",
+                reaction_rows
+            )
+
+        logger.debug(f"Archived {inserted} of {len(message_rows)} messages")
+        return inserted
+
+    def newest_message_id(self, channel_id: str) -> Optional[str]:
+        """Find the newest archived message of a channel.
+
+        Args:
+            channel_id (str): The ID of the channel.
+
+        Returns:
+            Optional[str]: The ID of the newest archived message, or None if the channel has none.
+        """
+        row = self.connection.execute(
+            "SELECT MAX(id) FROM messages WHERE channel_id = ?", (_to_int(channel_id),)
+        ).fetchone()
+        return None if row[0] is None else str(row[0])
+
+    def count(self, channel_id: Optional[str] = None) -> int:
+        """Count the archived messages.
+
+        Args:
+            channel_id (Optional[str], optional): Only count this channel's messages. Defaults to None.
+
+        Returns:
+            int: The number of archived messages.
+        """
+        if channel_id is None:
+            row = self.connection.execute("SELECT COUNT(*) FROM messages").fetchone()
+        else:
+            row = self.connection.execute(
+                "SELECT COUNT(*) FROM messages WHERE channel_id = ?", (_to_int(channel_id),)
+            ).fetchone()
+        return row[0]
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        author: Optional[str] = None,
+        channel_id: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """Search the archived messages.
+
+        The query uses the FTS5 syntax: words must all match, "quoted text"
+        matches a phrase, and OR, NOT and prefix* queries are supported.
+        Results of a text query are ordered by relevance, others newest first.
+
+        Args:
+            query (Optional[str], optional): Full-text query over content and author names. Defaults to None.
+            author (Optional[str], optional): Only match messages by this username. Defaults to None.
+            channel_id (Optional[str], optional): Only match messages in this channel. Defaults to None.
+            since (Optional[datetime], optional): Only match messages created at or after this time.
+                Defaults to None.
+            until (Optional[datetime], optional): Only match messages created before this time. Defaults to None.
+            limit (int, optional): Maximum number of results. Defaults to 20.
+
+        Returns:
+            List[Dict[str, Any]]: The matching messages with their ID, channel ID, author,
+                timestamp and a snippet of the content around the match.
+
+        Raises:
+            ValueError: If a text query is given but the full-text index is not available,
+                or the query is malformed.
+        """
+        conditions: List[str] = []
+        params: List[Any] = []
+
+        if query:
+            if not self.fts_enabled:
+                raise ValueError("Full-text search is not available for this archive.")
+            tables = "messages_fts JOIN messages m ON m.id = messages_fts.rowid"
+            snippet = "snippet(messages_fts, 0, '[', ']', '...', 16)"
+            conditions.append("messages_fts MATCH ?")
+            params.append(query)
+            order = "rank"
+        else:
+            tables = "messages m"
+            snippet = "m.content"
+            order = "m.id DESC"
+
+        if author:
+            conditions.append("u.username = ? COLLATE NOCASE")
+            params.append(author)
+        if channel_id:
+            conditions.append("m.channel_id = ?")
+            params.append(_to_int(channel_id))
+
+        # Message IDs are snowflakes, so a time window is an ID range on the primary key
+        before, after = window_cursors(None, None, since, until)
+        if before is not None:
+            conditions.append("m.id < ?")
+            params.append(int(before))
+        if after is not None:
+            conditions.append("m.id > ?")
+            params.append(int(after))
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = (
+            f"SELECT m.id, m.channel_id, u.username, m.timestamp, {snippet} "
+            f"FROM {tables} LEFT JOIN users u ON u.id = m.author_id "
+            f"{where} ORDER BY {order} LIMIT ?"
+        )
+        params.append(limit)
+
+        try:
+            rows = self.connection.execute(sql, params).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid search query: {str(e)}")
+
+        return [
+            {
+                "id": str(row[0]),
+                "channel_id": None if row[1] is None else str(row[1]),
+                "author": row[2],
+                "timestamp": row[3],
+                "snippet": row[4]
+            }
+            for row in rows
+        ]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.connection.close()
+
+    def __enter__(self) -> "SqliteArchive":
+        """
+        Enter the runtime context for the archive.
+
+        Returns:
+            SqliteArchive: The archive itself.
+        """
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        """
+        Exit the runtime context and close the database connection.
+
+        Args:
+            exc_type (Any): The exception type, if an exception was raised.
+            exc_value (Any): The exception instance, if an exception was raised.
+            traceback (Any): The traceback, if an exception was raised.
+        """
+        self.close()
+
+
+def write_sqlite(
+    messages: Iterable[Dict[str, Any]],
+    path: str,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> int:
+    """Stream messages into a SQLite archive, one transaction per batch.
+
+    Args:
+        messages (Iterable[Dict[str, Any]]): Discord message objects, consumed lazily.
+        path (str): Path of the database file.
+        batch_size (int, optional): Number of messages per transaction. Defaults to 100.
+
+    Returns:
+        int: The number of messages written, including those that were already archived.
+    """
+    messages = iter(messages)
+    count = 0
+
+    with SqliteArchive(path) as archive:
+        while True:
+            batch = list(islice(messages, batch_size))
+            if not batch:
+                break
+            archive.write(batch)
+            count += len(batch)
+
+    return count
@@ -0,0 +1,221 @@
+"""Per-stage timing and throughput of dumps.
+
+A DumpStats collects cheap hot-path instrumentation while a dump runs: the
+time spent in HTTP requests, rate limit waits, retry back-off, decoding,
+formatting and writing, the number of requests, pages, messages and bytes,
+and the latency of every request. It is safe to update from several
+threads, so pipelined and parallel fetches report into one instance. The
+summary is logged at the end of a dump and can be written as JSON, so
+scheduled runs can be compared over time.
+"""
+
+import json
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Dict, Iterator, List, Optional
+
+
+logger = logging.getLogger("discord-dump.stats")
+
+# Stages whose time is measured, in pipeline order
+STAGES = ("http", "rate_limit_wait", "retry_backoff", "decode", "format", "write")
+
+# Request latency percentiles in the summary
+LATENCY_PERCENTILES = (50, 95, 99)
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """Get a percentile of a list of values by the nearest-rank method.
+
+    Args:
+        values (List[float]): The values, in any order.
+        p (float): The percentile, from 0 to 100.
+
+    Returns:
+        Optional[float]: The smallest value that at least p percent of the values do not exceed,
+            or None if there are no values.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = min(max(math.ceil(len(ordered) * p / 100), 1), len(ordered))
+    return ordered[rank - 1]
+
+
+def stage_timer(stats: Optional["DumpStats"], stage: str) -> ContextManager[None]:
+    """Time a block as a stage if stats are being collected.
+
+    Args:
+        stats (Optional[DumpStats]): The stats, or None to skip timing.
+        stage (str): The stage, one of STAGES.
+
+    Returns:
+        ContextManager[None]: The stage's timer, or a context that does nothing.
+    """
+    if stats is None:
+        return nullcontext()
+    return stats.timer(stage)
+
+
+class DumpStats:
+    """Timers and counters of a dump's hot path.
+
+    Example:
+        >>> stats = DumpStats()
+        >>> client = DiscordApiClient(token, stats=stats)
+        >>> with stats.timer("format"):
+        ...     content = processor.format_text()
+        >>> stats.log_summary()
+
+    Attributes:
+        seconds (Dict[str, float]): Seconds spent in each stage.
+        requests (int): Number of HTTP requests sent, including retried ones.
+        pages (int): Number of pages of messages received.
+        messages (int): Number of messages received.
+        bytes_received (int): Size of the response bodies received.
+        bytes_written (int): Size of the output written to disk.
+        latencies (List[float]): Seconds each HTTP request took, including reading its body.
+    """
+
+    def __init__(self, clock: Any = time.perf_counter) -> None:
+        """Initialize the stats and start the wall clock.
+
+        Args:
+            clock (Any, optional): Clock returning seconds. Defaults to time.perf_counter.
+        """
+        self.seconds: Dict[str, float] = dict.fromkeys(STAGES, 0.0)
+        self.requests = 0
+        self.pages = 0
+        self.messages = 0
+        self.bytes_received = 0
+        self.bytes_written = 0
+        self.latencies: List[float] = []
+
+        self._clock = clock
+        self._started = clock()
+        self._lock = threading.Lock()
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        """
+        Add time spent in a stage.
+
+        Args:
+            stage (str): The stage, one of STAGES.
+            seconds (float): The time to add.
+        """
+        with self._lock:
+            self.seconds[stage] += seconds
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """
+        Measure the time spent in a block as time spent in a stage.
+
+        Args:
+            stage (str): The stage, one of STAGES.
+        """
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.add_time(stage, self._clock() - start)
+
+    def record_request(self, seconds: float, size: int) -> None:
+        """
+        Record a completed HTTP request.
+
+        Args:
+            seconds (float): The request's latency, including reading its body.
+            size (int): Size of the response body in bytes.
+        """
+        with self._lock:
+            self.requests += 1
+            self.seconds["http"] += seconds
+            self.bytes_received += size
+            self.latencies.append(seconds)
+
+    def record_page(self, messages: int) -> None:
+        """
+        Record a page of messages received.
+
+        Args:
+            messages (int): Number of messages on the page.
+        """
+        with self._lock:
+            self.pages += 1
+            self.messages += messages
+
+    def record_write(self, size: int) -> None:
+        """
+        Record output written to disk.
+
+        Args:
+            size (int): Number of bytes written.
+        """
+        with self._lock:
+            self.bytes_written += size
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the stats were created."""
+        return self._clock() - self._started
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Summarize the stats.
+
+        Returns:
+            Dict[str, Any]: Wall-clock seconds, seconds per stage, counters, throughput and
+                request latency percentiles in milliseconds.
+        """
+        with self._lock:
+            elapsed = self.elapsed
+            latencies = list(self.latencies)
+            summary: Dict[str, Any] = {
+                "elapsed": elapsed,
+                "seconds": dict(self.seconds),
+                "requests": self.requests,
+                "pages": self.pages,
+                "messages": self.messages,
+                "bytes_received": self.bytes_received,
+                "bytes_written": self.bytes_written,
+            }
+
+        summary["messages_per_second"] = summary["messages"] / elapsed if elapsed > 0 else 0.0
+        summary["pages_per_second"] = summary["pages"] / elapsed if elapsed > 0 else 0.0
+        summary["latency_ms"] = {}
+        for p in LATENCY_PERCENTILES:
+            value = percentile(latencies, p)
+            summary["latency_ms"][f"p{p}"] = None if value is None else value * 1000
+        return summary
+
+    def log_summary(self) -> None:
+        """Log the summary."""
+        summary = self.to_dict()
+        stages = ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in summary["seconds"].items())
+        latency = ", ".join(
+            f"{name} {value:.0f}ms" for name, value in summary["latency_ms"].items() if value is not None
+        )
+
+        logger.info(f"Dump finished in {summary['elapsed']:.2f}s: {stages}")
+        logger.info(
+            f"{summary['requests']} requests, {summary['pages']} pages, {summary['messages']} messages "
+            f"({summary['messages_per_second']:.1f} msg/s, {summary['pages_per_second']:.2f} pages/s), "
+            f"{summary['bytes_received']} bytes received, {summary['bytes_written']} bytes written"
+        )
+        if latency:
+            logger.info(f"Request latency: {latency}")
+
+    def write_json(self, path: str) -> None:
+        """
+        Write the summary to a JSON file.
+
+        Args:
+            path (str): Path of the file.
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write("\n")
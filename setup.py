@@ -33,6 +33,11 @@ setup(
         'click>=8.0.0',
         'tqdm>=4.62.0',
     ],
+    extras_require={
+        'async': ['aiohttp>=3.8.0'],
+        'parquet': ['pyarrow>=7.0.0'],
+        'zstd': ['zstandard>=0.15.0'],
+    },
     python_requires='>=3.7',
     entry_points={
         'console_scripts': [
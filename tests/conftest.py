@@ -177,14 +177,14 @@ def temp_output_file() -> Generator[str, None, None]:
 @pytest.fixture
 def mock_requests_get(monkeypatch, mock_discord_response):
     """
-    Mocks the requests.get function to return a predefined response.
+    Mocks the requests.Session.get method to return a predefined response.
     
     Args:
         monkeypatch: Pytest's monkeypatch fixture.
         mock_discord_response: The mock_discord_response fixture.
         
     Returns:
-        MagicMock: A mock object for requests.get.
+        MagicMock: A mock object for requests.Session.get.
     """
     mock_get = MagicMock()
     mock_response = MagicMock()
@@ -197,8 +197,8 @@ def mock_requests_get(monkeypatch, mock_discord_response):
     # Set up the mock get function
     mock_get.return_value = mock_response
     
-    # Apply the mock to requests.get
-    monkeypatch.setattr("requests.get", mock_get)
+    # Apply the mock to requests.Session.get
+    monkeypatch.setattr("requests.Session.get", mock_get)
     
     return mock_get
 
@@ -1,10 +1,18 @@
 """Tests for the Discord API Client."""
 
 import os
+import threading
+import time
 import unittest
+from datetime import datetime, timezone
 from unittest.mock import patch, MagicMock
 
+import requests
+
 from discord_messages_dump.api import DiscordApiClient
+from discord_messages_dump.records import MessageRecord, RecordFactory
+from discord_messages_dump.snowflake import datetime_to_snowflake
+from discord_messages_dump.stats import DumpStats
 
 
 class TestDiscordApiClient(unittest.TestCase):
@@ -22,7 +30,7 @@ class TestDiscordApiClient(unittest.TestCase):
         self.assertEqual(self.client.base_url, "https://discord.com/api/v9")
         self.assertEqual(self.client.headers["Authorization"], self.token)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_messages_success(self, mock_get):
         """Test successful message retrieval."""
         # Mock response
@@ -43,7 +51,7 @@ class TestDiscordApiClient(unittest.TestCase):
         self.assertEqual(result[0]["content"], "Test message 1")
         self.assertEqual(result[1]["content"], "Test message 2")
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_messages_with_pagination(self, mock_get):
         """Test message retrieval with pagination parameter."""
         # Mock response
@@ -60,7 +68,7 @@ class TestDiscordApiClient(unittest.TestCase):
         url = args[0]  # The URL is the first positional argument
         self.assertIn("before=123456", url)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     @patch('time.sleep')
     def test_rate_limit_handling(self, mock_sleep, mock_get):
         """Test handling of rate limits."""
@@ -82,7 +90,86 @@ class TestDiscordApiClient(unittest.TestCase):
         self.assertEqual(mock_get.call_count, 2)
         mock_sleep.assert_called_once_with(2.0)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
+    def test_record_factory_builds_compact_pages(self, mock_get):
+        """Test that a record factory converts each decoded page to compact records."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = [
+            {"id": "2", "content": "Hello", "author": {"id": "7", "username": "user"}, "pinned": False}
+        ]
+        mock_get.return_value = mock_response
+        client = DiscordApiClient(self.token, record_factory=RecordFactory({"content", "author.username"}))
+
+        messages = client.get_messages(self.channel_id)
+
+        self.assertIsInstance(messages[0], MessageRecord)
+        self.assertEqual(messages[0].to_dict(), {"id": "2", "content": "Hello", "author": {"username": "user"}})
+
+    @patch('requests.Session.get')
+    @patch('time.sleep')
+    def test_stats_recorded(self, mock_sleep, mock_get):
+        """Test that requests, rate limit waits, pages and bytes are recorded in the stats."""
+        rate_limited_response = MagicMock()
+        rate_limited_response.status_code = 429
+        rate_limited_response.headers = {"X-RateLimit-Reset-After": "2.0"}
+        rate_limited_response.content = b'{"retry_after": 2.0}'
+
+        success_response = MagicMock()
+        success_response.status_code = 200
+        success_response.headers = {}
+        success_response.content = b'[{"id": "2"}, {"id": "1"}]'
+        success_response.json.return_value = [{"id": "2"}, {"id": "1"}]
+
+        mock_get.side_effect = [rate_limited_response, success_response]
+        stats = DumpStats()
+        client = DiscordApiClient(self.token, stats=stats)
+
+        client.get_messages(self.channel_id)
+
+        self.assertEqual(stats.requests, 2)
+        self.assertEqual(len(stats.latencies), 2)
+        self.assertEqual(stats.pages, 1)
+        self.assertEqual(stats.messages, 2)
+        self.assertEqual(stats.bytes_received, 46)
+        self.assertEqual(stats.seconds["rate_limit_wait"], 2.0)
+
+    @patch('requests.Session.get')
+    @patch('time.sleep')
+    def test_stats_record_wait_before_failed_request(self, mock_sleep, mock_get):
+        """Test that a rate limit wait is recorded even if the request after it fails."""
+        success_response = MagicMock()
+        success_response.status_code = 200
+        success_response.headers = {}
+        success_response.content = b'[]'
+        success_response.json.return_value = []
+
+        mock_get.side_effect = [requests.exceptions.ConnectionError("Connection reset"), success_response]
+        stats = DumpStats()
+        client = DiscordApiClient(self.token, stats=stats)
+
+        with patch.object(client.rate_limiter, 'acquire', return_value=1.5):
+            client.get_messages(self.channel_id)
+
+        self.assertEqual(stats.seconds["rate_limit_wait"], 3.0)
+        self.assertEqual(stats.requests, 1)
+
+    @patch('requests.Session.get')
+    def test_field_projection(self, mock_get):
+        """Test that pages are projected onto the requested fields right after decoding."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = [
+            {"id": "2", "content": "Hi", "author": {"id": "7", "username": "bot"}, "embeds": [{"title": "x"}]}
+        ]
+        mock_get.return_value = mock_response
+        client = DiscordApiClient(self.token, fields={"content", "author.id"})
+
+        messages = client.get_messages(self.channel_id)
+
+        self.assertEqual(messages, [{"id": "2", "content": "Hi", "author": {"id": "7"}}])
+
+    @patch('requests.Session.get')
     def test_invalid_token(self, mock_get):
         """Test handling of invalid token."""
         # Mock response for invalid token
@@ -97,7 +184,7 @@ class TestDiscordApiClient(unittest.TestCase):
 
         self.assertIn("Invalid Discord token", str(context.exception))
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_channel_not_found(self, mock_get):
         """Test handling of invalid channel ID."""
         # Mock response for channel not found
@@ -112,6 +199,264 @@ class TestDiscordApiClient(unittest.TestCase):
 
         self.assertIn("Channel with ID", str(context.exception))
 
+    @patch('requests.Session.get')
+    @patch('time.sleep')
+    def test_proactive_rate_limit_wait(self, mock_sleep, mock_get):
+        """Test that an exhausted bucket delays the next request without a 429."""
+        exhausted_response = MagicMock()
+        exhausted_response.status_code = 200
+        exhausted_response.headers = {
+            "X-RateLimit-Bucket": "abc",
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset-After": "60.0"
+        }
+        exhausted_response.json.return_value = []
+        mock_get.return_value = exhausted_response
+
+        self.client.get_messages(self.channel_id)
+        mock_sleep.assert_not_called()
+
+        # The second request has to wait for the bucket to reset; the mocked
+        # sleep does not advance the clock, so stop after the first wait.
+        mock_sleep.side_effect = RuntimeError("waited")
+        with self.assertRaises(RuntimeError):
+            self.client.get_messages(self.channel_id)
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertGreater(mock_sleep.call_args[0][0], 59.0)
+
+    def test_iter_messages_paginates(self):
+        """Test that iter_messages follows the before cursor page by page."""
+        first_page = [{"id": str(i)} for i in range(300, 200, -1)]
+        second_page = [{"id": "200"}, {"id": "199"}]
+
+        with patch.object(self.client, 'get_messages', side_effect=[first_page, second_page]) as mock_get:
+            messages = self.client.iter_messages(self.channel_id)
+
+            # Nothing is fetched until the generator is consumed
+            mock_get.assert_not_called()
+            result = list(messages)
+
+        self.assertEqual(len(result), 102)
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(mock_get.call_args_list[1][1]["before"], "201")
+
+    def test_iter_messages_respects_limit(self):
+        """Test that iter_messages requests no more than the remaining limit."""
+        pages = [[{"id": str(i)} for i in range(300, 200, -1)], [{"id": str(i)} for i in range(200, 150, -1)]]
+
+        with patch.object(self.client, 'get_messages', side_effect=pages) as mock_get:
+            result = list(self.client.iter_messages(self.channel_id, limit=150))
+
+        self.assertEqual(len(result), 150)
+        self.assertEqual(mock_get.call_args_list[1][1]["limit"], 50)
+
+    @patch('requests.Session.get')
+    def test_get_messages_after(self, mock_get):
+        """Test that the after cursor is passed to the API."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = []
+        mock_get.return_value = mock_response
+
+        self.client.get_messages(self.channel_id, after="123456")
+
+        self.assertIn("after=123456", mock_get.call_args[0][0])
+
+    def test_iter_pages_forward(self):
+        """Test that iter_pages walks forwards from the after cursor, oldest first."""
+        first_page = [{"id": str(i)} for i in range(200, 100, -1)]
+        second_page = [{"id": "202"}, {"id": "201"}]
+
+        with patch.object(self.client, 'get_messages', side_effect=[first_page, second_page]) as mock_get:
+            pages = list(self.client.iter_pages(self.channel_id, after="100"))
+
+        self.assertEqual(pages[0][0]["id"], "101")
+        self.assertEqual(pages[1], [{"id": "201"}, {"id": "202"}])
+        self.assertEqual(mock_get.call_args_list[1][1]["after"], "200")
+        self.assertIsNone(mock_get.call_args_list[1][1]["before"])
+
+    def _fake_history(self, ids):
+        """Build a fake get_messages serving the given message IDs like Discord does."""
+        ids = sorted(ids, reverse=True)
+
+        def get_messages(channel_id, limit=100, before=None, after=None):
+            if after:
+                page = [i for i in ids if i > int(after)][-limit:]
+            else:
+                page = [i for i in ids if before is None or i < int(before)][:limit]
+            return [{"id": str(i)} for i in page]
+
+        return get_messages
+
+    def test_iter_pages_bounded_walk(self):
+        """Test that before and after together walk backwards and stop at after."""
+        fake = self._fake_history(range(1, 501))
+        with patch.object(self.client, 'get_messages', side_effect=fake) as mock_get:
+            pages = list(self.client.iter_pages(self.channel_id, before="400", after="150"))
+
+        ids = [int(m["id"]) for page in pages for m in page]
+        self.assertEqual(ids, list(range(399, 150, -1)))
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertIsNone(mock_get.call_args_list[0][1]["after"])
+
+    def test_iter_pages_date_window_seeks(self):
+        """Test that since and until jump straight to the window and stop at its edge."""
+        since = datetime(2024, 3, 1, tzinfo=timezone.utc)
+        until = datetime(2024, 4, 1, tzinfo=timezone.utc)
+        lower, upper = datetime_to_snowflake(since), datetime_to_snowflake(until)
+        fake = self._fake_history([lower - 10, lower, lower + 10, upper - 1, upper, upper + 10])
+
+        with patch.object(self.client, 'get_messages', side_effect=fake) as mock_get:
+            pages = list(self.client.iter_pages(self.channel_id, since=since, until=until))
+
+        ids = [int(m["id"]) for page in pages for m in page]
+        self.assertEqual(ids, [upper - 1, lower + 10, lower])
+        self.assertEqual(mock_get.call_args_list[0][1]["before"], str(upper))
+        mock_get.assert_called_once()
+
+    def test_iter_pages_parallel_stitches_slices(self):
+        """Test that parallel slices are yielded newest first without gaps or duplicates."""
+        fake = self._fake_history(range(1000, 3000, 3))
+        with patch.object(self.client, 'get_messages', side_effect=fake):
+            pages = list(self.client.iter_pages_parallel(
+                self.channel_id, partitions=4, before="3000", after="1000"
+            ))
+
+        ids = [int(m["id"]) for page in pages for m in page]
+        self.assertEqual(ids, list(range(2998, 1000, -3)))
+
+    def test_iter_pages_parallel_respects_limit(self):
+        """Test that parallel fetching stops after the requested number of messages."""
+        fake = self._fake_history(range(1, 1001))
+        with patch.object(self.client, 'get_messages', side_effect=fake):
+            pages = list(self.client.iter_pages_parallel(
+                self.channel_id, partitions=3, limit=250, before="1001", after="0"
+            ))
+
+        ids = [int(m["id"]) for page in pages for m in page]
+        self.assertEqual(ids, list(range(1000, 750, -1)))
+
+    def test_iter_pages_parallel_bounds_waiting_slices(self):
+        """Test that a slice that is not consumed yet stops fetching after a few pages."""
+        fake = self._fake_history(range(1, 10001))
+        with patch.object(self.client, 'get_messages', side_effect=fake) as mock_get:
+            pages = self.client.iter_pages_parallel(self.channel_id, partitions=2, before="10001", after="0")
+            next(pages)
+            time.sleep(0.5)
+            older_requests = [
+                call for call in mock_get.call_args_list if int(call[1]["before"]) <= 5001
+            ]
+            pages.close()
+
+        # The older slice holds 50 pages, but only a full queue and the page in hand are fetched
+        self.assertLessEqual(len(older_requests), 3)
+        self.assertLessEqual(mock_get.call_count, 8)
+
+    def test_iter_pages_parallel_propagates_errors(self):
+        """Test that an error in a worker is raised to the consumer."""
+        with patch.object(self.client, 'get_messages', side_effect=ValueError("boom")):
+            with self.assertRaises(ValueError):
+                list(self.client.iter_pages_parallel(
+                    self.channel_id, partitions=2, before="1000", after="0"
+                ))
+
+    def test_iter_pages_prefetch_matches_serial(self):
+        """Test that prefetching yields the same pages as fetching on demand."""
+        cases = [
+            {"limit": 250},
+            {"before": "400", "after": "150"},
+            {"after": "380"},
+        ]
+        for kwargs in cases:
+            with self.subTest(**kwargs):
+                fake = self._fake_history(range(1, 501))
+                with patch.object(self.client, 'get_messages', side_effect=fake):
+                    expected = list(self.client.iter_pages(self.channel_id, **kwargs))
+                with patch.object(self.client, 'get_messages', side_effect=fake) as mock_get:
+                    pages = list(self.client.iter_pages(self.channel_id, prefetch=True, **kwargs))
+
+                self.assertEqual(pages, expected)
+                self.assertEqual(mock_get.call_count, len(expected))
+
+    def test_iter_pages_prefetch_requests_ahead(self):
+        """Test that the next page is requested before the caller asks for it."""
+        fake = self._fake_history(range(1, 301))
+        with patch.object(self.client, 'get_messages', side_effect=fake) as mock_get:
+            pages = self.client.iter_pages(self.channel_id, prefetch=True)
+            first = next(pages)
+
+            # The request for the second page goes out while the first is processed
+            for _ in range(100):
+                if mock_get.call_count == 2:
+                    break
+                time.sleep(0.01)
+            self.assertEqual(mock_get.call_count, 2)
+            self.assertEqual(mock_get.call_args[1]["before"], first[-1]["id"])
+            pages.close()
+
+        self.assertEqual(mock_get.call_count, 2)
+
+    def test_iter_pages_prefetch_close_waits_for_request(self):
+        """Test that closing the generator waits for a prefetched request still in flight."""
+        fake = self._fake_history(range(1, 301))
+        started = threading.Event()
+        finished = threading.Event()
+
+        def slow_get_messages(*args, **kwargs):
+            if kwargs.get("before") is not None:
+                started.set()
+                time.sleep(0.2)
+                finished.set()
+            return fake(*args, **kwargs)
+
+        with patch.object(self.client, 'get_messages', side_effect=slow_get_messages):
+            pages = self.client.iter_pages(self.channel_id, prefetch=True)
+            next(pages)
+            self.assertTrue(started.wait(5))
+            pages.close()
+
+            self.assertTrue(finished.is_set())
+
+    def test_iter_pages_stops_on_empty_page(self):
+        """Test that iter_pages stops when the channel has no more messages."""
+        with patch.object(self.client, 'get_messages', return_value=[]) as mock_get:
+            self.assertEqual(list(self.client.iter_pages(self.channel_id)), [])
+
+        mock_get.assert_called_once()
+
+    def test_session_reused_across_requests(self):
+        """Test that every request goes through the same pooled session."""
+        self.assertEqual(self.client.session.headers["Authorization"], self.token)
+
+        with patch.object(self.client.session, 'get') as mock_get:
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            mock_response.json.return_value = []
+            mock_get.return_value = mock_response
+
+            self.client.get_messages(self.channel_id)
+            self.client.get_messages(self.channel_id, before="123456")
+
+        self.assertEqual(mock_get.call_count, 2)
+
+    def test_pool_configuration(self):
+        """Test that the pool size settings are applied to the mounted adapters."""
+        client = DiscordApiClient(self.token, pool_connections=2, pool_maxsize=32, pool_block=True)
+        adapter = client.session.get_adapter("https://discord.com")
+
+        self.assertEqual(adapter._pool_connections, 2)
+        self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertTrue(adapter._pool_block)
+        client.close()
+
+    def test_context_manager_closes_session(self):
+        """Test that leaving the context manager closes the session."""
+        with patch('requests.Session.close') as mock_close:
+            with DiscordApiClient(self.token) as client:
+                self.assertIsInstance(client, DiscordApiClient)
+            mock_close.assert_called_once()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -55,7 +55,7 @@ class TestDiscordApiClient:
         assert kwargs["params"]["before"] == "987654321"
         assert kwargs["params"]["after"] == "123456789"
     
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_messages_rate_limit(self, mock_get):
         """Test handling of rate limit errors."""
         # Set up mock response for rate limit
@@ -75,7 +75,7 @@ class TestDiscordApiClient:
         assert "rate limit" in str(excinfo.value).lower()
         assert excinfo.value.retry_after == 2.0
     
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_messages_authentication_error(self, mock_get):
         """Test handling of authentication errors."""
         # Set up mock response for authentication error
@@ -93,7 +93,7 @@ class TestDiscordApiClient:
         # Check the error message
         assert "401" in str(excinfo.value)
     
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_messages_channel_not_found(self, mock_get):
         """Test handling of channel not found errors."""
         # Set up mock response for channel not found
@@ -111,7 +111,7 @@ class TestDiscordApiClient:
         # Check the error message
         assert "invalid_channel" in str(excinfo.value)
     
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_messages_other_error(self, mock_get):
         """Test handling of other API errors."""
         # Set up mock response for other error
@@ -130,7 +130,7 @@ class TestDiscordApiClient:
         assert "500" in str(excinfo.value)
     
     @patch("time.sleep")
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_get_messages_retry_on_rate_limit(self, mock_get, mock_sleep):
         """Test automatic retry on rate limit."""
         # Set up mock responses for rate limit and then success
@@ -0,0 +1,69 @@
+"""Unit tests for the archive module."""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from discord_messages_dump.archive import (
+    merge_messages,
+    newest_message_id,
+    read_json_archive,
+    write_json_archive,
+)
+
+
+class TestArchive(unittest.TestCase):
+    """Test cases for archive maintenance."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.archive_file = os.path.join(self.temp_dir, "archive.json")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_newest_message_id(self):
+        """Test that IDs are compared numerically rather than as strings."""
+        messages = [{"id": "99"}, {"id": "1000"}, {"id": "998"}]
+        self.assertEqual(newest_message_id(messages), "1000")
+        self.assertIsNone(newest_message_id([]))
+
+    def test_merge_messages(self):
+        """Test that merging deduplicates by ID, prefers new copies and orders newest first."""
+        existing = [{"id": "20", "content": "old"}, {"id": "10", "content": "first"}]
+        new = [{"id": "20", "content": "edited"}, {"id": "30", "content": "new"}]
+
+        merged = merge_messages(existing, new)
+
+        self.assertEqual([message["id"] for message in merged], ["30", "20", "10"])
+        self.assertEqual(merged[1]["content"], "edited")
+
+    def test_json_archive_round_trip(self):
+        """Test writing and reading back a JSON archive."""
+        messages = [{"id": "2", "content": "b"}, {"id": "1", "content": "a"}]
+        write_json_archive(self.archive_file, messages)
+
+        self.assertEqual(read_json_archive(self.archive_file), messages)
+        with open(self.archive_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), json.dumps(messages, indent=2))
+        self.assertFalse(os.path.exists(self.archive_file + ".tmp"))
+
+    def test_read_missing_archive(self):
+        """Test that a missing archive reads as empty."""
+        self.assertEqual(read_json_archive(self.archive_file), [])
+
+    def test_read_invalid_archive(self):
+        """Test that a JSON file that is not a message list is rejected."""
+        with open(self.archive_file, 'w', encoding='utf-8') as f:
+            json.dump({"messages": []}, f)
+
+        with self.assertRaises(ValueError):
+            read_json_archive(self.archive_file)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+"""Unit tests for the AsyncDiscordApiClient class."""
+
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from discord_messages_dump.async_api import AsyncDiscordApiClient
+from discord_messages_dump.exceptions import DiscordApiError
+
+
+class FakeResponse:
+    """Minimal stand-in for an aiohttp response."""
+
+    def __init__(self, status, payload=None, headers=None, text=""):
+        self.status = status
+        self.headers = headers or {}
+        self._payload = payload
+        self._text = text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        return False
+
+    async def json(self):
+        return self._payload
+
+    async def text(self):
+        return self._text
+
+
+class FakeSession:
+    """Minimal stand-in for an aiohttp session returning queued responses."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.urls = []
+        self.closed = False
+
+    def get(self, url):
+        self.urls.append(url)
+        return self.responses.pop(0)
+
+    async def close(self):
+        self.closed = True
+
+
+async def _no_sleep(delay):
+    """Replacement for asyncio.sleep that records nothing and returns immediately."""
+    return None
+
+
+class TestAsyncDiscordApiClient(unittest.TestCase):
+    """Test cases for the AsyncDiscordApiClient class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.channel_id = "123456789012345678"
+
+    def test_get_messages_success(self):
+        """Test successful message retrieval."""
+        session = FakeSession([FakeResponse(200, [{"id": "2"}, {"id": "1"}])])
+        client = AsyncDiscordApiClient("test_token", session=session)
+
+        result = asyncio.run(client.get_messages(self.channel_id, before="3"))
+
+        self.assertEqual(result, [{"id": "2"}, {"id": "1"}])
+        self.assertIn("limit=100", session.urls[0])
+        self.assertIn("before=3", session.urls[0])
+
+    @patch('asyncio.sleep')
+    def test_rate_limit_uses_async_sleep(self, mock_sleep):
+        """Test that a 429 waits with asyncio.sleep and then retries."""
+        mock_sleep.side_effect = _no_sleep
+        session = FakeSession([
+            FakeResponse(429, headers={"X-RateLimit-Reset-After": "2.0"}),
+            FakeResponse(200, [])
+        ])
+        client = AsyncDiscordApiClient("test_token", session=session)
+
+        with patch('time.sleep') as mock_time_sleep:
+            asyncio.run(client.get_messages(self.channel_id))
+            mock_time_sleep.assert_not_called()
+
+        self.assertEqual(len(session.urls), 2)
+        mock_sleep.assert_called_once_with(2.0)
+
+    @patch('asyncio.sleep')
+    def test_retry_on_server_error(self, mock_sleep):
+        """Test exponential backoff on server errors."""
+        mock_sleep.side_effect = _no_sleep
+        session = FakeSession([FakeResponse(500, text="Internal Server Error")] * 5)
+        client = AsyncDiscordApiClient("test_token", session=session)
+
+        with self.assertRaises(DiscordApiError):
+            asyncio.run(client.get_messages(self.channel_id))
+
+        self.assertEqual(len(session.urls), 5)
+        self.assertEqual([call[0][0] for call in mock_sleep.call_args_list], [1, 2, 4, 8])
+
+    def test_invalid_token(self):
+        """Test handling of an invalid token."""
+        session = FakeSession([FakeResponse(401)])
+        client = AsyncDiscordApiClient("test_token", session=session)
+
+        with self.assertRaises(ValueError) as context:
+            asyncio.run(client.get_messages(self.channel_id))
+
+        self.assertIn("Invalid Discord token", str(context.exception))
+
+    def test_iter_messages_paginates(self):
+        """Test that iter_messages follows the before cursor across pages."""
+        first_page = [{"id": str(i)} for i in range(300, 200, -1)]
+        second_page = [{"id": "200"}, {"id": "199"}]
+        session = FakeSession([FakeResponse(200, first_page), FakeResponse(200, second_page)])
+        client = AsyncDiscordApiClient("test_token", session=session)
+
+        async def collect():
+            return [message async for message in client.iter_messages(self.channel_id)]
+
+        messages = asyncio.run(collect())
+
+        self.assertEqual(len(messages), 102)
+        self.assertIn("before=201", session.urls[1])
+
+    def test_iter_messages_respects_limit(self):
+        """Test that iter_messages stops after the requested number of messages."""
+        session = FakeSession([FakeResponse(200, [{"id": "3"}, {"id": "2"}])])
+        client = AsyncDiscordApiClient("test_token", session=session)
+
+        async def collect():
+            return [message async for message in client.iter_messages(self.channel_id, limit=2)]
+
+        self.assertEqual(len(asyncio.run(collect())), 2)
+        self.assertIn("limit=2", session.urls[0])
+
+    def test_context_manager_closes_session(self):
+        """Test that leaving the context manager closes the session."""
+        session = FakeSession([])
+
+        async def run():
+            async with AsyncDiscordApiClient("test_token", session=session):
+                pass
+
+        asyncio.run(run())
+        self.assertTrue(session.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
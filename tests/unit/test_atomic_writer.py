@@ -0,0 +1,88 @@
+"""Unit tests for the atomic_writer module."""
+
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+
+from discord_messages_dump.atomic_writer import AtomicFileWriter
+
+
+class TestAtomicFileWriter(unittest.TestCase):
+    """Test cases for the AtomicFileWriter class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "messages.txt")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_commit_on_close(self):
+        """Test that the target appears only when the writer is closed."""
+        writer = AtomicFileWriter(self.path, buffer_size=16)
+        self.assertEqual(writer.write("héllo "), 7)
+        writer.write(b"world")
+
+        self.assertFalse(os.path.exists(self.path))
+        self.assertTrue(os.path.exists(writer.temp_path))
+        self.assertEqual(os.path.dirname(writer.temp_path), self.temp_dir)
+
+        writer.close()
+
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), "héllo world".encode('utf-8'))
+        self.assertEqual(os.listdir(self.temp_dir), ["messages.txt"])
+        self.assertEqual(writer.bytes_written, 12)
+
+    def test_creates_missing_directory(self):
+        """Test that the target's directory is created if it does not exist."""
+        path = os.path.join(self.temp_dir, "new", "dir", "messages.txt")
+
+        with AtomicFileWriter(path) as writer:
+            writer.write("hello")
+
+        with open(path, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), "hello")
+
+    def test_exception_keeps_previous_file(self):
+        """Test that a failed write leaves the existing target untouched."""
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("previous dump")
+
+        with self.assertRaises(RuntimeError):
+            with AtomicFileWriter(self.path) as writer:
+                writer.write("partial")
+                raise RuntimeError("interrupted")
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), "previous dump")
+        self.assertEqual(os.listdir(self.temp_dir), ["messages.txt"])
+
+    def test_closed_writer(self):
+        """Test that closing twice is harmless and writing after close fails."""
+        writer = AtomicFileWriter(self.path)
+        writer.close()
+        writer.close()
+        writer.abort()
+
+        self.assertTrue(os.path.exists(self.path))
+        with self.assertRaises(ValueError):
+            writer.write("late")
+
+    def test_compressed_target(self):
+        """Test that a .gz target is compressed while the chunks are written."""
+        path = self.path + ".gz"
+        with AtomicFileWriter(path, level=1) as writer:
+            for i in range(100):
+                writer.write(f"line {i}\n")
+
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            self.assertEqual(f.read(), "".join(f"line {i}\n" for i in range(100)))
+
+
+if __name__ == "__main__":
+    unittest.main()
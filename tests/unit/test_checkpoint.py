@@ -0,0 +1,131 @@
+"""Unit tests for the Checkpoint class."""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+from discord_messages_dump.checkpoint import Checkpoint, SyncState
+
+
+class TestCheckpoint(unittest.TestCase):
+    """Test cases for the Checkpoint class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "dump.checkpoint")
+        self.output_file = os.path.join(self.temp_dir, "messages.txt")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_save_and_load(self):
+        """Test that a saved checkpoint can be loaded back."""
+        checkpoint = Checkpoint(
+            self.path, "123", "text", self.output_file, before="456", count=200, offset=4096,
+            since=datetime(2024, 1, 1), until=datetime(2024, 2, 1, 12, 30), limit=1000
+        )
+        checkpoint.save()
+
+        loaded = Checkpoint.load(self.path)
+
+        self.assertEqual(loaded.to_dict(), checkpoint.to_dict())
+        self.assertEqual(loaded.until, datetime(2024, 2, 1, 12, 30))
+        self.assertFalse(os.path.exists(f"{self.path}.tmp"))
+
+    def test_load_missing_file(self):
+        """Test that loading a missing checkpoint returns None."""
+        self.assertIsNone(Checkpoint.load(self.path))
+
+    def test_load_malformed_file(self):
+        """Test that a malformed checkpoint raises a ValueError."""
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({"channel_id": "123"}, f)
+
+        with self.assertRaises(ValueError):
+            Checkpoint.load(self.path)
+
+    def test_matches(self):
+        """Test matching a checkpoint against a dump's parameters."""
+        checkpoint = Checkpoint(self.path, "123", "json", self.output_file)
+
+        self.assertTrue(checkpoint.matches("123", "JSON", self.output_file))
+        self.assertFalse(checkpoint.matches("999", "json", self.output_file))
+        self.assertFalse(checkpoint.matches("123", "csv", self.output_file))
+
+    def test_matches_window_and_limit(self):
+        """Test that a checkpoint only matches a dump with the same time window and limit."""
+        since = datetime(2024, 1, 1)
+        checkpoint = Checkpoint(self.path, "123", "json", self.output_file, since=since, limit=500)
+
+        self.assertTrue(checkpoint.matches("123", "json", self.output_file, since=since, limit=500))
+        self.assertFalse(checkpoint.matches("123", "json", self.output_file, limit=500))
+        self.assertFalse(checkpoint.matches("123", "json", self.output_file, since=since, limit=None))
+        self.assertFalse(checkpoint.matches(
+            "123", "json", self.output_file, since=since, until=datetime(2024, 2, 1), limit=500
+        ))
+
+    def test_delete(self):
+        """Test that delete removes the checkpoint file."""
+        checkpoint = Checkpoint(self.path, "123", "text", self.output_file)
+        checkpoint.save()
+        checkpoint.delete()
+
+        self.assertFalse(os.path.exists(self.path))
+
+
+
+class TestSyncState(unittest.TestCase):
+    """Test cases for the SyncState class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "sync.json")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_missing_file_is_empty(self):
+        """Test that a missing state file loads as an empty state."""
+        state = SyncState.load(self.path)
+        self.assertIsNone(state.get("archive.json", "123"))
+
+    def test_save_and_load(self):
+        """Test that recorded message IDs survive a round trip, separately per archive."""
+        state = SyncState(self.path)
+        state.set("archive.json", "123", "456")
+        state.set("archive.json", "789", "1011")
+        state.set(os.path.join(self.temp_dir, "other.sqlite"), "123", "999")
+        state.save()
+
+        loaded = SyncState.load(self.path)
+
+        self.assertEqual(loaded.get(os.path.abspath("archive.json"), "123"), "456")
+        self.assertEqual(loaded.get("archive.json", "789"), "1011")
+        self.assertEqual(loaded.get(os.path.join(self.temp_dir, "other.sqlite"), "123"), "999")
+        self.assertIsNone(loaded.get("other.json", "123"))
+
+    def test_load_ignores_entries_without_archive(self):
+        """Test that entries of older state files, keyed by channel only, are not used."""
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({"channels": {"123": "456"}}, f)
+
+        self.assertEqual(SyncState.load(self.path).archives, {})
+
+    def test_load_malformed_file(self):
+        """Test that a malformed state file raises a ValueError."""
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(["123"], f)
+
+        with self.assertRaises(ValueError):
+            SyncState.load(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
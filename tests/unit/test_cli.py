@@ -1,12 +1,23 @@
 """Tests for the CLI module."""
 
+import gzip
+import json
 import os
+import shutil
+import sqlite3
+import tempfile
 import unittest
-from unittest.mock import patch, MagicMock
+from datetime import datetime
+from unittest.mock import ANY, patch, MagicMock
 
 from click.testing import CliRunner
 
-from discord_messages_dump.cli import cli
+from discord_messages_dump.cli import cli, dump_channels, dump_with_checkpoint, read_channel_file
+from discord_messages_dump.checkpoint import SyncState
+from discord_messages_dump.columnar import PYARROW_AVAILABLE
+from discord_messages_dump.sqlite_archive import SqliteArchive
+from discord_messages_dump.message_processor import CsvFormatter, JsonFormatter
+from discord_messages_dump.records import fields_for_format
 
 
 class TestCli(unittest.TestCase):
@@ -37,7 +48,7 @@ class TestCli(unittest.TestCase):
         """Test the dump command with all options provided."""
         # Set up mocks
         mock_client_instance = mock_client.return_value
-        mock_client_instance.get_messages.return_value = self.mock_messages
+        mock_client_instance.iter_pages.return_value = iter([self.mock_messages])
         
         mock_processor_instance = mock_processor.return_value
         mock_processor_instance.format_text.return_value = "Formatted text"
@@ -60,8 +71,8 @@ class TestCli(unittest.TestCase):
         self.assertEqual(result.exit_code, 0)
         
         # Verify the mocks were called correctly
-        mock_client.assert_called_once_with('test_token')
-        mock_client_instance.get_messages.assert_called()
+        mock_client.assert_called_once_with('test_token', stats=ANY)
+        mock_client_instance.iter_pages.assert_called_once_with('test_channel', limit=10)
         mock_processor.assert_called_once_with(self.mock_messages)
         mock_processor_instance.format_text.assert_called_once()
         mock_file_handler_instance.save_content.assert_called_once_with(
@@ -75,7 +86,7 @@ class TestCli(unittest.TestCase):
         """Test the dump command with JSON format."""
         # Set up mocks
         mock_client_instance = mock_client.return_value
-        mock_client_instance.get_messages.return_value = self.mock_messages
+        mock_client_instance.iter_pages.return_value = iter([self.mock_messages])
         
         mock_processor_instance = mock_processor.return_value
         mock_processor_instance.format_json.return_value = '{"messages": []}'
@@ -99,12 +110,274 @@ class TestCli(unittest.TestCase):
         # Verify the format_json method was called
         mock_processor_instance.format_json.assert_called_once()
 
+    @patch('discord_messages_dump.cli.DiscordApiClient')
+    @patch('discord_messages_dump.cli.MessageProcessor')
+    @patch('discord_messages_dump.cli.FileHandler')
+    def test_dump_command_with_partitions(self, mock_file_handler, mock_processor, mock_client):
+        """Test that --partitions fetches time slices in parallel."""
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.iter_pages_parallel.return_value = iter([self.mock_messages])
+        mock_processor.return_value.format_text.return_value = "Formatted text"
+        mock_file_handler.return_value.save_content.return_value = True
+
+        result = self.runner.invoke(cli, [
+            'dump',
+            '--token', 'test_token',
+            '--channel-id', 'test_channel',
+            '--output-file', 'test_output.txt',
+            '--limit', '10',
+            '--partitions', '4',
+            '--no-gui'
+        ])
+
+        self.assertEqual(result.exit_code, 0)
+        mock_client_instance.iter_pages_parallel.assert_called_once_with('test_channel', 4, limit=10)
+        mock_client_instance.iter_pages.assert_not_called()
+
+    @patch('discord_messages_dump.cli.DiscordApiClient')
+    @patch('discord_messages_dump.cli.MessageProcessor')
+    @patch('discord_messages_dump.cli.FileHandler')
+    def test_dump_command_with_date_window(self, mock_file_handler, mock_processor, mock_client):
+        """Test that --since and --until are passed to the client as datetimes."""
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.iter_pages.return_value = iter([self.mock_messages])
+        mock_processor.return_value.format_text.return_value = "Formatted text"
+        mock_file_handler.return_value.save_content.return_value = True
+
+        result = self.runner.invoke(cli, [
+            'dump',
+            '--token', 'test_token',
+            '--channel-id', 'test_channel',
+            '--output-file', 'test_output.txt',
+            '--since', '2024-03-01',
+            '--until', '2024-04-01',
+            '--no-gui'
+        ])
+
+        self.assertEqual(result.exit_code, 0)
+        mock_client_instance.iter_pages.assert_called_once_with(
+            'test_channel', limit=100, since=datetime(2024, 3, 1), until=datetime(2024, 4, 1)
+        )
+
+    @patch('discord_messages_dump.cli.DiscordApiClient')
+    @patch('discord_messages_dump.cli.MessageProcessor')
+    @patch('discord_messages_dump.cli.FileHandler')
+    def test_dump_command_with_compact(self, mock_file_handler, mock_processor, mock_client):
+        """Test that --compact gives the client a factory for the format's fields."""
+        mock_client.return_value.iter_pages.return_value = iter([self.mock_messages])
+        mock_processor.return_value.format_csv.return_value = "Formatted csv"
+        mock_file_handler.return_value.save_content.return_value = True
+
+        result = self.runner.invoke(cli, [
+            'dump',
+            '--token', 'test_token',
+            '--channel-id', 'test_channel',
+            '--format', 'csv',
+            '--output-file', 'test_output.csv',
+            '--compact',
+            '--no-gui'
+        ])
+
+        self.assertEqual(result.exit_code, 0)
+        factory = mock_client.call_args[1]["record_factory"]
+        self.assertEqual(factory.fields, fields_for_format("csv") | {"id"})
+
+    @patch('discord_messages_dump.cli.DiscordApiClient')
+    @patch('discord_messages_dump.cli.MessageProcessor')
+    @patch('discord_messages_dump.cli.FileHandler')
+    def test_dump_command_compact_ignored_for_json(self, mock_file_handler, mock_processor, mock_client):
+        """Test that --compact keeps full messages for formats that need them."""
+        mock_client.return_value.iter_pages.return_value = iter([self.mock_messages])
+        mock_processor.return_value.format_json.return_value = "[]"
+        mock_file_handler.return_value.save_content.return_value = True
+
+        result = self.runner.invoke(cli, [
+            'dump',
+            '--token', 'test_token',
+            '--channel-id', 'test_channel',
+            '--format', 'json',
+            '--output-file', 'test_output.json',
+            '--compact',
+            '--no-gui'
+        ])
+
+        self.assertEqual(result.exit_code, 0)
+        mock_client.assert_called_once_with('test_token', stats=ANY)
+
+    @patch('discord_messages_dump.cli.DiscordApiClient')
+    @patch('discord_messages_dump.cli.MessageProcessor')
+    @patch('discord_messages_dump.cli.FileHandler')
+    def test_dump_command_with_fields(self, mock_file_handler, mock_processor, mock_client):
+        """Test that --fields is passed to the client as a field projection."""
+        mock_client.return_value.iter_pages.return_value = iter([self.mock_messages])
+        mock_processor.return_value.format_text.return_value = "Formatted text"
+        mock_file_handler.return_value.save_content.return_value = True
+
+        result = self.runner.invoke(cli, [
+            'dump',
+            '--token', 'test_token',
+            '--channel-id', 'test_channel',
+            '--output-file', 'test_output.txt',
+            '--fields', 'timestamp, author.username,content',
+            '--no-gui'
+        ])
+
+        self.assertEqual(result.exit_code, 0)
+        mock_client.assert_called_once_with(
+            'test_token', stats=ANY, fields=['timestamp', 'author.username', 'content']
+        )
+
+    def test_dump_command_rejects_invalid_fields(self):
+        """Test that malformed field names are rejected."""
+        result = self.runner.invoke(cli, [
+            'dump',
+            '--token', 'test_token',
+            '--channel-id', 'test_channel',
+            '--fields', 'author.',
+            '--no-gui'
+        ])
+
+        self.assertEqual(result.exit_code, 1)
+
+    @patch('discord_messages_dump.cli.DiscordApiClient')
+    @patch('discord_messages_dump.cli.MessageProcessor')
+    @patch('discord_messages_dump.cli.FileHandler')
+    def test_dump_command_with_format_workers(self, mock_file_handler, mock_processor, mock_client):
+        """Test that --format-workers formats the messages across a process pool."""
+        mock_client.return_value.iter_pages.return_value = iter([self.mock_messages])
+        mock_processor.return_value.format_parallel.return_value = "Formatted markdown"
+        mock_file_handler.return_value.save_content.return_value = True
+
+        result = self.runner.invoke(cli, [
+            'dump',
+            '--token', 'test_token',
+            '--channel-id', 'test_channel',
+            '--format', 'markdown',
+            '--output-file', 'test_output.md',
+            '--format-workers', '4',
+            '--no-gui'
+        ])
+
+        self.assertEqual(result.exit_code, 0)
+        mock_processor.return_value.format_parallel.assert_called_once_with('markdown', 4)
+        mock_processor.return_value.format_markdown.assert_not_called()
+        mock_file_handler.return_value.save_content.assert_called_once_with("Formatted markdown", 'test_output.md')
+
+    @patch('discord_messages_dump.cli.DiscordApiClient')
+    @patch('discord_messages_dump.cli.MessageProcessor')
+    @patch('discord_messages_dump.cli.FileHandler')
+    def test_dump_command_with_prefetch(self, mock_file_handler, mock_processor, mock_client):
+        """Test that --prefetch asks the client to request pages ahead."""
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.iter_pages.return_value = iter([self.mock_messages])
+        mock_processor.return_value.format_text.return_value = "Formatted text"
+        mock_file_handler.return_value.save_content.return_value = True
+
+        result = self.runner.invoke(cli, [
+            'dump',
+            '--token', 'test_token',
+            '--channel-id', 'test_channel',
+            '--output-file', 'test_output.txt',
+            '--prefetch',
+            '--no-gui'
+        ])
+
+        self.assertEqual(result.exit_code, 0)
+        mock_client_instance.iter_pages.assert_called_once_with('test_channel', limit=100, prefetch=True)
+
+    @patch('discord_messages_dump.cli.DiscordApiClient')
+    @patch('discord_messages_dump.cli.MessageProcessor')
+    @patch('discord_messages_dump.cli.FileHandler')
+    def test_dump_command_with_limit_all(self, mock_file_handler, mock_processor, mock_client):
+        """Test that --limit all fetches the whole history."""
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.iter_pages.return_value = iter([self.mock_messages])
+        mock_processor.return_value.format_text.return_value = "Formatted text"
+        mock_file_handler.return_value.save_content.return_value = True
+
+        result = self.runner.invoke(cli, [
+            'dump',
+            '--token', 'test_token',
+            '--channel-id', '1100000000000000000',
+            '--output-file', 'test_output.txt',
+            '--limit', 'ALL',
+            '--no-gui'
+        ])
+
+        self.assertEqual(result.exit_code, 0)
+        mock_client_instance.iter_pages.assert_called_once_with('1100000000000000000', limit=None)
+        self.assertIn("2 msgs", result.output)
+
+    def test_dump_command_rejects_invalid_limit(self):
+        """Test that --limit must be a positive number or 'all'."""
+        for limit in ('0', 'many'):
+            result = self.runner.invoke(cli, [
+                'dump',
+                '--token', 'test_token',
+                '--channel-id', 'test_channel',
+                '--limit', limit
+            ])
+
+            self.assertEqual(result.exit_code, 2)
+
+    @patch('discord_messages_dump.cli.DiscordApiClient')
+    @patch('discord_messages_dump.cli.MessageProcessor')
+    @patch('discord_messages_dump.cli.FileHandler')
+    def test_dump_command_with_profile(self, mock_file_handler, mock_processor, mock_client):
+        """Test that --profile writes a pstats file of the dump."""
+        mock_client.return_value.iter_pages.return_value = iter([self.mock_messages])
+        mock_processor.return_value.format_text.return_value = "Formatted text"
+        mock_file_handler.return_value.save_content.return_value = True
+
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        profile_file = os.path.join(temp_dir, 'dump.pstats')
+
+        result = self.runner.invoke(cli, [
+            'dump',
+            '--token', 'test_token',
+            '--channel-id', 'test_channel',
+            '--output-file', 'test_output.txt',
+            '--profile', profile_file,
+            '--trace-malloc',
+            '--no-gui'
+        ])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertTrue(os.path.exists(profile_file))
+
+    def test_dump_command_rejects_empty_window(self):
+        """Test that --since must be earlier than --until."""
+        result = self.runner.invoke(cli, [
+            'dump',
+            '--token', 'test_token',
+            '--channel-id', 'test_channel',
+            '--since', '2024-04-01',
+            '--until', '2024-03-01'
+        ])
+
+        self.assertEqual(result.exit_code, 1)
+
+    def test_dump_command_partitions_rejects_checkpoint(self):
+        """Test that --partitions cannot be combined with --checkpoint."""
+        result = self.runner.invoke(cli, [
+            'dump',
+            '--token', 'test_token',
+            '--channel-id', 'test_channel',
+            '--output-file', 'test_output.txt',
+            '--partitions', '4',
+            '--checkpoint',
+            '--no-gui'
+        ])
+
+        self.assertEqual(result.exit_code, 1)
+
     @patch('discord_messages_dump.cli.DiscordApiClient')
     def test_dump_command_with_no_messages(self, mock_client):
         """Test the dump command when no messages are found."""
         # Set up mocks
         mock_client_instance = mock_client.return_value
-        mock_client_instance.get_messages.return_value = []
+        mock_client_instance.iter_pages.return_value = iter([])
         
         # Run the command
         result = self.runner.invoke(cli, [
@@ -148,5 +421,643 @@ class TestCli(unittest.TestCase):
         self.assertIn("Channel ID not provided", result.output)
 
 
+
+class FakePagedClient:
+    """Client stand-in that serves fixed pages and can fail after a number of pages."""
+
+    def __init__(self, pages, fail_after=None):
+        self.pages = pages
+        self.fail_after = fail_after
+        self.calls = []
+
+    def iter_pages(self, channel_id, limit=None, before=None):
+        self.calls.append({"limit": limit, "before": before})
+        start = 0
+        if before is not None:
+            start = next(i for i, page in enumerate(self.pages) if page[-1]["id"] == before) + 1
+
+        served = 0
+        for page in self.pages[start:]:
+            if self.fail_after is not None and served == self.fail_after:
+                raise ConnectionError("Connection reset")
+            yield page
+            served += 1
+
+
+class TestDumpWithCheckpoint(unittest.TestCase):
+    """Test cases for checkpointed, resumable dumps."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.output_file = os.path.join(self.temp_dir, "messages.json")
+        self.checkpoint_file = self.output_file + ".checkpoint"
+        self.pages = [
+            [{"id": str(i), "content": f"Message {i}", "author": {"username": "user"}} for i in range(n, n - 3, -1)]
+            for n in (9, 6, 3)
+        ]
+        self.messages = [message for page in self.pages for message in page]
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def _dump(self, client, resume=False, limit=100, since=None):
+        return dump_with_checkpoint(
+            client, "123", "json", self.output_file, limit,
+            self.checkpoint_file, checkpoint_interval=1, resume=resume, since=since
+        )
+
+    def _read_output(self):
+        with open(self.output_file, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def test_complete_dump(self):
+        """Test that a completed dump matches formatting all messages and removes its checkpoint."""
+        count = self._dump(FakePagedClient(self.pages))
+
+        self.assertEqual(count, 9)
+        self.assertEqual(self._read_output(), JsonFormatter().format(self.messages))
+        self.assertFalse(os.path.exists(self.checkpoint_file))
+
+    def test_interrupted_dump_saves_checkpoint(self):
+        """Test that a failing dump leaves a checkpoint after the last complete page."""
+        with self.assertRaises(ConnectionError):
+            self._dump(FakePagedClient(self.pages, fail_after=2))
+
+        with open(self.checkpoint_file, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+
+        self.assertEqual(checkpoint["before"], "4")
+        self.assertEqual(checkpoint["count"], 6)
+        self.assertEqual(checkpoint["offset"], os.path.getsize(self.output_file))
+
+    def test_resume_continues_from_cursor(self):
+        """Test that a resumed dump fetches only the missing pages and produces the complete output."""
+        with self.assertRaises(ConnectionError):
+            self._dump(FakePagedClient(self.pages, fail_after=1))
+
+        client = FakePagedClient(self.pages)
+        count = self._dump(client, resume=True)
+
+        self.assertEqual(count, 9)
+        self.assertEqual(client.calls, [{"limit": 97, "before": "7"}])
+        self.assertEqual(self._read_output(), JsonFormatter().format(self.messages))
+        self.assertFalse(os.path.exists(self.checkpoint_file))
+
+    def test_unlimited_resume(self):
+        """Test that a resumed dump without a limit fetches the rest of the history."""
+        with self.assertRaises(ConnectionError):
+            self._dump(FakePagedClient(self.pages, fail_after=1), limit=None)
+
+        client = FakePagedClient(self.pages)
+        count = self._dump(client, resume=True, limit=None)
+
+        self.assertEqual(count, 9)
+        self.assertEqual(client.calls, [{"limit": None, "before": "7"}])
+        self.assertEqual(self._read_output(), JsonFormatter().format(self.messages))
+
+    def test_resume_rejects_other_dump(self):
+        """Test that resuming with a checkpoint from another channel fails."""
+        with self.assertRaises(ConnectionError):
+            self._dump(FakePagedClient(self.pages, fail_after=1))
+
+        with self.assertRaises(ValueError):
+            dump_with_checkpoint(
+                FakePagedClient(self.pages), "999", "json", self.output_file, 100,
+                self.checkpoint_file, resume=True
+            )
+
+    def test_resume_rejects_other_window_or_limit(self):
+        """Test that resuming with another limit or time window fails and keeps the checkpoint."""
+        with self.assertRaises(ConnectionError):
+            self._dump(FakePagedClient(self.pages, fail_after=1))
+
+        with self.assertRaises(ValueError):
+            self._dump(FakePagedClient(self.pages), resume=True, limit=None)
+        with self.assertRaises(ValueError):
+            self._dump(FakePagedClient(self.pages), resume=True, since=datetime(2024, 1, 1))
+
+        self.assertEqual(self._dump(FakePagedClient(self.pages), resume=True), 9)
+
+    def test_resume_with_missing_output_starts_over(self):
+        """Test that a checkpoint whose output file was removed starts a complete new dump."""
+        with self.assertRaises(ConnectionError):
+            self._dump(FakePagedClient(self.pages, fail_after=1))
+        os.remove(self.output_file)
+
+        client = FakePagedClient(self.pages)
+        with self.assertLogs("discord-dump", level="WARNING") as logs:
+            count = self._dump(client, resume=True)
+
+        self.assertEqual(count, 9)
+        self.assertEqual(client.calls, [{"limit": 100, "before": None}])
+        self.assertIn("output file", logs.output[0])
+        self.assertEqual(self._read_output(), JsonFormatter().format(self.messages))
+
+    def test_no_messages_keeps_existing_file(self):
+        """Test that a dump without messages does not truncate or remove a previous dump."""
+        with open(self.output_file, 'w', encoding='utf-8') as f:
+            f.write("previous dump")
+
+        count = self._dump(FakePagedClient([]))
+
+        self.assertEqual(count, 0)
+        self.assertEqual(self._read_output(), "previous dump")
+        self.assertFalse(os.path.exists(self.checkpoint_file))
+
+    def test_failure_before_first_page_keeps_existing_file(self):
+        """Test that a dump failing before any output leaves the previous dump and no checkpoint."""
+        with open(self.output_file, 'w', encoding='utf-8') as f:
+            f.write("previous dump")
+
+        with self.assertRaises(ConnectionError):
+            self._dump(FakePagedClient(self.pages, fail_after=0))
+
+        self.assertEqual(self._read_output(), "previous dump")
+        self.assertFalse(os.path.exists(self.checkpoint_file))
+
+
+
+class TestSyncCommand(unittest.TestCase):
+    """Test cases for the sync command."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.runner = CliRunner()
+        self.temp_dir = tempfile.mkdtemp()
+        self.archive_file = os.path.join(self.temp_dir, "archive.json")
+        self.state_file = os.path.join(self.temp_dir, "state.json")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def _sync(self):
+        return self.runner.invoke(cli, [
+            'sync',
+            '--token', 'test_token',
+            '--channel-id', 'test_channel',
+            '--archive', self.archive_file,
+            '--state-file', self.state_file
+        ])
+
+    @patch('discord_messages_dump.cli.DiscordApiClient')
+    def test_sync_merges_new_messages(self, mock_client):
+        """Test that a sync fetches after the saved cursor and merges into the archive."""
+        mock_client_instance = mock_client.return_value
+
+        # First sync fetches the full history
+        mock_client_instance.iter_pages.return_value = iter([[{"id": "2"}, {"id": "1"}]])
+        result = self._sync()
+        self.assertEqual(result.exit_code, 0)
+        mock_client_instance.iter_pages.assert_called_with('test_channel', after=None)
+
+        # Second sync only fetches messages after the newest archived one
+        mock_client_instance.iter_pages.return_value = iter([[{"id": "3"}]])
+        result = self._sync()
+        self.assertEqual(result.exit_code, 0)
+        mock_client_instance.iter_pages.assert_called_with('test_channel', after="2")
+
+        with open(self.archive_file, 'r', encoding='utf-8') as f:
+            archive = json.load(f)
+        self.assertEqual([message["id"] for message in archive], ["3", "2", "1"])
+        self.assertEqual(SyncState.load(self.state_file).get(self.archive_file, "test_channel"), "3")
+
+    @patch('discord_messages_dump.cli.DiscordApiClient')
+    def test_sync_up_to_date(self, mock_client):
+        """Test that a sync without new messages leaves the archive untouched."""
+        with open(self.archive_file, 'w', encoding='utf-8') as f:
+            json.dump([{"id": "5"}], f)
+        mock_client.return_value.iter_pages.return_value = iter([])
+
+        result = self._sync()
+
+        self.assertEqual(result.exit_code, 0)
+        mock_client.return_value.iter_pages.assert_called_with('test_channel', after="5")
+        self.assertEqual(SyncState.load(self.state_file).get(self.archive_file, "test_channel"), "5")
+
+    @patch('discord_messages_dump.cli.DiscordApiClient')
+    def test_sync_into_second_archive_fetches_full_history(self, mock_client):
+        """Test that syncing a channel into another archive is not limited by the first one's cursor."""
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.iter_pages.return_value = iter([[{"id": "2"}, {"id": "1"}]])
+        self.assertEqual(self._sync().exit_code, 0)
+
+        other_archive = os.path.join(self.temp_dir, "other.json")
+        mock_client_instance.iter_pages.return_value = iter([[{"id": "3"}, {"id": "2"}, {"id": "1"}]])
+        result = self.runner.invoke(cli, [
+            'sync',
+            '--token', 'test_token',
+            '--channel-id', 'test_channel',
+            '--archive', other_archive,
+            '--state-file', self.state_file
+        ])
+
+        self.assertEqual(result.exit_code, 0)
+        mock_client_instance.iter_pages.assert_called_with('test_channel', after=None)
+        with open(other_archive, 'r', encoding='utf-8') as f:
+            self.assertEqual([message["id"] for message in json.load(f)], ["3", "2", "1"])
+        state = SyncState.load(self.state_file)
+        self.assertEqual(state.get(self.archive_file, "test_channel"), "2")
+        self.assertEqual(state.get(other_archive, "test_channel"), "3")
+
+        # A deleted archive is filled again from the start
+        os.remove(self.archive_file)
+        mock_client_instance.iter_pages.return_value = iter([[{"id": "3"}, {"id": "2"}, {"id": "1"}]])
+        self.assertEqual(self._sync().exit_code, 0)
+        mock_client_instance.iter_pages.assert_called_with('test_channel', after=None)
+
+
+    @patch('discord_messages_dump.cli.DiscordApiClient')
+    def test_sync_sqlite_archive(self, mock_client):
+        """Test that a SQLite archive is appended to after its newest message."""
+        archive_file = os.path.join(self.temp_dir, "archive.sqlite")
+        mock_client_instance = mock_client.return_value
+        args = [
+            'sync',
+            '--token', 'test_token',
+            '--channel-id', '42',
+            '--archive', archive_file,
+            '--format', 'sqlite',
+            '--state-file', self.state_file
+        ]
+
+        # The first sync pages backwards, so pages arrive newest first
+        mock_client_instance.iter_pages.return_value = iter([
+            [{"id": "4", "channel_id": "42"}, {"id": "3", "channel_id": "42"}],
+            [{"id": "2", "channel_id": "42"}, {"id": "1", "channel_id": "42"}]
+        ])
+        result = self.runner.invoke(cli, args)
+        self.assertEqual(result.exit_code, 0)
+        mock_client_instance.iter_pages.assert_called_with('42', after=None)
+        self.assertEqual(SyncState.load(self.state_file).get(archive_file, "42"), "4")
+
+        # The cursor comes from the archive itself, with or without a state file
+        os.remove(self.state_file)
+        mock_client_instance.iter_pages.return_value = iter([[{"id": "5", "channel_id": "42"}]])
+        result = self.runner.invoke(cli, args)
+        self.assertEqual(result.exit_code, 0)
+        mock_client_instance.iter_pages.assert_called_with('42', after="4")
+
+        with SqliteArchive(archive_file) as archive:
+            self.assertEqual(archive.count("42"), 5)
+        self.assertEqual(SyncState.load(self.state_file).get(archive_file, "42"), "5")
+
+        # A later sync continues after the newest message
+        mock_client_instance.iter_pages.return_value = iter([])
+        result = self.runner.invoke(cli, args)
+        self.assertEqual(result.exit_code, 0)
+        mock_client_instance.iter_pages.assert_called_with('42', after="5")
+
+
+class TestSearchCommand(unittest.TestCase):
+    """Test cases for the search command."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.runner = CliRunner()
+        self.temp_dir = tempfile.mkdtemp()
+        self.archive_file = os.path.join(self.temp_dir, "archive.sqlite")
+        with SqliteArchive(self.archive_file) as archive:
+            archive.write([
+                {"id": "2", "author": {"id": "7", "username": "alice"}, "content": "release\nnotes", "timestamp": "t2"},
+                {"id": "1", "author": {"id": "8", "username": "bob"}, "content": "hello", "timestamp": "t1"}
+            ])
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_search_prints_matches(self):
+        """Test that matching messages are printed one per line."""
+        result = self.runner.invoke(cli, ['search', 'release', '--archive', self.archive_file])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("2  [t2] alice: [release] notes", result.output)
+        self.assertNotIn("hello", result.output)
+
+    def test_search_leaves_directory_unchanged(self):
+        """Test that searching an archive creates no files next to it."""
+        files = sorted(os.listdir(self.temp_dir))
+
+        result = self.runner.invoke(cli, ['search', 'release', '--archive', self.archive_file])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), files)
+
+    def test_search_rejects_file_that_is_not_a_database(self):
+        """Test that a file that is not a SQLite database is reported without a traceback."""
+        with open(self.archive_file, 'w', encoding='utf-8') as f:
+            f.write("not a database" * 100)
+
+        result = self.runner.invoke(cli, ['search', 'release', '--archive', self.archive_file])
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertNotIsInstance(result.exception, sqlite3.Error)
+        with open(self.archive_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), "not a database" * 100)
+
+    def test_search_requires_query_or_author(self):
+        """Test that an empty search is rejected."""
+        result = self.runner.invoke(cli, ['search', '--archive', self.archive_file])
+        self.assertEqual(result.exit_code, 1)
+
+
+class FakeChannelClient:
+    """Client stand-in that serves one page per channel and fails for unknown channels."""
+
+    def __init__(self, channels):
+        self.channels = channels
+        self.prefetched = []
+
+    def iter_pages(self, channel_id, limit=None, before=None, prefetch=False):
+        if prefetch:
+            self.prefetched.append(channel_id)
+        if channel_id not in self.channels:
+            raise ValueError(f"Channel with ID {channel_id} not found.")
+        yield self.channels[channel_id]
+
+
+class TestPipelinedDump(unittest.TestCase):
+    """Test cases for dumping a channel through the fetch, format and write pipeline."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.runner = CliRunner()
+        self.temp_dir = tempfile.mkdtemp()
+        self.output_file = os.path.join(self.temp_dir, "messages.csv")
+        self.pages = [
+            [{"id": "4", "timestamp": "t4", "author": {"id": "1", "username": "a"}, "content": "four"},
+             {"id": "3", "timestamp": "t3", "author": {"id": "1", "username": "a"}, "content": "three"}],
+            [{"id": "2", "timestamp": "t2", "author": {"id": "2", "username": "b"}, "content": "two"}]
+        ]
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    @patch('discord_messages_dump.cli.DiscordApiClient')
+    def test_pipeline_output_matches_serial(self, mock_client):
+        """Test that pipelined output is identical to formatting all messages at once."""
+        mock_client.return_value.iter_pages.return_value = iter(self.pages)
+
+        result = self.runner.invoke(cli, [
+            'dump',
+            '--token', 'test_token',
+            '--channel-id', 'test_channel',
+            '--format', 'csv',
+            '--output-file', self.output_file,
+            '--pipeline',
+            '--no-gui'
+        ])
+
+        self.assertEqual(result.exit_code, 0)
+        with open(self.output_file, 'r', encoding='utf-8', newline='') as f:
+            self.assertEqual(f.read(), CsvFormatter().format(self.pages[0] + self.pages[1]))
+
+    @patch('discord_messages_dump.cli.DiscordApiClient')
+    def test_pipeline_creates_output_directory(self, mock_client):
+        """Test that a pipelined dump creates the directory of its output file."""
+        mock_client.return_value.iter_pages.return_value = iter(self.pages)
+        output_file = os.path.join(self.temp_dir, "new_dir", "out.csv")
+
+        result = self.runner.invoke(cli, [
+            'dump',
+            '--token', 'test_token',
+            '--channel-id', 'test_channel',
+            '--format', 'csv',
+            '--output-file', output_file,
+            '--pipeline',
+            '--no-gui'
+        ])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertTrue(os.path.exists(output_file))
+
+    @patch('discord_messages_dump.cli.DiscordApiClient')
+    def test_pipeline_writes_stats_file(self, mock_client):
+        """Test that --stats-file records the requests, pages and output of the dump."""
+        def iter_pages(channel_id, limit=None):
+            stats = mock_client.call_args[1]["stats"]
+            for page in self.pages:
+                stats.record_request(0.05, 100)
+                stats.record_page(len(page))
+                yield page
+
+        mock_client.return_value.iter_pages.side_effect = iter_pages
+        stats_file = os.path.join(self.temp_dir, "stats.json")
+
+        result = self.runner.invoke(cli, [
+            'dump',
+            '--token', 'test_token',
+            '--channel-id', 'test_channel',
+            '--format', 'csv',
+            '--output-file', self.output_file,
+            '--stats-file', stats_file,
+            '--pipeline',
+            '--no-gui'
+        ])
+
+        self.assertEqual(result.exit_code, 0)
+        with open(stats_file, 'r', encoding='utf-8') as f:
+            stats = json.load(f)
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["messages"], 3)
+        self.assertEqual(stats["bytes_received"], 200)
+        self.assertEqual(stats["bytes_written"], os.path.getsize(self.output_file))
+        self.assertAlmostEqual(stats["latency_ms"]["p50"], 50.0)
+
+    @patch('discord_messages_dump.cli.DiscordApiClient')
+    def test_pipeline_compressed_output(self, mock_client):
+        """Test that --compress appends the extension and compresses as pages are written."""
+        mock_client.return_value.iter_pages.return_value = iter(self.pages)
+
+        result = self.runner.invoke(cli, [
+            'dump',
+            '--token', 'test_token',
+            '--channel-id', 'test_channel',
+            '--format', 'csv',
+            '--output-file', self.output_file,
+            '--compress', 'gzip',
+            '--compress-level', '9',
+            '--pipeline',
+            '--no-gui'
+        ])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertFalse(os.path.exists(self.output_file))
+        with gzip.open(self.output_file + '.gz', 'rt', encoding='utf-8', newline='') as f:
+            self.assertEqual(f.read(), CsvFormatter().format(self.pages[0] + self.pages[1]))
+
+    def test_compression_rejected_for_sqlite(self):
+        """Test that compressed output is refused for formats that are not text."""
+        result = self.runner.invoke(cli, [
+            'dump',
+            '--token', 'test_token',
+            '--channel-id', 'test_channel',
+            '--format', 'sqlite',
+            '--output-file', os.path.join(self.temp_dir, 'archive.sqlite.gz'),
+            '--no-gui'
+        ])
+
+        self.assertEqual(result.exit_code, 1)
+
+    @patch('discord_messages_dump.cli.DiscordApiClient')
+    def test_pipeline_with_no_messages(self, mock_client):
+        """Test that an empty channel leaves no output file behind."""
+        mock_client.return_value.iter_pages.return_value = iter([])
+
+        result = self.runner.invoke(cli, [
+            'dump',
+            '--token', 'test_token',
+            '--channel-id', 'test_channel',
+            '--output-file', self.output_file,
+            '--pipeline',
+            '--no-gui'
+        ])
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertFalse(os.path.exists(self.output_file))
+
+    @patch('discord_messages_dump.cli.DiscordApiClient')
+    def test_pipeline_with_no_messages_keeps_existing_file(self, mock_client):
+        """Test that an empty channel does not replace or remove a previous dump."""
+        with open(self.output_file, 'w', encoding='utf-8') as f:
+            f.write("previous dump")
+        mock_client.return_value.iter_pages.return_value = iter([])
+
+        result = self.runner.invoke(cli, [
+            'dump',
+            '--token', 'test_token',
+            '--channel-id', 'test_channel',
+            '--output-file', self.output_file,
+            '--pipeline',
+            '--no-gui'
+        ])
+
+        self.assertEqual(result.exit_code, 1)
+        with open(self.output_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), "previous dump")
+        self.assertEqual(os.listdir(self.temp_dir), ["messages.csv"])
+
+
+class TestMultiChannelDump(unittest.TestCase):
+    """Test cases for dumping several channels concurrently."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.runner = CliRunner()
+        self.temp_dir = tempfile.mkdtemp()
+        self.channels = {
+            "111": [{"id": "3", "content": "c"}, {"id": "2", "content": "b"}],
+            "222": [{"id": "1", "content": "a"}]
+        }
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_read_channel_file(self):
+        """Test that blank lines and comments are skipped."""
+        path = os.path.join(self.temp_dir, "channels.txt")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("# archive\n111\n\n  222  \n")
+
+        self.assertEqual(read_channel_file(path), ["111", "222"])
+
+    def test_dump_channels_writes_one_file_per_channel(self):
+        """Test that each channel is saved to its own file and failures are recorded."""
+        client = FakeChannelClient(self.channels)
+
+        results = dump_channels(client, ["111", "999", "222"], "json", self.temp_dir, 100, workers=2)
+
+        self.assertEqual([result["channel_id"] for result in results], ["111", "999", "222"])
+        self.assertEqual([result["count"] for result in results], [2, 0, 1])
+        self.assertIn("not found", results[1]["error"])
+        with open(os.path.join(self.temp_dir, "111.json"), 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f), self.channels["111"])
+
+    @unittest.skipUnless(PYARROW_AVAILABLE, "pyarrow is not installed")
+    def test_dump_channels_parquet(self):
+        """Test that Parquet output is written through the columnar writer."""
+        import pyarrow.parquet as pq
+
+        results = dump_channels(FakeChannelClient(self.channels), ["111"], "parquet", self.temp_dir, 100)
+
+        self.assertEqual(results[0]["count"], 2)
+        table = pq.read_table(os.path.join(self.temp_dir, "111.parquet"))
+        self.assertEqual(table.column("id").to_pylist(), [3, 2])
+
+    @patch('discord_messages_dump.cli.DiscordApiClient')
+    def test_dump_command_with_several_channels(self, mock_client):
+        """Test that repeated --channel-id options dump every channel."""
+        mock_client.return_value = FakeChannelClient(self.channels)
+        mock_client.return_value.close = MagicMock()
+
+        result = self.runner.invoke(cli, [
+            'dump',
+            '--token', 'test_token',
+            '--channel-id', '111',
+            '--channel-id', '222',
+            '--format', 'json',
+            '--output-dir', self.temp_dir,
+            '--workers', '2'
+        ])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, "111.json")))
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, "222.json")))
+        mock_client.return_value.close.assert_called_once()
+
+    @patch('discord_messages_dump.cli.DiscordApiClient')
+    def test_dump_command_several_channels_passes_compact_and_prefetch(self, mock_client):
+        """Test that --compact and --prefetch apply to every channel."""
+        mock_client.return_value = FakeChannelClient(self.channels)
+        mock_client.return_value.close = MagicMock()
+
+        result = self.runner.invoke(cli, [
+            'dump',
+            '--token', 'test_token',
+            '--channel-id', '111',
+            '--channel-id', '222',
+            '--format', 'csv',
+            '--output-dir', self.temp_dir,
+            '--compact',
+            '--prefetch'
+        ])
+
+        self.assertEqual(result.exit_code, 0)
+        factory = mock_client.call_args[1]["record_factory"]
+        self.assertEqual(factory.fields, fields_for_format("csv") | {"id"})
+        self.assertEqual(sorted(mock_client.return_value.prefetched), ["111", "222"])
+
+    def test_dump_command_several_channels_rejects_format_workers(self):
+        """Test that --format-workers cannot be used with several channels."""
+        result = self.runner.invoke(cli, [
+            'dump',
+            '--token', 'test_token',
+            '--channel-id', '111',
+            '--channel-id', '222',
+            '--output-dir', self.temp_dir,
+            '--format-workers', '2'
+        ])
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+    def test_dump_command_several_channels_rejects_output_file(self):
+        """Test that --output-file cannot be used with several channels."""
+        result = self.runner.invoke(cli, [
+            'dump',
+            '--token', 'test_token',
+            '--channel-id', '111',
+            '--channel-id', '222',
+            '--output-file', 'out.txt'
+        ])
+
+        self.assertEqual(result.exit_code, 1)
+
+
 if __name__ == '__main__':
     unittest.main()
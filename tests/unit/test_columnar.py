@@ -0,0 +1,143 @@
+"""Unit tests for the columnar module."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timezone
+
+from discord_messages_dump.columnar import PYARROW_AVAILABLE
+
+if PYARROW_AVAILABLE:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    from discord_messages_dump.columnar import MessageTable, ParquetMessageWriter, write_parquet
+
+
+def _message(message_id, username="user", attachments=None):
+    return {
+        "id": str(message_id),
+        "channel_id": "987654321098765432",
+        "author": {"id": "123456789012345678", "username": username},
+        "content": f"Message {message_id}",
+        "timestamp": "2023-01-01T12:00:00.000000+00:00",
+        "edited_timestamp": None,
+        "pinned": False,
+        "attachments": attachments or []
+    }
+
+
+@unittest.skipUnless(PYARROW_AVAILABLE, "pyarrow is not installed")
+class TestMessageTable(unittest.TestCase):
+    """Test cases for the MessageTable class."""
+
+    def test_record_batch_types(self):
+        """Test that columns are converted with their typed schema."""
+        table = MessageTable()
+        table.extend([
+            _message(2, attachments=[{"id": "5", "filename": "a.png", "url": "https://x", "size": 10}]),
+            _message(1, username="other")
+        ])
+
+        batch = table.to_record_batch()
+
+        self.assertEqual(batch.num_rows, 2)
+        self.assertEqual(batch.schema.field("id").type, pa.int64())
+        self.assertEqual(batch.column(batch.schema.get_field_index("id")).to_pylist(), [2, 1])
+        self.assertTrue(pa.types.is_dictionary(batch.schema.field("author_username").type))
+        self.assertEqual(
+            batch.column(batch.schema.get_field_index("timestamp"))[0].as_py(),
+            datetime(2023, 1, 1, 12, tzinfo=timezone.utc)
+        )
+        self.assertEqual(
+            batch.column(batch.schema.get_field_index("attachments"))[0].as_py(),
+            [{"id": 5, "filename": "a.png", "url": "https://x", "size": 10}]
+        )
+
+    def test_malformed_fields_become_null(self):
+        """Test that missing or malformed fields are stored as nulls."""
+        table = MessageTable()
+        table.append({"id": "1", "timestamp": "not a date", "author": {}})
+
+        row = pa.Table.from_batches([table.to_record_batch()]).to_pylist()[0]
+
+        self.assertIsNone(row["timestamp"])
+        self.assertIsNone(row["author_id"])
+        self.assertEqual(row["attachments"], [])
+
+    def test_clear(self):
+        """Test that clearing empties every column."""
+        table = MessageTable()
+        table.append(_message(1))
+        table.clear()
+        self.assertEqual(len(table), 0)
+
+
+@unittest.skipUnless(PYARROW_AVAILABLE, "pyarrow is not installed")
+class TestParquetMessageWriter(unittest.TestCase):
+    """Test cases for writing Parquet files."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "messages.parquet")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_row_groups(self):
+        """Test that a row group is flushed every row_group_size messages."""
+        messages = (_message(i) for i in range(25, 0, -1))
+
+        count = write_parquet(messages, self.path, row_group_size=10)
+
+        self.assertEqual(count, 25)
+        parquet_file = pq.ParquetFile(self.path)
+        self.assertEqual(parquet_file.metadata.num_row_groups, 3)
+        self.assertEqual(parquet_file.read().column("id").to_pylist(), list(range(25, 0, -1)))
+
+    def test_empty_file_has_schema(self):
+        """Test that a file without messages is still readable."""
+        with ParquetMessageWriter(self.path) as writer:
+            writer.write([])
+
+        table = pq.read_table(self.path)
+        self.assertEqual(table.num_rows, 0)
+        self.assertIn("author_username", table.schema.names)
+
+    def test_creates_missing_directory(self):
+        """Test that the directory of the file is created if it does not exist."""
+        path = os.path.join(self.temp_dir, "new_dir", "messages.parquet")
+
+        self.assertEqual(write_parquet([_message(1)], path), 1)
+        self.assertEqual(pq.read_table(path).column("id").to_pylist(), [1])
+
+    def test_no_messages_keeps_existing_file(self):
+        """Test that writing no messages leaves an existing file and no temporary file behind."""
+        write_parquet([_message(1)], self.path)
+
+        count = write_parquet([], self.path)
+
+        self.assertEqual(count, 0)
+        self.assertEqual(pq.read_table(self.path).column("id").to_pylist(), [1])
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), [os.path.basename(self.path)])
+
+    def test_failed_write_keeps_existing_file(self):
+        """Test that an error while writing discards the new file."""
+        write_parquet([_message(1)], self.path)
+
+        def failing():
+            yield _message(2)
+            raise ConnectionError("Connection reset")
+
+        with self.assertRaises(ConnectionError):
+            write_parquet(failing(), self.path)
+
+        self.assertEqual(pq.read_table(self.path).column("id").to_pylist(), [1])
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), [os.path.basename(self.path)])
+
+
+if __name__ == "__main__":
+    unittest.main()
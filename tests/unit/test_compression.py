@@ -0,0 +1,75 @@
+"""Unit tests for the compression module."""
+
+import gzip
+import io
+import unittest
+
+from discord_messages_dump.compression import (
+    ZSTANDARD_AVAILABLE,
+    compress_stream,
+    compression_for_path,
+    with_compression_extension
+)
+
+if ZSTANDARD_AVAILABLE:
+    import zstandard
+
+
+class TestCompressionPaths(unittest.TestCase):
+    """Test cases for selecting compression by file extension."""
+
+    def test_compression_for_path(self):
+        """Test detecting the compression from the extension."""
+        self.assertEqual(compression_for_path("messages.txt.gz"), "gzip")
+        self.assertEqual(compression_for_path("MESSAGES.JSONL.ZST"), "zstd")
+        self.assertIsNone(compression_for_path("messages.txt"))
+
+    def test_with_compression_extension(self):
+        """Test that the extension is appended only when missing."""
+        self.assertEqual(with_compression_extension("messages.txt", "gzip"), "messages.txt.gz")
+        self.assertEqual(with_compression_extension("messages.txt.zst", "zstd"), "messages.txt.zst")
+        with self.assertRaises(ValueError):
+            with_compression_extension("messages.txt", "bzip2")
+
+
+class TestCompressStream(unittest.TestCase):
+    """Test cases for wrapping output files in compressors."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.chunks = [f"[2023-01-01] user: message {i}\n".encode("utf-8") for i in range(1000)]
+        self.data = b"".join(self.chunks)
+
+    def _write(self, path, **kwargs):
+        raw = io.BytesIO()
+        stream = compress_stream(raw, path, **kwargs)
+        for chunk in self.chunks:
+            stream.write(chunk)
+        if stream is not raw:
+            stream.close()
+        # The underlying file stays open for the caller
+        self.assertFalse(raw.closed)
+        return raw.getvalue()
+
+    def test_plain(self):
+        """Test that paths without a compression extension get the file itself."""
+        raw = io.BytesIO()
+        self.assertIs(compress_stream(raw, "messages.txt"), raw)
+
+    def test_gzip(self):
+        """Test that .gz paths are compressed incrementally with gzip."""
+        compressed = self._write("messages.txt.gz", level=9)
+        self.assertEqual(gzip.decompress(compressed), self.data)
+        self.assertLess(len(compressed), len(self.data) // 4)
+
+    @unittest.skipUnless(ZSTANDARD_AVAILABLE, "zstandard is not installed")
+    def test_zstd(self):
+        """Test that .zst paths are compressed with zstd, optionally on worker threads."""
+        for threads in (0, 2):
+            with self.subTest(threads=threads):
+                compressed = self._write("messages.txt.zst", level=10, threads=threads)
+                reader = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(compressed))
+                self.assertEqual(reader.read(), self.data)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,9 @@
 """Unit tests for the FileHandler class."""
 
+import gzip
 import os
+import shutil
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 
@@ -20,6 +23,7 @@ class TestFileHandler(unittest.TestCase):
         """Test getting file extensions for different format types."""
         self.assertEqual(self.file_handler.get_file_extension("text"), ".txt")
         self.assertEqual(self.file_handler.get_file_extension("json"), ".json")
+        self.assertEqual(self.file_handler.get_file_extension("jsonl"), ".jsonl")
         self.assertEqual(self.file_handler.get_file_extension("csv"), ".csv")
         self.assertEqual(self.file_handler.get_file_extension("markdown"), ".md")
         # Test default case
@@ -105,20 +109,37 @@ class TestFileHandler(unittest.TestCase):
         # Check that the result is None (canceled)
         self.assertIsNone(result)
 
-    @patch('builtins.open', new_callable=unittest.mock.mock_open)
-    def test_save_content(self, mock_open):
+    def test_save_content(self):
         """Test saving content to a file."""
-        # Call the method
-        result = self.file_handler.save_content(self.test_content, self.test_file_path)
-        
-        # Check that the result is True (success)
-        self.assertTrue(result)
-        
-        # Check that the file was opened with the correct parameters
-        mock_open.assert_called_once_with(self.test_file_path, 'w', encoding='utf-8')
-        
-        # Check that the content was written to the file
-        mock_open().write.assert_called_once_with(self.test_content)
+        temp_dir = tempfile.mkdtemp()
+        try:
+            file_path = os.path.join(temp_dir, self.test_file_path)
+
+            # Call the method
+            result = self.file_handler.save_content(self.test_content, file_path)
+
+            # Check that the result is True (success)
+            self.assertTrue(result)
+
+            # Check that the content was written and no temporary file is left
+            with open(file_path, 'r', encoding='utf-8') as f:
+                self.assertEqual(f.read(), self.test_content)
+            self.assertEqual(os.listdir(temp_dir), [self.test_file_path])
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_save_content_compressed(self):
+        """Test that a .gz file name saves gzip-compressed content."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            file_path = os.path.join(temp_dir, "messages.txt.gz")
+
+            self.assertTrue(self.file_handler.save_content(self.test_content, file_path, level=1))
+
+            with gzip.open(file_path, 'rt', encoding='utf-8') as f:
+                self.assertEqual(f.read(), self.test_content)
+        finally:
+            shutil.rmtree(temp_dir)
 
     @patch('builtins.open')
     @patch('tkinter.messagebox.showerror')
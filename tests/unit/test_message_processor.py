@@ -3,14 +3,18 @@
 import json
 import unittest
 from typing import Any, Dict, List
+from unittest.mock import patch
 
 from discord_messages_dump.message_processor import (
+    FORMATTERS,
     CsvFormatter,
     JsonFormatter,
+    JsonLinesFormatter,
     MarkdownFormatter,
     MessageProcessor,
     MessageProcessingError,
-    TextFormatter
+    TextFormatter,
+    get_formatter
 )
 
 
@@ -128,6 +132,25 @@ class TestJsonFormatter(unittest.TestCase):
             formatter.format(malformed_messages)
 
 
+class TestJsonLinesFormatter(unittest.TestCase):
+    """Test cases for the JsonLinesFormatter class."""
+
+    def test_format_one_object_per_line(self):
+        """Test that each message is written as one compact JSON line."""
+        messages = [{"id": "2", "content": "Line one\nLine two"}, {"id": "1"}]
+        formatted = JsonLinesFormatter().format(messages)
+
+        lines = formatted.splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual([json.loads(line) for line in lines], messages)
+        self.assertEqual(lines[1], '{"id":"1"}')
+        self.assertTrue(formatted.endswith("\n"))
+
+    def test_format_empty(self):
+        """Test that no messages produce an empty file."""
+        self.assertEqual(JsonLinesFormatter().format([]), "")
+
+
 class TestCsvFormatter(unittest.TestCase):
     """Test cases for the CsvFormatter class."""
 
@@ -160,5 +183,129 @@ class TestMarkdownFormatter(unittest.TestCase):
         self.assertIn("unknown_time", formatted)
 
 
+
+class TestFormatStream(unittest.TestCase):
+    """Test cases for streaming formatting."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.messages = [
+            {
+                "id": "2",
+                "channel_id": "987654321098765432",
+                "author": {"id": "1", "username": "test_user1"},
+                "content": "Line one\nLine two, with \"quotes\"",
+                "timestamp": "2023-01-01T12:01:00.000000+00:00",
+                "embeds": [{"fields": []}]
+            },
+            {
+                "id": "1",
+                "author": {"id": "2", "username": "test_user2"},
+                "timestamp": "2023-01-01T12:00:00.000000+00:00"
+            }
+        ]
+        self.formatters = [TextFormatter, JsonFormatter, JsonLinesFormatter, CsvFormatter, MarkdownFormatter]
+
+    def test_stream_matches_format(self):
+        """Test that the joined stream is identical to format for every formatter."""
+        for formatter_class in self.formatters:
+            with self.subTest(formatter=formatter_class.__name__):
+                expected = formatter_class().format(self.messages)
+                streamed = "".join(formatter_class().format_stream(iter(self.messages)))
+                self.assertEqual(streamed, expected)
+
+    def test_stream_matches_format_when_empty(self):
+        """Test that streaming no messages matches formatting an empty list."""
+        for formatter_class in self.formatters:
+            with self.subTest(formatter=formatter_class.__name__):
+                self.assertEqual(
+                    "".join(formatter_class().format_stream(iter([]))),
+                    formatter_class().format([])
+                )
+
+    def test_json_stream_matches_json_dumps(self):
+        """Test that the JSON stream is byte-identical to json.dumps with indent=2."""
+        streamed = "".join(JsonFormatter().format_stream(iter(self.messages)))
+        self.assertEqual(streamed, json.dumps(self.messages, indent=2))
+        self.assertEqual("".join(JsonFormatter().format_stream(iter([]))), "[]")
+
+    def test_stream_in_parts(self):
+        """Test that output produced page by page matches a single call."""
+        for formatter_class in self.formatters:
+            with self.subTest(formatter=formatter_class.__name__):
+                formatter = formatter_class()
+                parts = "".join(formatter.format_stream([], final=False))
+                parts += "".join(formatter.format_stream(self.messages[:1], final=False))
+                parts += "".join(formatter.format_stream(self.messages[1:], start_index=1, final=False))
+                parts += "".join(formatter.format_stream([], start_index=2))
+                self.assertEqual(parts, formatter_class().format(self.messages))
+
+    def test_stream_is_lazy(self):
+        """Test that messages are consumed only as chunks are requested."""
+        consumed = []
+
+        def source():
+            for message in self.messages:
+                consumed.append(message["id"])
+                yield message
+
+        chunks = TextFormatter().format_stream(source())
+        next(chunks)
+        self.assertEqual(consumed, ["2"])
+
+    def test_processor_format_stream(self):
+        """Test streaming through the MessageProcessor."""
+        processor = MessageProcessor(self.messages)
+        self.assertEqual("".join(processor.format_stream("csv")), processor.format_csv())
+
+    def test_get_formatter(self):
+        """Test looking up formatters by format type."""
+        self.assertIsInstance(get_formatter("Markdown"), MarkdownFormatter)
+        with self.assertRaises(ValueError):
+            get_formatter("xml")
+
+
+
+class TestFormatParallel(unittest.TestCase):
+    """Test cases for chunked formatting across a process pool."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.messages = [
+            {
+                "id": str(i),
+                "channel_id": "987654321098765432",
+                "author": {"id": str(i % 3), "username": f"user{i % 3}"},
+                "content": f"Message {i}, with \"quotes\"\nand a second line",
+                "timestamp": "2023-01-01T12:00:00.000000+00:00"
+            }
+            for i in range(23, 0, -1)
+        ]
+        self.processor = MessageProcessor(self.messages)
+
+    def test_matches_serial_output(self):
+        """Test that chunked output is byte-identical to serial formatting."""
+        for format_type in FORMATTERS:
+            with self.subTest(format_type=format_type):
+                self.assertEqual(
+                    self.processor.format_parallel(format_type, workers=2, chunk_size=5),
+                    get_formatter(format_type).format(self.messages)
+                )
+
+    def test_single_chunk_and_empty(self):
+        """Test that small and empty inputs are formatted without a pool."""
+        with patch('discord_messages_dump.message_processor.ProcessPoolExecutor') as mock_executor:
+            self.assertEqual(self.processor.format_parallel("csv"), self.processor.format_csv())
+            self.assertEqual(MessageProcessor([]).format_parallel("json", chunk_size=1), "[]")
+        mock_executor.assert_not_called()
+
+    def test_invalid_arguments(self):
+        """Test that an unknown format or chunk size raises ValueError."""
+        with self.assertRaises(ValueError):
+            self.processor.format_parallel("xml")
+        with self.assertRaises(ValueError):
+            self.processor.format_parallel("text", chunk_size=0)
+
+
 if __name__ == "__main__":
     unittest.main()
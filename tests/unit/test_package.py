@@ -0,0 +1,54 @@
+"""Unit tests for the package's lazy imports."""
+
+import json
+import subprocess
+import sys
+import unittest
+
+import discord_messages_dump
+
+
+def _loaded_modules(statement):
+    """Run a statement in a fresh interpreter and return the modules it loaded."""
+    output = subprocess.check_output(
+        [sys.executable, "-c", f"import json, sys\n{statement}\nprint(json.dumps(sorted(sys.modules)))"]
+    )
+    return set(json.loads(output))
+
+
+class TestLazyImports(unittest.TestCase):
+    """Test cases for importing the package without its heavy dependencies."""
+
+    def test_package_import_is_lazy(self):
+        """Test that importing the package loads none of its submodules."""
+        modules = _loaded_modules("import discord_messages_dump")
+
+        self.assertNotIn("discord_messages_dump.api", modules)
+        self.assertNotIn("discord_messages_dump.cli", modules)
+
+    def test_headless_paths_skip_gui_and_cli_modules(self):
+        """Test that the API and processor paths never load tkinter or the CLI's dependencies."""
+        modules = _loaded_modules(
+            "from discord_messages_dump import DiscordApiClient, MessageProcessor, FileHandler"
+        )
+
+        for module in ("tkinter", "aiohttp", "tqdm", "dotenv", "click", "pyarrow"):
+            self.assertNotIn(module, modules)
+
+    def test_public_names_resolve(self):
+        """Test that the public names load on first access."""
+        from discord_messages_dump.api import DiscordApiClient
+        from discord_messages_dump.cli import main
+
+        self.assertIs(discord_messages_dump.DiscordApiClient, DiscordApiClient)
+        self.assertIs(discord_messages_dump.cli_main, main)
+        self.assertIn("MessageProcessor", dir(discord_messages_dump))
+
+    def test_unknown_name(self):
+        """Test that an unknown attribute raises AttributeError."""
+        with self.assertRaises(AttributeError):
+            discord_messages_dump.missing_name
+
+
+if __name__ == "__main__":
+    unittest.main()
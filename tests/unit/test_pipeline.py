@@ -0,0 +1,140 @@
+"""Unit tests for the pipeline module."""
+
+import threading
+import time
+import unittest
+
+from discord_messages_dump.pipeline import Pipeline
+
+
+class TestPipeline(unittest.TestCase):
+    """Test cases for the Pipeline class."""
+
+    def test_stages_applied_in_order(self):
+        """Test that every item passes through all stages in source order."""
+        pipeline = Pipeline(range(50), queue_size=2).add_stage(lambda x: x * 2).add_stage(str)
+        self.assertEqual(list(pipeline), [str(x * 2) for x in range(50)])
+
+    def test_without_stages(self):
+        """Test that a pipeline without stages yields the source items."""
+        self.assertEqual(list(Pipeline(iter([1, 2, 3]))), [1, 2, 3])
+        self.assertEqual(list(Pipeline([])), [])
+
+    def test_stages_run_on_other_threads(self):
+        """Test that the source and stages run off the calling thread."""
+        threads = []
+
+        def record(item):
+            threads.append(threading.current_thread())
+            return item
+
+        list(Pipeline([1]).add_stage(record))
+        self.assertIsNot(threads[0], threading.current_thread())
+
+    def test_stages_overlap(self):
+        """Test that the total time approaches the slowest stage rather than the sum."""
+        def slow_source():
+            for item in range(8):
+                time.sleep(0.05)
+                yield item
+
+        def slow_stage(item):
+            time.sleep(0.05)
+            return item
+
+        start = time.monotonic()
+        self.assertEqual(list(Pipeline(slow_source()).add_stage(slow_stage)), list(range(8)))
+        # Serial processing would take 0.8 seconds
+        self.assertLess(time.monotonic() - start, 0.7)
+
+    def test_backpressure(self):
+        """Test that a slow consumer blocks the source once the queues are full."""
+        produced = []
+
+        def source():
+            for item in range(100):
+                produced.append(item)
+                yield item
+
+        iterator = iter(Pipeline(source(), queue_size=2).add_stage(lambda x: x))
+        next(iterator)
+        time.sleep(0.2)
+
+        # Two queues of two items, one item in each thread and the one consumed
+        self.assertLessEqual(len(produced), 8)
+        iterator.close()
+
+    def test_stage_error_is_raised(self):
+        """Test that an exception in a stage is re-raised to the caller."""
+        def fail_on_three(item):
+            if item == 3:
+                raise ValueError("bad item")
+            return item
+
+        results = []
+        with self.assertRaises(ValueError):
+            for item in Pipeline(range(10)).add_stage(fail_on_three):
+                results.append(item)
+        self.assertEqual(results, [0, 1, 2])
+
+    def test_source_error_is_raised(self):
+        """Test that an exception in the source is re-raised to the caller."""
+        def source():
+            yield 1
+            raise ConnectionError("network down")
+
+        with self.assertRaises(ConnectionError):
+            list(Pipeline(source()).add_stage(lambda x: x))
+
+    def test_source_base_exception_is_raised(self):
+        """Test that an exception outside Exception, e.g. KeyboardInterrupt, still ends the pipeline."""
+        def source():
+            yield 1
+            raise KeyboardInterrupt
+
+        results = []
+        with self.assertRaises(KeyboardInterrupt):
+            for item in Pipeline(source()).add_stage(lambda x: x):
+                results.append(item)
+        self.assertEqual(results, [1])
+
+    def test_failing_close_ends_pipeline(self):
+        """Test that an error closing the source is raised and the pipeline still ends."""
+        class Source:
+            def __iter__(self):
+                return self
+
+            def __next__(self):
+                raise StopIteration
+
+            def close(self):
+                raise RuntimeError("close failed")
+
+        with self.assertRaises(RuntimeError):
+            list(Pipeline(Source()).add_stage(lambda x: x))
+
+    def test_early_exit_stops_source(self):
+        """Test that leaving the iteration early closes the source generator."""
+        closed = threading.Event()
+
+        def source():
+            try:
+                for item in range(1000):
+                    yield item
+            finally:
+                closed.set()
+
+        for item in Pipeline(source(), queue_size=1):
+            if item == 2:
+                break
+
+        self.assertTrue(closed.is_set())
+
+    def test_invalid_queue_size(self):
+        """Test that the queue size must be positive."""
+        with self.assertRaises(ValueError):
+            Pipeline([], queue_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
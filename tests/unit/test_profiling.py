@@ -0,0 +1,72 @@
+"""Unit tests for the profiling module."""
+
+import os
+import pstats
+import shutil
+import tempfile
+import tracemalloc
+import unittest
+
+from discord_messages_dump.profiling import ProfileSession
+
+
+def _busy_work():
+    return sorted(str(i) for i in range(20000))
+
+
+class TestProfileSession(unittest.TestCase):
+    """Test cases for the ProfileSession class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.profile_file = os.path.join(self.temp_dir, "dump.pstats")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_profile_written(self):
+        """Test that the profile is written as a pstats file covering the run."""
+        with self.assertLogs("discord-dump.profiling", level="INFO") as logs:
+            with ProfileSession(self.profile_file):
+                _busy_work()
+
+        stats = pstats.Stats(self.profile_file)
+        functions = {function for _, _, function in stats.stats}
+        self.assertIn("_busy_work", functions)
+        self.assertIn("Profile written to", logs.output[0])
+
+    def test_profile_written_on_exit(self):
+        """Test that the profile is written when the run exits early."""
+        with self.assertRaises(SystemExit):
+            with ProfileSession(self.profile_file):
+                raise SystemExit(1)
+
+        self.assertTrue(os.path.exists(self.profile_file))
+
+    def test_trace_malloc_phases(self):
+        """Test that each phase reports the memory allocated during it."""
+        with self.assertLogs("discord-dump.profiling", level="INFO") as logs:
+            with ProfileSession(trace_malloc=True, top=3) as session:
+                data = _busy_work()
+                session.phase("fetched")
+                self.assertTrue(tracemalloc.is_tracing())
+
+        self.assertEqual(len(data), 20000)
+        self.assertEqual([label for label, _, _ in session.phases], ["fetched"])
+        self.assertIn("Memory after fetched", logs.output[0])
+        self.assertIn("test_profiling.py", logs.output[0])
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_disabled_session(self):
+        """Test that a session without profiling or tracing does nothing."""
+        with ProfileSession() as session:
+            session.phase("fetched")
+
+        self.assertEqual(session.phases, [])
+        self.assertFalse(tracemalloc.is_tracing())
+
+
+if __name__ == "__main__":
+    unittest.main()
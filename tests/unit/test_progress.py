@@ -0,0 +1,98 @@
+"""Unit tests for the progress module."""
+
+import unittest
+from datetime import datetime, timezone
+
+from discord_messages_dump.progress import HistoryProgress, format_duration
+from discord_messages_dump.snowflake import datetime_to_snowflake
+
+
+def _page(*days):
+    """Build a page of messages created on the given days of January 2024, newest first."""
+    return [{"id": str(datetime_to_snowflake(datetime(2024, 1, day, tzinfo=timezone.utc)))} for day in days]
+
+
+class FakeClock:
+    """Clock stand-in advanced by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestHistoryProgress(unittest.TestCase):
+    """Test cases for the HistoryProgress class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+        # A channel created on January 1st, dumped up to January 21st
+        self.channel_id = str(datetime_to_snowflake(datetime(2024, 1, 1, tzinfo=timezone.utc)))
+        self.until = datetime(2024, 1, 21, tzinfo=timezone.utc)
+
+    def test_fraction_follows_oldest_message(self):
+        """Test that the share covered is measured from the newest end to the channel's creation."""
+        progress = HistoryProgress(self.channel_id, until=self.until, clock=self.clock)
+        self.assertEqual(progress.fraction, 0.0)
+
+        progress.update(_page(20, 19, 16))
+        self.assertAlmostEqual(progress.fraction, 0.25)
+
+        progress.finish()
+        self.assertEqual(progress.fraction, 1.0)
+
+    def test_since_bounds_the_window(self):
+        """Test that --since replaces the channel's creation as the oldest end."""
+        progress = HistoryProgress(
+            self.channel_id, since=datetime(2024, 1, 11), until=self.until, clock=self.clock
+        )
+        progress.update(_page(16))
+        self.assertAlmostEqual(progress.fraction, 0.5)
+
+    def test_rates_and_eta(self):
+        """Test the throughput and the extrapolated remaining time."""
+        progress = HistoryProgress(self.channel_id, until=self.until, clock=self.clock)
+        self.assertIsNone(progress.eta)
+
+        self.clock.now = 10.0
+        progress.update(_page(20, 19, 18, 17, 16))
+
+        self.assertEqual(progress.messages_per_second, 0.5)
+        self.assertEqual(progress.pages_per_second, 0.1)
+        self.assertAlmostEqual(progress.eta, 30.0)
+        self.assertEqual(progress.describe(), "5 msgs, 0.5 msg/s, 0.10 pages/s, ETA 0:30")
+
+    def test_resume_estimates_from_own_pace(self):
+        """Test that a resumed walk starts at its cursor and extrapolates only the new progress."""
+        before = _page(11)[0]["id"]
+        progress = HistoryProgress(self.channel_id, until=self.until, before=before, messages=50, clock=self.clock)
+        self.assertAlmostEqual(progress.fraction, 0.5)
+
+        self.clock.now = 10.0
+        progress.update(_page(10, 9, 8, 7, 6))
+
+        self.assertEqual(progress.messages, 55)
+        self.assertEqual(progress.messages_per_second, 0.5)
+        self.assertAlmostEqual(progress.eta, 10.0)
+
+    def test_unordered_pages(self):
+        """Test that pages of parallel slices are counted without an estimate."""
+        progress = HistoryProgress(self.channel_id, until=self.until, ordered=False, clock=self.clock)
+        self.clock.now = 2.0
+        progress.update(_page(3, 2))
+        progress.finish()
+
+        self.assertIsNone(progress.fraction)
+        self.assertIsNone(progress.eta)
+        self.assertEqual(progress.describe(), "2 msgs, 1.0 msg/s, 0.50 pages/s")
+
+    def test_format_duration(self):
+        """Test formatting durations."""
+        self.assertEqual(format_duration(59.6), "1:00")
+        self.assertEqual(format_duration(3723), "1:02:03")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""Unit tests for the RateLimiter class."""
+
+import unittest
+from unittest.mock import patch
+
+from discord_messages_dump.rate_limiter import RateLimiter
+
+
+ROUTE = "GET /channels/{channel_id}/messages"
+
+
+class FakeClock:
+    """Manually advanced clock for deterministic tests."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test cases for the RateLimiter class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+        self.limiter = RateLimiter(clock=self.clock)
+
+    def test_unknown_route_is_not_delayed(self):
+        """Test that a route without recorded limits can be requested immediately."""
+        self.assertEqual(self.limiter.reserve(ROUTE, "1"), 0.0)
+
+    def test_waits_for_exhausted_bucket(self):
+        """Test that an exhausted bucket delays the next request until it resets."""
+        self.limiter.update(ROUTE, {
+            "X-RateLimit-Bucket": "abc",
+            "X-RateLimit-Limit": "5",
+            "X-RateLimit-Remaining": "1",
+            "X-RateLimit-Reset-After": "2.5"
+        }, "1")
+
+        # One request left in the window
+        self.assertEqual(self.limiter.reserve(ROUTE, "1"), 0.0)
+        self.assertAlmostEqual(self.limiter.reserve(ROUTE, "1"), 2.5)
+
+        # Once the window resets the bucket is refilled
+        self.clock.now += 2.5
+        self.assertEqual(self.limiter.reserve(ROUTE, "1"), 0.0)
+
+    def test_buckets_are_split_by_major_parameter(self):
+        """Test that an exhausted channel does not delay other channels."""
+        self.limiter.update(ROUTE, {
+            "X-RateLimit-Bucket": "abc",
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset-After": "1.0"
+        }, "1")
+
+        self.assertAlmostEqual(self.limiter.reserve(ROUTE, "1"), 1.0)
+        self.assertEqual(self.limiter.reserve(ROUTE, "2"), 0.0)
+
+    def test_global_window(self):
+        """Test that the sliding global window caps requests per period."""
+        limiter = RateLimiter(global_limit=2, global_period=1.0, clock=self.clock)
+        self.assertEqual(limiter.reserve(ROUTE, "1"), 0.0)
+        self.assertEqual(limiter.reserve(ROUTE, "2"), 0.0)
+        self.assertAlmostEqual(limiter.reserve(ROUTE, "3"), 1.0)
+
+        self.clock.now += 1.0
+        self.assertEqual(limiter.reserve(ROUTE, "3"), 0.0)
+
+    def test_on_rate_limited_blocks_bucket(self):
+        """Test that a 429 blocks the bucket for the reported time."""
+        retry_after = self.limiter.on_rate_limited(ROUTE, {"X-RateLimit-Reset-After": "3.0"}, "1")
+        self.assertEqual(retry_after, 3.0)
+        self.assertAlmostEqual(self.limiter.reserve(ROUTE, "1"), 3.0)
+
+        self.limiter.clear(ROUTE, "1")
+        self.assertEqual(self.limiter.reserve(ROUTE, "1"), 0.0)
+
+    def test_on_rate_limited_global(self):
+        """Test that a global 429 blocks every route."""
+        self.limiter.on_rate_limited(ROUTE, {"Retry-After": "4", "X-RateLimit-Global": "true"}, "1")
+        self.assertAlmostEqual(self.limiter.reserve(ROUTE, "2"), 4.0)
+        self.assertAlmostEqual(self.limiter.reserve("GET /users/@me", ""), 4.0)
+
+    def test_on_rate_limited_default(self):
+        """Test the default wait time when the 429 has no reset headers."""
+        self.assertEqual(self.limiter.on_rate_limited(ROUTE, {}, "1"), 5.0)
+
+    @patch('time.sleep')
+    def test_acquire_sleeps_until_slot_is_free(self, mock_sleep):
+        """Test that acquire sleeps for the reported delay and then reserves a slot."""
+        self.limiter.update(ROUTE, {
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset-After": "1.5"
+        }, "1")
+
+        def advance(seconds):
+            self.clock.now += seconds
+
+        mock_sleep.side_effect = advance
+
+        waited = self.limiter.acquire(ROUTE, "1")
+
+        self.assertAlmostEqual(waited, 1.5)
+        mock_sleep.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+"""Unit tests for the records module."""
+
+import unittest
+
+from discord_messages_dump.message_processor import get_formatter
+from discord_messages_dump.records import (
+    AuthorRecord,
+    FieldProjection,
+    MessageRecord,
+    RecordFactory,
+    fields_for_format
+)
+
+
+def _message(message_id, username="user"):
+    return {
+        "id": str(message_id),
+        "channel_id": "987654321098765432",
+        "author": {"id": "123456789012345678", "username": username, "avatar": "abcdef"},
+        "content": f"Message {message_id}",
+        "timestamp": "2023-01-01T12:00:00.000000+00:00",
+        "edited_timestamp": None,
+        "attachments": [],
+        "embeds": []
+    }
+
+
+class TestRecordFactory(unittest.TestCase):
+    """Test cases for the RecordFactory class."""
+
+    def test_keeps_only_requested_fields(self):
+        """Test that records hold the requested fields and the message ID."""
+        factory = RecordFactory({"content", "author.username"})
+
+        record = factory.build(_message(1))
+
+        self.assertEqual(record.to_dict(), {"id": "1", "content": "Message 1", "author": {"username": "user"}})
+        self.assertFalse(hasattr(record, "__dict__"))
+
+    def test_authors_are_shared(self):
+        """Test that messages by the same author share one author record."""
+        factory = RecordFactory({"author.id", "author.username"})
+
+        first, second, other = factory.build_page([_message(1), _message(2), _message(3, username="other")])
+
+        self.assertIsInstance(first.author, AuthorRecord)
+        self.assertIs(first.author, second.author)
+        self.assertIsNot(first.author, other.author)
+
+    def test_unsupported_field(self):
+        """Test that fields a record cannot hold raise ValueError."""
+        with self.assertRaises(ValueError):
+            RecordFactory({"content", "embeds"})
+
+
+class TestMessageRecord(unittest.TestCase):
+    """Test cases for the dict-like access of records."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.record = RecordFactory({"timestamp", "content"}).build(_message(1))
+
+    def test_get_and_getitem(self):
+        """Test that missing fields behave like missing dict keys."""
+        self.assertEqual(self.record.get("content"), "Message 1")
+        self.assertEqual(self.record["id"], "1")
+        self.assertEqual(self.record.get("channel_id", "unknown"), "unknown")
+        self.assertEqual(self.record.get("embeds", []), [])
+        with self.assertRaises(KeyError):
+            self.record["author"]
+
+    def test_contains_and_keys(self):
+        """Test membership and key listing."""
+        self.assertIn("timestamp", self.record)
+        self.assertNotIn("author", self.record)
+        self.assertEqual(set(self.record.keys()), {"id", "timestamp", "content"})
+
+    def test_empty_record(self):
+        """Test that a record without fields is empty."""
+        self.assertEqual(MessageRecord().to_dict(), {})
+
+
+class TestRecordFormatting(unittest.TestCase):
+    """Test that formatters produce the same output for records and dicts."""
+
+    def test_formats_match_full_messages(self):
+        """Test every format that supports compact records."""
+        messages = [_message(2), _message(1, username="other")]
+        for format_type in ("text", "csv", "markdown"):
+            with self.subTest(format_type=format_type):
+                records = RecordFactory(fields_for_format(format_type)).build_page(messages)
+                self.assertEqual(
+                    get_formatter(format_type).format(records),
+                    get_formatter(format_type).format(messages)
+                )
+
+    def test_full_message_formats(self):
+        """Test that formats needing the full message have no field set."""
+        self.assertIsNone(fields_for_format("json"))
+        self.assertIsNone(fields_for_format("jsonl"))
+        self.assertEqual(fields_for_format("TEXT"), fields_for_format("text"))
+
+
+
+class TestFieldProjection(unittest.TestCase):
+    """Test cases for the FieldProjection class."""
+
+    def test_drops_unlisted_fields(self):
+        """Test that only the listed fields and the message ID are kept."""
+        message = dict(_message(1), embeds=[{"title": "Big embed"}], member={"roles": ["1"]})
+        projection = FieldProjection({"timestamp", "author.username", "content"})
+
+        projected = projection.apply(message)
+
+        self.assertEqual(projected, {
+            "id": "1",
+            "timestamp": "2023-01-01T12:00:00.000000+00:00",
+            "author": {"username": "user"},
+            "content": "Message 1"
+        })
+        self.assertIn("embeds", message)
+
+    def test_paths_through_lists(self):
+        """Test that a path through a list applies to each element."""
+        message = {"id": "1", "attachments": [{"url": "https://x", "size": 10}, {"url": "https://y"}]}
+        projection = FieldProjection({"attachments.url"})
+
+        self.assertEqual(
+            projection.apply(message),
+            {"id": "1", "attachments": [{"url": "https://x"}, {"url": "https://y"}]}
+        )
+
+    def test_whole_field_wins_over_subfields(self):
+        """Test that listing a field and one of its subfields keeps the whole field."""
+        projection = FieldProjection({"author.id", "author"})
+        self.assertEqual(projection.apply(_message(1))["author"], _message(1)["author"])
+
+    def test_missing_and_null_fields(self):
+        """Test that missing fields stay missing and null parents stay null."""
+        projection = FieldProjection({"content", "referenced_message.id"})
+        self.assertEqual(
+            projection.apply_page([{"id": "1", "referenced_message": None}]),
+            [{"id": "1", "referenced_message": None}]
+        )
+
+    def test_invalid_field(self):
+        """Test that empty path segments raise ValueError."""
+        with self.assertRaises(ValueError):
+            FieldProjection({"author..id"})
+
+
+if __name__ == "__main__":
+    unittest.main()
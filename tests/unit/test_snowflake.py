@@ -0,0 +1,89 @@
+"""Unit tests for the snowflake module."""
+
+import unittest
+from datetime import datetime, timezone
+
+from discord_messages_dump.snowflake import (
+    DISCORD_EPOCH,
+    datetime_to_snowflake,
+    partition_range,
+    snowflake_to_datetime,
+    snowflake_to_timestamp,
+    timestamp_to_snowflake,
+    window_cursors,
+)
+
+
+class TestSnowflake(unittest.TestCase):
+    """Test cases for the snowflake helpers."""
+
+    def test_snowflake_to_timestamp(self):
+        """Test decoding the timestamp of a known snowflake."""
+        # Example snowflake from the Discord API documentation
+        self.assertEqual(snowflake_to_timestamp("175928847299117063"), 1462015105.796)
+
+    def test_timestamp_round_trip(self):
+        """Test that a synthetic snowflake decodes to its timestamp."""
+        snowflake = timestamp_to_snowflake(1462015105.796)
+        self.assertEqual(snowflake_to_timestamp(snowflake), 1462015105.796)
+        self.assertLessEqual(snowflake, 175928847299117063)
+
+    def test_timestamp_before_epoch_is_clamped(self):
+        """Test that times before the Discord epoch map to zero."""
+        self.assertEqual(timestamp_to_snowflake(DISCORD_EPOCH / 1000 - 60), 0)
+
+    def test_datetime_conversion(self):
+        """Test converting between datetimes and snowflakes."""
+        value = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        snowflake = datetime_to_snowflake(value)
+        self.assertEqual(snowflake_to_datetime(snowflake), value)
+
+    def test_naive_datetime_is_utc(self):
+        """Test that naive datetimes are taken to be UTC."""
+        self.assertEqual(
+            datetime_to_snowflake(datetime(2020, 1, 1)),
+            datetime_to_snowflake(datetime(2020, 1, 1, tzinfo=timezone.utc))
+        )
+
+    def test_partition_range(self):
+        """Test splitting a range into equal slices."""
+        self.assertEqual(partition_range(0, 100, 4), [0, 25, 50, 75, 100])
+        self.assertEqual(partition_range(10, 13, 2), [10, 11, 13])
+
+
+class TestWindowCursors(unittest.TestCase):
+    """Test cases for converting time windows into pagination cursors."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.march = datetime(2024, 3, 1, tzinfo=timezone.utc)
+        self.april = datetime(2024, 4, 1, tzinfo=timezone.utc)
+
+    def test_window_sets_both_cursors(self):
+        """Test that since is inclusive and until is exclusive."""
+        before, after = window_cursors(None, None, self.march, self.april)
+
+        self.assertEqual(int(before), datetime_to_snowflake(self.april))
+        self.assertEqual(int(after), datetime_to_snowflake(self.march) - 1)
+
+    def test_since_alone_walks_backwards_from_now(self):
+        """Test that since alone still sets the upper cursor."""
+        before, after = window_cursors(None, None, since=self.march)
+
+        self.assertIsNotNone(before)
+        self.assertGreater(int(before), int(after))
+
+    def test_window_narrows_existing_cursors(self):
+        """Test that explicit cursors inside the window are kept."""
+        inside = str(datetime_to_snowflake(datetime(2024, 3, 15, tzinfo=timezone.utc)))
+
+        self.assertEqual(window_cursors(inside, None, until=self.april), (inside, None))
+        self.assertEqual(window_cursors(None, inside, since=self.march)[1], inside)
+
+    def test_no_window_keeps_cursors(self):
+        """Test that cursors pass through unchanged without a window."""
+        self.assertEqual(window_cursors("5", "1"), ("5", "1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+"""Unit tests for the sqlite_archive module."""
+
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timezone
+
+from discord_messages_dump.snowflake import datetime_to_snowflake
+from discord_messages_dump.sqlite_archive import SqliteArchive, write_sqlite
+
+
+def _message(message_id, username="user"):
+    return {
+        "id": str(message_id),
+        "channel_id": "987654321098765432",
+        "author": {"id": "123456789012345678", "username": username},
+        "content": f"Message {message_id}",
+        "timestamp": "2023-01-01T12:00:00.000000+00:00",
+        "pinned": False,
+        "attachments": [{"id": str(message_id * 10), "filename": "a.png", "url": "https://x", "size": 10}],
+        "reactions": [{"emoji": {"id": None, "name": "👍"}, "count": 2}]
+    }
+
+
+class TestSqliteArchive(unittest.TestCase):
+    """Test cases for the SqliteArchive class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "archive.sqlite")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_write_normalizes_messages(self):
+        """Test that messages, users, attachments and reactions go to their own tables."""
+        with SqliteArchive(self.path) as archive:
+            inserted = archive.write([_message(2), _message(1, username="renamed")])
+
+        self.assertEqual(inserted, 2)
+        connection = sqlite3.connect(self.path)
+        self.assertEqual(connection.execute("SELECT COUNT(*) FROM messages").fetchone()[0], 2)
+        self.assertEqual(connection.execute("SELECT username FROM users").fetchall(), [("renamed",)])
+        self.assertEqual(connection.execute("SELECT COUNT(*) FROM attachments").fetchone()[0], 2)
+        self.assertEqual(connection.execute("SELECT emoji, count FROM reactions").fetchall()[0], ("👍", 2))
+        raw = connection.execute("SELECT raw FROM messages WHERE id = 2").fetchone()[0]
+        self.assertEqual(json.loads(raw), _message(2))
+        connection.close()
+
+    def test_write_is_idempotent(self):
+        """Test that rewriting the same messages adds nothing."""
+        with SqliteArchive(self.path) as archive:
+            archive.write([_message(2), _message(1)])
+            inserted = archive.write([_message(3), _message(2)])
+
+            self.assertEqual(inserted, 1)
+            self.assertEqual(archive.count(), 3)
+
+    def test_wal_mode(self):
+        """Test that the database uses write-ahead logging."""
+        with SqliteArchive(self.path) as archive:
+            mode = archive.connection.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+    def test_newest_message_id(self):
+        """Test finding the newest archived message of a channel."""
+        with SqliteArchive(self.path) as archive:
+            self.assertIsNone(archive.newest_message_id("987654321098765432"))
+            archive.write([_message(5), _message(12)])
+            self.assertEqual(archive.newest_message_id("987654321098765432"), "12")
+            self.assertEqual(archive.count("987654321098765432"), 2)
+            self.assertEqual(archive.count("1"), 0)
+
+    def test_write_sqlite_batches(self):
+        """Test streaming messages into the archive in batches."""
+        count = write_sqlite((_message(i) for i in range(250, 0, -1)), self.path, batch_size=100)
+
+        self.assertEqual(count, 250)
+        with SqliteArchive(self.path) as archive:
+            self.assertEqual(archive.count(), 250)
+
+
+class TestSqliteArchiveSearch(unittest.TestCase):
+    """Test cases for full-text search over the archive."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "archive.sqlite")
+        self.march = datetime_to_snowflake(datetime(2024, 3, 10, tzinfo=timezone.utc))
+        self.april = datetime_to_snowflake(datetime(2024, 4, 10, tzinfo=timezone.utc))
+        self.messages = [
+            {"id": str(self.april), "channel_id": "1", "author": {"id": "7", "username": "alice"},
+             "content": "The deploy finished without errors", "timestamp": "2024-04-10"},
+            {"id": str(self.march), "channel_id": "1", "author": {"id": "8", "username": "bob"},
+             "content": "Is the deploy finished yet?", "timestamp": "2024-03-10"},
+            {"id": str(self.march - 1), "channel_id": "2", "author": {"id": "8", "username": "bob"},
+             "content": "Lunch anyone?", "timestamp": "2024-03-10"}
+        ]
+        self.archive = SqliteArchive(self.path)
+        self.archive.write(self.messages)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.archive.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_keyword_search(self):
+        """Test that all keywords must match and a snippet is returned."""
+        results = self.archive.search("deploy finished")
+
+        self.assertEqual({result["id"] for result in results}, {str(self.april), str(self.march)})
+        self.assertIn("[deploy]", results[0]["snippet"])
+
+    def test_phrase_search(self):
+        """Test that quoted text matches a phrase."""
+        results = self.archive.search('"finished without"')
+        self.assertEqual([result["id"] for result in results], [str(self.april)])
+
+    def test_read_only_search(self):
+        """Test that a read-only archive can be searched without modifying the file."""
+        self.archive.close()
+        self.archive = SqliteArchive(self.path)
+        self.archive.close()
+        with open(self.path, 'rb') as f:
+            before = f.read()
+
+        files = sorted(os.listdir(self.temp_dir))
+
+        with SqliteArchive(self.path, read_only=True) as archive:
+            results = archive.search("deploy", author="bob")
+            with self.assertRaises(sqlite3.OperationalError):
+                archive.write(self.messages)
+            self.assertEqual(sorted(os.listdir(self.temp_dir)), files)
+
+        self.assertEqual([result["id"] for result in results], [str(self.march)])
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), files)
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), before)
+
+    def test_read_only_sees_open_writer(self):
+        """Test that a read-only archive sees messages committed by a writer that is still open."""
+        added = {"id": str(self.april + 1), "channel_id": "1", "author": {"id": "7", "username": "alice"},
+                 "content": "Rollback started", "timestamp": "2024-04-10"}
+        self.archive.write([added])
+
+        with SqliteArchive(self.path, read_only=True) as archive:
+            results = archive.search("rollback")
+
+        self.assertEqual([result["id"] for result in results], [added["id"]])
+
+    def test_read_only_rejects_other_database(self):
+        """Test that a read-only open fails cleanly on a database without messages."""
+        other = os.path.join(self.temp_dir, "other.sqlite")
+        sqlite3.connect(other).close()
+
+        with self.assertRaises(ValueError):
+            SqliteArchive(other, read_only=True)
+
+    def test_author_and_date_filters(self):
+        """Test filtering by author, channel and time window."""
+        self.assertEqual(len(self.archive.search(author="BOB")), 2)
+        self.assertEqual(len(self.archive.search("deploy", author="bob")), 1)
+        self.assertEqual(len(self.archive.search(author="bob", channel_id="2")), 1)
+
+        results = self.archive.search(
+            "deploy", since=datetime(2024, 4, 1, tzinfo=timezone.utc), until=datetime(2024, 5, 1, tzinfo=timezone.utc)
+        )
+        self.assertEqual([result["id"] for result in results], [str(self.april)])
+
+    def test_index_rebuilt_for_existing_archive(self):
+        """Test that an archive written before the index existed is indexed on open."""
+        with self.archive.connection:
+            self.archive.connection.execute("DROP TABLE messages_fts")
+            self.archive.connection.execute("DROP TRIGGER messages_fts_insert")
+        self.archive.close()
+
+        self.archive = SqliteArchive(self.path)
+        self.assertEqual(len(self.archive.search("lunch")), 1)
+
+    def test_invalid_query(self):
+        """Test that a malformed query raises ValueError."""
+        with self.assertRaises(ValueError):
+            self.archive.search('"unterminated')
+
+
+if __name__ == "__main__":
+    unittest.main()
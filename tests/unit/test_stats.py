@@ -0,0 +1,130 @@
+"""Unit tests for the stats module."""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from discord_messages_dump.stats import DumpStats, percentile, stage_timer
+
+
+class FakeClock:
+    """Clock stand-in advanced by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPercentile(unittest.TestCase):
+    """Test cases for the percentile function."""
+
+    def test_nearest_rank(self):
+        """Test percentiles of a list of values."""
+        values = [float(i) for i in range(100, 0, -1)]
+
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 95), 95.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile([3.0], 99), 3.0)
+
+    def test_empty(self):
+        """Test that there is no percentile of no values."""
+        self.assertIsNone(percentile([], 50))
+
+
+class TestDumpStats(unittest.TestCase):
+    """Test cases for the DumpStats class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+        self.stats = DumpStats(clock=self.clock)
+
+    def test_summary(self):
+        """Test that the summary holds the stage times, counters, throughput and latencies."""
+        for latency in (0.1, 0.2, 0.3, 0.4):
+            self.stats.record_request(latency, 1000)
+            self.stats.record_page(100)
+        self.stats.add_time("rate_limit_wait", 1.5)
+        self.stats.record_write(2048)
+        with self.stats.timer("format"):
+            self.clock.now = 4.0
+
+        summary = self.stats.to_dict()
+
+        self.assertEqual(summary["elapsed"], 4.0)
+        self.assertAlmostEqual(summary["seconds"]["http"], 1.0)
+        self.assertEqual(summary["seconds"]["rate_limit_wait"], 1.5)
+        self.assertEqual(summary["seconds"]["format"], 4.0)
+        self.assertEqual(summary["requests"], 4)
+        self.assertEqual(summary["messages"], 400)
+        self.assertEqual(summary["bytes_received"], 4000)
+        self.assertEqual(summary["bytes_written"], 2048)
+        self.assertEqual(summary["messages_per_second"], 100.0)
+        self.assertEqual(summary["pages_per_second"], 1.0)
+        self.assertAlmostEqual(summary["latency_ms"]["p50"], 200.0)
+        self.assertAlmostEqual(summary["latency_ms"]["p99"], 400.0)
+
+    def test_no_requests(self):
+        """Test that latencies are missing when no request was sent."""
+        self.assertEqual(self.stats.to_dict()["latency_ms"], {"p50": None, "p95": None, "p99": None})
+
+    def test_concurrent_updates(self):
+        """Test that updates from several threads are all counted."""
+        stats = DumpStats()
+
+        def fetch():
+            for _ in range(1000):
+                stats.record_request(0.001, 10)
+                stats.record_page(1)
+
+        threads = [threading.Thread(target=fetch) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(stats.requests, 4000)
+        self.assertEqual(stats.messages, 4000)
+        self.assertEqual(len(stats.latencies), 4000)
+
+    def test_stage_timer(self):
+        """Test that the stage timer does nothing without stats."""
+        with stage_timer(None, "write"):
+            pass
+        with stage_timer(self.stats, "write"):
+            self.clock.now = 2.0
+
+        self.assertEqual(self.stats.seconds["write"], 2.0)
+
+    def test_log_summary(self):
+        """Test that the summary is logged."""
+        self.stats.record_request(0.25, 100)
+        self.stats.record_page(50)
+
+        with self.assertLogs("discord-dump.stats", level="INFO") as logs:
+            self.stats.log_summary()
+
+        self.assertIn("1 requests, 1 pages, 50 messages", logs.output[1])
+        self.assertIn("p50 250ms", logs.output[2])
+
+    def test_write_json(self):
+        """Test writing the summary to a JSON file."""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        path = os.path.join(temp_dir, "stats.json")
+        self.stats.record_page(10)
+
+        self.stats.write_json(path)
+
+        with open(path, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f)["messages"], 10)
+
+
+if __name__ == "__main__":
+    unittest.main()